@@ -0,0 +1,40 @@
+import asyncio
+from collections import Counter
+
+from web3mt.cex import CEX, OKX
+
+
+def count_http_calls(cex: CEX) -> Counter:
+    counter = Counter()
+    make_request = cex._session.make_request
+
+    async def counted_make_request(method: str, url: str, *args, **kwargs):
+        counter[url] += 1
+        return await make_request(method, url, *args, **kwargs)
+
+    cex._session.make_request = counted_make_request
+    return counter
+
+
+async def run(cex: CEX, refresh_interval: float) -> Counter:
+    cex.clock.refresh_interval = refresh_interval
+    cex.clock.invalidate()
+    counter = count_http_calls(cex)
+    await cex.get_total_balance()
+    return counter
+
+
+async def main():
+    # refresh_interval=0 reproduces old behaviour: server time is requested before every signed request
+    before = await run(OKX(), refresh_interval=0)
+    after = await run(OKX(), refresh_interval=OKX.CLOCK_REFRESH_INTERVAL)
+    print(
+        f"get_total_balance HTTP calls before: {before.total()} ({before['/public/time']} server time requests)"
+    )
+    print(
+        f"get_total_balance HTTP calls after: {after.total()} ({after['/public/time']} server time requests)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -6,10 +6,8 @@ from web3db import DBHelper
 from web3db import Profile
 
 from web3mt.config import env
+from web3mt.dex.bridges import BridgeAggregator
 from web3mt.dex.bridges.base import BridgeInfo, Bridge
-from web3mt.dex.bridges.bungee import Bungee
-from web3mt.dex.bridges.relay import Relay
-from web3mt.dex.bridges.routernitro import RouterNitro
 from web3mt.dex.models import DEX
 from web3mt.onchain.evm.client import *
 from web3mt.onchain.evm.models import *
@@ -193,7 +191,6 @@ class Warmup(DEX):
         self.evm_client.chain = token_amount_in.token.chain
         balance: TokenAmount = await self.evm_client.balance_of(token=token_amount_in.token)
         logger.info(f'{self.evm_client} | Balance: {balance}')
-        user = recipient = self.evm_client.account.address
         if balance < token_amount_in:
             logger.warning(
                 f'{self.evm_client} | Not enough balance to bridge {token_amount_in}. Balance - {balance}'
@@ -203,30 +200,16 @@ class Warmup(DEX):
             f'{self.evm_client} | Trying to bridge {token_amount_in} '
             f'from {token_amount_in.token.chain} to {token_out.chain}...'
         )
-        bridges = {
-            'Relay bridge': Relay(client=self.evm_client).bridge,
-            'Router bridge': RouterNitro(client=self.evm_client).bridge,
-            'Bungee refuel': Bungee(client=self.evm_client).refuel
-        }
-        bridges_info = await asyncio.gather(*[
-            func(BridgeInfo(
-                name=name, user=user, recipient=recipient, log_info=self.evm_client.log_info,
-                token_amount_in=token_amount_in, token_out=token_out,
-            ))
-            for name, func in bridges.items()
-        ])
-        bridges_info = [el for el in bridges_info if el]
-        if not bridges_info:
+        aggregator = BridgeAggregator(session=self.http_session, client=self.evm_client)
+        cheapest_bridge = await aggregator.bridge(token_amount_in, token_out)
+        if not cheapest_bridge:
             return None
-
-        cheapest_bridge: BridgeInfo = min(bridges_info, key=lambda x: x.bridge_fee)
         logger.info(f'Cheapest bridge - {cheapest_bridge.name}')
         logger.info(cheapest_bridge)
-        if cheapest_bridge:
-            await self.evm_client.tx_with_params(
-                name=f'Bridge from {token_amount_in.token.chain} to {token_out.chain} with {cheapest_bridge.name}',
-                tx_params=cheapest_bridge.tx_params
-            )
+        await self.evm_client.tx_with_params(
+            name=f'Bridge from {token_amount_in.token.chain} to {token_out.chain} with {cheapest_bridge.name}',
+            tx_params=cheapest_bridge.tx_params
+        )
         return cheapest_bridge
 
     async def blur_deposit(self, token_amount_in: TokenAmount):
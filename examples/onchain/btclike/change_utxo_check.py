@@ -0,0 +1,51 @@
+import asyncio
+
+from bip_utils import Bip39MnemonicGenerator
+from bitcoinlib.transactions import Transaction
+
+from web3mt.models import TokenAmount
+from web3mt.onchain.btclike.client import Client
+from web3mt.onchain.btclike.models import Litecoin
+from web3mt.onchain.btclike.utxos import utxo_cache
+
+FUNDING_TXID = "aa" * 32
+
+
+class OfflineClient(Client):
+    """Doesn't touch node or explorer, sent txs are kept and their real txid is returned like node does"""
+
+    def __init__(self, **kwargs):
+        super().__init__(utxo_max_age=float("inf"), **kwargs)
+        self.sent: list[Transaction] = []
+
+    async def send_raw_transaction(self, hex_string: str, max_fee_rate=0.10):
+        tx = Transaction.parse_hex(hex_string, network=self.chain.name.lower())
+        self.sent.append(tx)
+        return tx.txid
+
+
+async def main():
+    client = OfflineClient(chain=Litecoin, mnemonic=Bip39MnemonicGenerator().FromWordsNumber(12).ToStr())
+    address = client.hk.address()
+    utxo_cache.get(client.chain, address).replace(
+        100, [{"txid": FUNDING_TXID, "vout": 0, "status": {"confirmed": True, "block_height": 100}, "value": 100_000}]
+    )
+    amount = TokenAmount(token=client.chain.native_token, amount=10_000, is_sats=True)
+    fee = TokenAmount(token=client.chain.native_token, amount=1_000, is_sats=True)
+
+    first_hash = await client.transfer(to=address, amount=amount, fee=fee)
+    assert first_hash == client.sent[0].txid
+    utxos = sorted((u["txid"], u["vout"], u["value"]) for u in utxo_cache.get(client.chain, address).view())
+    assert utxos == [(first_hash, 0, 10_000), (first_hash, 1, 89_000)], utxos
+
+    # Explorer hasn't seen the first tx yet, the second one must spend both its outputs
+    second_hash = await client.transfer(to=address, amount=amount, fee=fee)
+    inputs = sorted((tx_input.prev_txid.hex(), tx_input.output_n_int) for tx_input in client.sent[1].inputs)
+    assert inputs == [(first_hash, 0), (first_hash, 1)], inputs
+    utxos = sorted((u["txid"], u["vout"], u["value"]) for u in utxo_cache.get(client.chain, address).view())
+    assert utxos == [(second_hash, 0, 10_000), (second_hash, 1, 88_000)], utxos
+    print("Outputs of back-to-back transfers to own address are spendable")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
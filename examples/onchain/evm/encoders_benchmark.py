@@ -0,0 +1,54 @@
+import os
+import time
+
+from eth_account import Account
+from web3 import AsyncWeb3
+
+from web3mt.onchain.evm.contracts import ContractCache, encode_approve, encode_transfer
+from web3mt.onchain.evm.models import DefaultABIs
+
+CALLS = int(os.environ.get("CALLS", 100_000))
+TOKEN = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+
+
+def measure(name: str, func) -> float:
+    started_at = time.perf_counter()
+    for i in range(CALLS):
+        func(i)
+    elapsed = time.perf_counter() - started_at
+    print(f"{name:<45} {elapsed:8.3f}s {CALLS / elapsed:12,.0f} calls/s")
+    return elapsed
+
+
+def main():
+    w3 = AsyncWeb3()
+    recipients = [Account.create().address for _ in range(100)]
+    cache = ContractCache(w3)
+
+    def contract_per_call(i: int):
+        contract = w3.eth.contract(AsyncWeb3.to_checksum_address(TOKEN), abi=DefaultABIs.token)
+        contract.encode_abi("transfer", args=[recipients[i % 100], i])
+        contract.encode_abi("approve", args=[recipients[i % 100], i])
+
+    def cached_contract(i: int):
+        contract = cache.get(TOKEN, DefaultABIs.token)
+        contract.encode_abi("transfer", args=[recipients[i % 100], i])
+        contract.encode_abi("approve", args=[recipients[i % 100], i])
+
+    def precompiled(i: int):
+        encode_transfer(recipients[i % 100], i)
+        encode_approve(recipients[i % 100], i)
+
+    assert (
+        cache.get(TOKEN, DefaultABIs.token).encode_abi("transfer", args=[recipients[0], 10 ** 18])
+        == encode_transfer(recipients[0], 10 ** 18)
+    )
+    print(f"Encoding {CALLS:,} transfer + approve calldatas")
+    before = measure("w3.eth.contract + encode_abi per call", contract_per_call)
+    measure("cached contract + encode_abi", cached_contract)
+    after = measure("precompiled encoders", precompiled)
+    print(f"Speedup: x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import asyncio
+import os
+import time
+
+from eth_account import Account
+
+from web3mt.onchain.evm.signer import TransactionSigner
+
+SIGNATURES = [int(n) for n in os.environ.get("SIGNATURES", "1000,10000").split(",")]
+TICK = 0.005
+
+
+def transactions(n: int) -> list[tuple[dict, bytes]]:
+    accounts = [Account.create() for _ in range(min(n, 100))]
+    return [
+        (
+            {
+                "to": accounts[(i + 1) % len(accounts)].address,
+                "nonce": i,
+                "value": 10 ** 15,
+                "gas": 21000,
+                "maxFeePerGas": 30 * 10 ** 9,
+                "maxPriorityFeePerGas": 10 ** 9,
+                "chainId": 1,
+            },
+            accounts[i % len(accounts)].key,
+        )
+        for i in range(n)
+    ]
+
+
+async def measure_lag(stop: asyncio.Event) -> float:
+    """Max delay of a coroutine that wants to wake up every TICK seconds, i.e. how long I/O would be stalled"""
+    max_lag = 0
+    while not stop.is_set():
+        started_at = time.perf_counter()
+        await asyncio.sleep(TICK)
+        max_lag = max(max_lag, time.perf_counter() - started_at - TICK)
+    return max_lag
+
+
+async def run(signer: TransactionSigner, txs: list[tuple[dict, bytes]]) -> None:
+    stop = asyncio.Event()
+    lag = asyncio.create_task(measure_lag(stop))
+    await asyncio.sleep(TICK)
+    started_at = time.perf_counter()
+    raw_txs = await signer.sign_many(txs)
+    elapsed = time.perf_counter() - started_at
+    stop.set()
+    print(
+        f"{signer.mode:<8} {len(raw_txs):>6} signatures: {elapsed:7.2f}s, "
+        f"max event loop lag {await lag * 1000:8.1f}ms"
+    )
+
+
+async def main():
+    for n in SIGNATURES:
+        txs = transactions(n)
+        for mode in ("inline", "thread", "process"):
+            signer = TransactionSigner(mode, chunk_size=10 ** 9 if mode == "inline" else 64)
+            await run(signer, txs)
+            signer.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+import os
+import time
+
+from bip_utils import Bip39MnemonicGenerator, Bip39SeedGenerator, Bip44Changes
+
+from web3mt.utils.seeds import COINS, account_key, derive, mnemonic_seed
+
+ADDRESSES = int(os.environ.get("ADDRESSES", 10_000))
+MNEMONIC = os.environ.get("MNEMONIC") or Bip39MnemonicGenerator().FromWordsNumber(12).ToStr()
+
+
+def seed_per_call(coin: str, index: int) -> str:
+    """How `get_address_from_mnemonic` worked before: PBKDF2 and all hardened levels for every index"""
+    proposal_num_class, chain = COINS[coin]
+    seed_bytes = Bip39SeedGenerator(MNEMONIC).Generate()
+    bip_obj = proposal_num_class.FromSeed(seed_bytes, chain).Purpose().Coin().Account(0)
+    return bip_obj.Change(Bip44Changes.CHAIN_EXT).AddressIndex(index).PublicKey().ToAddress()
+
+
+def measure(name: str, func, count: int) -> float:
+    started_at = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started_at
+    print(f"{name:<40} {elapsed:8.2f}s {count / elapsed:10,.0f} addresses/s")
+    return elapsed
+
+
+def main():
+    coins = list(COINS)
+    per_coin = ADDRESSES // len(coins)
+    count = per_coin * len(coins)
+    print(f"Deriving {count:,} addresses ({per_coin:,} per each of {', '.join(coins)})")
+    expected = derive(MNEMONIC, coins, range(per_coin))
+    assert all(expected[coin][i].address == seed_per_call(coin, i) for coin in coins for i in (0, per_coin - 1))
+    before = measure(
+        "seed per call", lambda: [seed_per_call(coin, i) for coin in coins for i in range(per_coin)], count
+    )
+    account_key.cache_clear()  # measure cold start, seed is computed once inside
+    mnemonic_seed.cache_clear()
+    after = measure("derive", lambda: derive(MNEMONIC, coins, range(per_coin)), count)
+    measure(
+        "derive with private keys", lambda: derive(MNEMONIC, coins, range(per_coin), private_keys=True), count
+    )
+    workers = os.cpu_count() or 1
+    if workers > 1:
+        measure(
+            f"derive across {workers} processes",
+            lambda: derive(MNEMONIC, coins, range(per_coin), max_workers=workers),
+            count,
+        )
+    print(f"Speedup: x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import asyncio
+import os
+import resource
+import time
+
+from web3mt.config import env
+from web3mt.utils import httpxAsyncClient, session_registry
+from web3mt.utils.http_sessions import SessionConfig
+
+PROFILES = 1000
+CONCURRENCY = 50
+URL = "https://icanhazip.com"
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except FileNotFoundError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # peak RSS if /proc is not available
+
+
+def open_fds() -> int:
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except FileNotFoundError:
+        return -1
+
+
+async def run(pooled: bool) -> None:
+    handshakes = 0
+
+    async def trace(event_name: str, info: dict):
+        nonlocal handshakes
+        if event_name == "connection.start_tls.started":
+            handshakes += 1
+
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    # Every profile has its own session, like ProfilehttpxAsyncClient, all of them use the same proxy
+    sessions = [
+        httpxAsyncClient(
+            proxy=env.default_proxy, config=SessionConfig(log_info=str(i)), pooled=pooled
+        )
+        for i in range(PROFILES)
+    ]
+
+    async def request(session: httpxAsyncClient):
+        async with semaphore:
+            await session.request("GET", URL, extensions={"trace": trace})
+
+    rss_before, fds_before = rss_mb(), open_fds()
+    started_at = time.perf_counter()
+    await asyncio.gather(*[request(session) for session in sessions])
+    elapsed = time.perf_counter() - started_at
+    rss_after, fds_after = rss_mb(), open_fds()
+    await asyncio.gather(*[session.aclose() for session in sessions])
+    await session_registry.close_all()
+    print(
+        f"pooled={pooled} | {PROFILES} profiles: {handshakes} TLS handshakes, "
+        f"RSS +{rss_after - rss_before:.1f} MB, open fds +{fds_after - fds_before}, {elapsed:.2f}s"
+    )
+
+
+async def main():
+    await run(pooled=False)
+    await run(pooled=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
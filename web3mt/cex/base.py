@@ -3,11 +3,15 @@ from abc import ABC, abstractmethod
 from decimal import Decimal
 from typing import Callable, Any, Optional
 
+from curl_cffi.requests import RequestsError
 from web3db import Profile
 
+from web3mt.cex.clock import ServerClock
 from web3mt.cex.models import User, Asset, Account
+from web3mt.cex.rate_limiter import RateLimit, RateLimiter
 from web3mt.config import env, DEV
 from web3mt.models import Coin, TokenAmount
+from web3mt.offchain.prices import price_service
 from web3mt.utils import logger
 from web3mt.utils.http_sessions import (
     SessionConfig,
@@ -22,6 +26,10 @@ class CEX(ABC):
     API_VERSION = None
     URL = None
     NAME = ""
+    CLOCK_REFRESH_INTERVAL = 300
+    TIMESTAMP_ERRORS: tuple[str, ...] = ()  # markers of rejected request timestamp in exchange response
+    RATE_LIMITS: dict[str, RateLimit] = {"default": RateLimit(10, 1)}  # endpoint prefix -> limit
+    ENDPOINT_WEIGHTS: dict[str, int] = {}  # endpoint prefix -> request weight
 
     def __init__(
         self,
@@ -39,6 +47,14 @@ class CEX(ABC):
             base_url=self.URL, proxy=proxy, config=config, **session_kwargs
         )
         self.main_user = User(self)
+        self.rate_limiter = RateLimiter.shared(
+            (self.NAME, api_key), self.RATE_LIMITS, self.ENDPOINT_WEIGHTS
+        )
+        self.clock = ServerClock(
+            self.get_server_timestamp,
+            refresh_interval=self.CLOCK_REFRESH_INTERVAL,
+            log_info=self.NAME,
+        )
 
     def __repr__(self):
         return f"{self.NAME}"
@@ -47,6 +63,23 @@ class CEX(ABC):
     async def make_request(self, *args, **kwargs):
         pass
 
+    async def _request(self, method: str, url: str, **kwargs):
+        """Sends request through exchange rate limiter, every retry of session takes its own token"""
+        path = url.removeprefix(self.URL or "")
+        response, data = await self._session.make_request(
+            method, url, before_attempt=lambda: self.rate_limiter.acquire(path), **kwargs
+        )
+        bucket = self.rate_limiter.bucket(path)
+        if quota := self._parse_rate_limit_headers(response):
+            bucket.sync(*quota)
+        return response, data
+
+    def _parse_rate_limit_headers(
+        self, response
+    ) -> Optional[tuple[float, Optional[float]]]:
+        """Returns remaining quota and seconds until its reset, if exchange sends them in headers"""
+        return None
+
     async def head(self, *a, **kw):
         return await self.make_request("HEAD", *a, **kw)
 
@@ -124,20 +157,19 @@ class CEX(ABC):
 
     async def get_total_balance(self):
         users = [self.main_user, *(await self.get_sub_account_list())]
-        total_balance = 0
+        await asyncio.gather(*[self.update_balances(user) for user in users])
+        assets = [
+            asset
+            for user in users
+            for asset in [*user.funding_account.assets, *user.trading_account.assets]
+        ]
+        await price_service.get_prices(asset.coin for asset in assets)
+        # Coins priced by service are returned right away, only the rest are requested from exchange
+        prices = await asyncio.gather(*[self.get_coin_price(asset.coin) for asset in assets])
+        total_balance = sum(
+            asset.available_balance * Decimal(str(price)) for asset, price in zip(assets, prices)
+        )
         for user in users:
-            await self.update_balances(user)
-            total_balance += sum(
-                [
-                    el.available_balance * await self.get_coin_price(el.coin)
-                    for el in user.funding_account.assets
-                ]
-            ) + sum(
-                [
-                    el.available_balance * await self.get_coin_price(el.coin)
-                    for el in user.trading_account.assets
-                ]
-            )
             logger.info(user.funding_account)
             logger.info(user.trading_account)
         return total_balance
@@ -173,6 +205,32 @@ class CEX(ABC):
             ]
         )
 
+    def _is_timestamp_error(self, data: Any) -> bool:
+        data = str(data)
+        return any(marker in data for marker in self.TIMESTAMP_ERRORS)
+
+    def _sync_clock_decorator(func: Callable) -> Callable:
+        """Resyncs server clock and signs request again once, if exchange rejected request timestamp"""
+
+        async def wrapper(self, method: str, url: str, *args, **kwargs):
+            if kwargs.get("without_headers"):
+                return await func(self, method, url, *args, **kwargs)
+            try:
+                response, data = await func(self, method, url, *args, **kwargs)
+            except RequestsError as e:
+                response_text = getattr(e.response, "text", "")
+                if not self._is_timestamp_error(f"{e} {response_text}"):
+                    raise e
+                logger.warning(f"{self} | Request timestamp rejected. Syncing server clock")
+            else:
+                if not self._is_timestamp_error(data):
+                    return response, data
+                logger.warning(f"{self} | Request timestamp rejected. Syncing server clock")
+            self.clock.invalidate()
+            return await func(self, method, url, *args, **kwargs)
+
+        return wrapper
+
     def _get_coin_price_decorator(func: Callable) -> Callable:
         async def wrapper(self, coin: str | Coin = "ETH"):
             if isinstance(coin, Coin):
@@ -181,7 +239,7 @@ class CEX(ABC):
             else:
                 coin = Coin(coin)
 
-            for usd_ticker in usd_tickers:
+            for usd_ticker in usd_tickers:  # USDC pair is requested only if there is no USDT one
                 price = await func(self, coin=coin, usd_ticker=usd_ticker)
                 if price is not None:
                     coin.price = price
@@ -7,6 +7,7 @@ from urllib.parse import urlencode
 
 from web3mt.cex.base import CEX, ProfileCEX
 from web3mt.cex.models import Asset, User, Account
+from web3mt.cex.rate_limiter import RateLimit
 from web3mt.config import cex_env, env
 from web3mt.models import Coin
 from web3mt.onchain.evm.models import TokenAmount
@@ -22,6 +23,21 @@ class Binance(CEX):
     API_VERSION = 3
     URL = "https://api.binance.com"
     NAME = "Binance"
+    TIMESTAMP_ERRORS = ("Timestamp for this request",)
+    RATE_LIMITS = {
+        "default": RateLimit(6000, 60),
+        "api": RateLimit(6000, 60),
+        "sapi": RateLimit(12000, 60),
+    }
+    ENDPOINT_WEIGHTS = {
+        "api/v3/ticker/price": 2,
+        "sapi/v3/asset/getUserAsset": 5,
+        "sapi/v1/capital/config/getall": 10,
+    }
+    USED_WEIGHT_HEADERS = {
+        "api": "x-mbx-used-weight-1m",
+        "sapi": "x-sapi-used-ip-weight-1m",
+    }
 
     def __init__(
         self,
@@ -32,17 +48,17 @@ class Binance(CEX):
     ):
         super().__init__(api_key, api_secret, proxy=proxy, config=config)
 
+    @CEX._sync_clock_decorator
     async def make_request(
         self,
         method: str,
         url: str,
         **kwargs,
     ):
-        if kwargs.get("without_headers"):
-            return await self._session.make_request(method, url, **kwargs)
+        if kwargs.pop("without_headers", False):
+            return await self._request(method, url, **kwargs)
         params = kwargs.pop("params", {}) | {
-            "timestamp": await self.get_server_timestamp()
-            or str(int(time.time() * 10**3)),
+            "timestamp": await self.clock.timestamp(),
             "recvWindow": 10000,
         }
         data = kwargs.pop("json", {})
@@ -51,7 +67,7 @@ class Binance(CEX):
             urlencode(params | data).encode(),
             hashlib.sha256,
         ).hexdigest()
-        return await self._session.make_request(
+        return await self._request(
             method,
             url,
             headers={
@@ -63,15 +79,27 @@ class Binance(CEX):
             **kwargs,
         )
 
+    def _parse_rate_limit_headers(
+        self, response
+    ) -> Optional[tuple[float, Optional[float]]]:
+        # Quota of the bucket the request went through, api and sapi weights are counted separately
+        group = self.rate_limiter.group(response.url.path)
+        if (header := self.USED_WEIGHT_HEADERS.get(group)) and (used_weight := response.headers.get(header)):
+            return (
+                self.RATE_LIMITS[group].capacity - int(used_weight),
+                60 - time.time() % 60,
+            )
+        return None
+
     async def get_server_timestamp(self) -> int:
-        _, data = await self._session.get("/api/v3/time", without_headers=True)
+        _, data = await self.get("/api/v3/time", without_headers=True)
         return int(data["serverTime"])
 
     @CEX._get_coin_price_decorator
     async def get_coin_price(
         self, coin: str | Coin = "ETH", usd_ticker: str = "USDT"
     ) -> Decimal:
-        _, data = await self._session.get(
+        _, data = await self.get(
             "api/v3/ticker/price",
             params={"symbol": f"{coin.symbol}{usd_ticker}"},
             without_headers=True,
@@ -88,7 +116,7 @@ class Binance(CEX):
 
     @CEX._get_funding_balance_decorator
     async def get_funding_balance(self, user: User = None) -> list[Asset]:
-        _, data = await self._session.post(url="/sapi/v1/asset/get-funding-asset")
+        _, data = await self.post(url="/sapi/v1/asset/get-funding-asset")
         user.funding_account.assets = [
             Asset(
                 Coin(
@@ -113,7 +141,7 @@ class Binance(CEX):
     async def get_trading_balance(
         self, user: User = None, omit_zero_balances: bool = False
     ) -> list[Asset]:
-        _, data = await self._session.post(url=f"/sapi/v3/asset/getUserAsset")
+        _, data = await self.post(url=f"/sapi/v3/asset/getUserAsset")
         user.trading_account.assets = [
             Asset(
                 Coin(
@@ -135,7 +163,7 @@ class Binance(CEX):
         return user.trading_account.assets
 
     async def get_sub_account_list(self) -> list[User]:
-        _, data = await self._session.get(url="/sapi/v1/sub-account/list")
+        _, data = await self.get(url="/sapi/v1/sub-account/list")
         return [
             User(self, sub_account["subUserId"]) for sub_account in data["subAccounts"]
         ]
@@ -153,7 +181,7 @@ class Binance(CEX):
             type_ = "FUNDING_MAIN"
         else:
             raise NotImplementedError  # TODO
-        _, data = await self._session.post(
+        _, data = await self.post(
             "/sapi/v1/asset/transfer",
             params=dict(
                 type=type_,
@@ -9,12 +9,14 @@ import uuid
 from decimal import Decimal
 from functools import partialmethod
 from hashlib import sha256
+from typing import Optional
 from urllib.parse import urlencode
 
 from web3db import Profile, DBHelper
 
 from web3mt.cex.base import CEX
 from web3mt.cex.models import Asset, Account, User
+from web3mt.cex.rate_limiter import RateLimit
 from web3mt.config import DEV, env
 from web3mt.models import Coin
 from web3mt.utils import logger
@@ -43,15 +45,35 @@ class Bybit(CEX):
     MAIN_ENDPOINT = "https://api.bybit.com"
     URL = f"{MAIN_ENDPOINT}/v{API_VERSION}"
     NAME = "Bybit"
+    TIMESTAMP_ERRORS = ("server timestamp",)
+    RATE_LIMITS = {
+        "default": RateLimit(10, 1),
+        "market": RateLimit(120, 1),
+        "asset": RateLimit(5, 1),
+        "user": RateLimit(10, 1),
+    }
+
+    def _parse_rate_limit_headers(
+        self, response
+    ) -> Optional[tuple[float, Optional[float]]]:
+        remaining = response.headers.get("X-Bapi-Limit-Status")
+        if remaining is None:
+            return None
+        reset_timestamp = response.headers.get("X-Bapi-Limit-Reset-Timestamp")
+        return int(remaining), (
+            max(int(reset_timestamp) / 1000 - time.time(), 0)
+            if reset_timestamp
+            else None
+        )
 
     async def get_server_timestamp(self) -> str:
-        _, data = await self.session.get(f"{self.URL}/market/time")
+        _, data = await self._request("GET", f"{self.URL}/market/time")
         return str(data["time"])
 
     async def get_headers(
         self, path: str, method: str = "GET", recv_window: int = 10000, **kwargs
     ):
-        timestamp = await self.get_server_timestamp() or str(int(time.time() * 10**3))
+        timestamp = str(await self.clock.timestamp())
         params = urlencode(kwargs.get("params", {}))
         params = urlencode(params)
         prehash_string = (
@@ -74,9 +96,10 @@ class Bybit(CEX):
             "X-BAPI-RECV-WINDOW": str(recv_window),
         }
 
+    @CEX._sync_clock_decorator
     async def make_request(self, method: str, path: str, **kwargs):
         without_headers = kwargs.pop("without_headers", False)
-        response, data = await self.session.make_request(
+        response, data = await self._request(
             method,
             f"{self.URL}/{path}",
             headers={}
@@ -84,6 +107,8 @@ class Bybit(CEX):
             else await self.get_headers(path, method, **kwargs),
             **kwargs,
         )
+        if self._is_timestamp_error(data):
+            return response, data
         if not data["result"]:
             logger.error(f"{self.log_info} | {data['retMsg']}")
             raise KeyError
@@ -0,0 +1,74 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+from web3mt.utils import logger
+
+__all__ = ["ServerClock"]
+
+
+class ServerClock:
+    """
+    Keeps the offset between exchange server time and local time, so private requests can be signed without
+    asking the server for its time before every call. Offset is measured with RTT compensation and refreshed
+    every `refresh_interval` seconds or after `invalidate()` (e.g. when exchange rejected a timestamp)
+    """
+
+    def __init__(
+        self,
+        fetch_server_timestamp: Callable[[], Awaitable[int | float | str]],
+        refresh_interval: float = 300,
+        log_info: str = "ServerClock",
+    ):
+        self._fetch_server_timestamp = fetch_server_timestamp
+        self.refresh_interval = refresh_interval
+        self.log_info = log_info
+        self.offset_ms: Optional[float] = None
+        self.rtt_ms: Optional[float] = None
+        self._synced_at: float = 0
+        self._lock = asyncio.Lock()
+
+    def __repr__(self):
+        return f"ServerClock(offset_ms={self.offset_ms}, rtt_ms={self.rtt_ms})"
+
+    @property
+    def is_stale(self) -> bool:
+        return (
+            self.offset_ms is None
+            or time.monotonic() - self._synced_at >= self.refresh_interval
+        )
+
+    def invalidate(self) -> None:
+        self._synced_at = 0
+
+    async def sync(self) -> float:
+        started_at = time.time()
+        server_timestamp = int(await self._fetch_server_timestamp())
+        finished_at = time.time()
+        self.rtt_ms = (finished_at - started_at) * 1000
+        # Server has generated its timestamp in the middle of the round trip
+        self.offset_ms = server_timestamp - (started_at * 1000 + self.rtt_ms / 2)
+        self._synced_at = time.monotonic()
+        logger.debug(
+            f"{self.log_info} | Server clock synced. Offset: {self.offset_ms:.0f} ms, RTT: {self.rtt_ms:.0f} ms"
+        )
+        return self.offset_ms
+
+    async def timestamp(self) -> int:
+        """Current server time in milliseconds"""
+        if self.is_stale:
+            async with self._lock:
+                if self.is_stale:
+                    try:
+                        await self.sync()
+                    except Exception as e:
+                        if self.offset_ms is None:
+                            logger.warning(
+                                f"{self.log_info} | Couldn't sync server clock, using local time. {e}"
+                            )
+                            self.offset_ms = 0
+                        self._synced_at = time.monotonic()
+        return int(time.time() * 1000 + self.offset_ms)
+
+    async def timestamp_seconds(self) -> float:
+        return await self.timestamp() / 1000
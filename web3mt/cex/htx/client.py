@@ -11,6 +11,7 @@ from _decimal import Decimal
 from web3mt.cex.base import CEX
 from web3mt.cex.htx.models import chains
 from web3mt.cex.models import User, Asset, Account, ChainNotExistsInLocalChains
+from web3mt.cex.rate_limiter import RateLimit
 from web3mt.config import cex_env, env
 from web3mt.models import Coin, TokenAmount
 from web3mt.utils import logger
@@ -24,6 +25,13 @@ from web3mt.utils.http_sessions import SessionConfig
 class HTX(CEX):
     URL = "https://api.huobi.pro"
     NAME = "HTX"
+    TIMESTAMP_ERRORS = ("login-timestamp-not-valid", "timestamp-not-valid")
+    RATE_LIMITS = {
+        "default": RateLimit(10, 1),
+        "market": RateLimit(100, 10),
+        "v1/common": RateLimit(100, 10),
+        "v2/reference": RateLimit(100, 10),
+    }
 
     def __init__(
         self,
@@ -34,6 +42,7 @@ class HTX(CEX):
     ):
         super().__init__(api_key, api_secret, proxy=proxy, config=config)
 
+    @CEX._sync_clock_decorator
     async def make_request(
         self,
         method: str,
@@ -43,12 +52,10 @@ class HTX(CEX):
         **kwargs,
     ):
         if without_headers:
-            return await self._session.make_request(
+            return await self._request(
                 method, url, params=params, **kwargs
             )
-        current_timestamp = (
-            int((await self.get_server_timestamp()) / 1000) or time.time()
-        )
+        current_timestamp = int(await self.clock.timestamp_seconds())
         params = (params or {}) | {
             "AccessKeyId": self.api_key,
             "SignatureMethod": "HmacSHA256",
@@ -64,13 +71,26 @@ class HTX(CEX):
                 self.api_secret.encode(), payload.encode(), hashlib.sha256
             ).digest()
         ).decode()
-        return await self._session.make_request(
+        return await self._request(
             method,
             url,
             params=params | {"Signature": signature},
             **kwargs,
         )
 
+    def _parse_rate_limit_headers(
+        self, response
+    ) -> Optional[tuple[float, Optional[float]]]:
+        remaining = response.headers.get("X-HB-RateLimit-Requests-Remain")
+        if remaining is None:
+            return None
+        expire_timestamp = response.headers.get("X-HB-RateLimit-Requests-Expire")
+        return int(remaining), (
+            max(int(expire_timestamp) / 1000 - time.time(), 0)
+            if expire_timestamp
+            else None
+        )
+
     async def get_server_timestamp(self) -> int:
         _, data = await self.get("/v1/common/timestamp", without_headers=True)
         return int(data["data"])
@@ -2,7 +2,6 @@ import base64
 import hashlib
 import hmac
 import json as json_lib
-import time
 from typing import Optional, Literal
 
 from _decimal import Decimal
@@ -11,6 +10,7 @@ from urllib.parse import urlencode
 from web3mt.cex import CEX
 from web3mt.cex.kucoin.models import chains
 from web3mt.cex.models import Asset, User, ChainNotExistsInLocalChains, Account
+from web3mt.cex.rate_limiter import RateLimit
 from web3mt.config import cex_env, env
 from web3mt.models import Coin, TokenAmount
 from web3mt.utils import logger
@@ -24,6 +24,20 @@ from web3mt.utils.http_sessions import SessionConfig
 class Kucoin(CEX):
     URL = "https://api.kucoin.com"
     NAME = "Kucoin"
+    TIMESTAMP_ERRORS = ("KC-API-TIMESTAMP Invalid",)
+    RATE_LIMITS = {
+        "default": RateLimit(4000, 30),
+        "api/v1/timestamp": RateLimit(2000, 30),
+        "api/v1/market": RateLimit(2000, 30),
+        "api/v3/currencies": RateLimit(2000, 30),
+        "api/v3/withdrawals": RateLimit(2000, 30),
+    }
+    ENDPOINT_WEIGHTS = {
+        "api/v1/accounts": 5,
+        "api/v1/market/orderbook/level1": 2,
+        "api/v3/currencies": 3,
+        "api/v3/withdrawals": 5,
+    }
 
     def __init__(
         self,
@@ -37,6 +51,7 @@ class Kucoin(CEX):
             api_key, api_secret, api_passphrase, proxy=proxy, config=config
         )
 
+    @CEX._sync_clock_decorator
     async def make_request(
         self,
         method: str,
@@ -47,12 +62,10 @@ class Kucoin(CEX):
         **kwargs,
     ):
         if without_headers:
-            return await self._session.make_request(
+            return await self._request(
                 method, url, params=params, json=json, **kwargs
             )
-        current_timestamp = (
-            int((await self.get_server_timestamp())) or time.time() * 1000
-        )
+        current_timestamp = await self.clock.timestamp()
         payload = f"{str(current_timestamp)}{method}{url}{urlencode(params or {})}{json_lib.dumps(json) if json else ''}"
         signature = base64.b64encode(
             hmac.new(
@@ -66,7 +79,7 @@ class Kucoin(CEX):
                 hashlib.sha256,
             ).digest()
         )
-        return await self._session.make_request(
+        return await self._request(
             method,
             url,
             headers={
@@ -82,6 +95,15 @@ class Kucoin(CEX):
             **kwargs,
         )
 
+    def _parse_rate_limit_headers(
+        self, response
+    ) -> Optional[tuple[float, Optional[float]]]:
+        remaining = response.headers.get("gw-ratelimit-remaining")
+        if remaining is None:
+            return None
+        reset_ms = response.headers.get("gw-ratelimit-reset")
+        return int(remaining), int(reset_ms) / 1000 if reset_ms else None
+
     async def get_server_timestamp(self) -> Optional[int]:
         _, data = await self.get("/api/v1/timestamp", without_headers=True)
         return int(data["data"])
@@ -1,6 +1,5 @@
 import hashlib
 import hmac
-import time
 from typing import Optional
 
 from _decimal import Decimal
@@ -9,6 +8,7 @@ from urllib.parse import urlencode
 from web3mt.cex import CEX
 from web3mt.cex.mexc.models import chains
 from web3mt.cex.models import Asset, User, ChainNotExistsInLocalChains, Account
+from web3mt.cex.rate_limiter import RateLimit
 from web3mt.config import cex_env, env
 from web3mt.models import Coin, TokenAmount
 from web3mt.utils import logger
@@ -22,6 +22,12 @@ from web3mt.utils.http_sessions import SessionConfig
 class MEXC(CEX):
     URL = "https://api.mexc.com"
     NAME = "MEXC"
+    TIMESTAMP_ERRORS = ("Timestamp for this request",)
+    RATE_LIMITS = {"default": RateLimit(500, 10)}
+    ENDPOINT_WEIGHTS = {
+        "api/v3/account": 10,
+        "api/v3/capital/config/getall": 10,
+    }
 
     def __init__(
         self,
@@ -32,6 +38,7 @@ class MEXC(CEX):
     ):
         super().__init__(api_key, api_secret, proxy=proxy, config=config)
 
+    @CEX._sync_clock_decorator
     async def make_request(
         self,
         method: str,
@@ -41,10 +48,10 @@ class MEXC(CEX):
         **kwargs,
     ):
         if without_headers:
-            return await self._session.make_request(
+            return await self._request(
                 method, url, params=params, **kwargs
             )
-        current_timestamp = int(await self.get_server_timestamp()) or time.time() * 1000
+        current_timestamp = await self.clock.timestamp()
         params = (params or {}) | {
             "timestamp": current_timestamp,
         }
@@ -53,7 +60,7 @@ class MEXC(CEX):
             urlencode(params).encode(),
             hashlib.sha256,
         ).hexdigest()
-        return await self._session.make_request(
+        return await self._request(
             method,
             url,
             headers={"Content-Type": "application/json", "X-MEXC-APIKEY": self.api_key},
@@ -11,6 +11,7 @@ from hashlib import sha256
 from decimal import Decimal
 from datetime import datetime, timezone
 from web3mt.cex.base import CEX
+from web3mt.cex.rate_limiter import RateLimit
 from web3mt.cex.models import WithdrawInfo, User, Account, Asset
 from web3mt.config import DEV, env, cex_env
 from web3mt.models import Coin
@@ -56,6 +57,22 @@ class OKX(CEX):
     API_VERSION = 5
     URL = f"https://www.okx.com/api/v{API_VERSION}"
     NAME = "OKX"
+    TIMESTAMP_ERRORS = ("Timestamp request expired", "Invalid OK-ACCESS-TIMESTAMP")
+    RATE_LIMITS = {
+        "default": RateLimit(10, 2),
+        "public/time": RateLimit(10, 2),
+        "market/ticker": RateLimit(20, 2),
+        "asset/balances": RateLimit(6, 1),
+        "asset/currencies": RateLimit(6, 1),
+        "asset/transfer": RateLimit(1, 1),
+        "asset/subaccount/balances": RateLimit(6, 1),
+        "asset/subaccount/transfer": RateLimit(1, 1),
+        "asset/withdrawal": RateLimit(6, 1),
+        "account/balance": RateLimit(10, 2),
+        "account/subaccount/balances": RateLimit(6, 2),
+        "users/subaccount/list": RateLimit(2, 2),
+        "finance/savings/balance": RateLimit(6, 1),
+    }
 
     def __init__(
         self,
@@ -69,6 +86,7 @@ class OKX(CEX):
             api_key, api_secret, api_passphrase, proxy=proxy, config=config
         )
 
+    @CEX._sync_clock_decorator
     async def make_request(
         self,
         method: str,
@@ -79,11 +97,11 @@ class OKX(CEX):
         **kwargs,
     ):
         if without_headers:
-            return await self._session.make_request(
+            return await self._request(
                 method, url, params=params, json=json, **kwargs
             )
-        current_timestamp = int((await self.get_server_timestamp())) or datetime.now(
-            timezone.utc
+        current_timestamp = datetime.fromtimestamp(
+            await self.clock.timestamp_seconds(), timezone.utc
         )
         current_timestamp_str = (
             current_timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
@@ -106,7 +124,7 @@ class OKX(CEX):
             self.api_secret.encode("utf-8"), prehash_string.encode("utf-8"), sha256
         ).digest()
         encoded_signature = base64.b64encode(signature).decode("utf-8")
-        return await self._session.make_request(
+        return await self._request(
             method,
             url,
             headers={
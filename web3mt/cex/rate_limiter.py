@@ -0,0 +1,130 @@
+import asyncio
+import time
+from typing import Hashable, Optional
+
+__all__ = ["RateLimit", "TokenBucket", "RateLimiter"]
+
+
+class RateLimit:
+    def __init__(self, capacity: int, period: float, safety_margin: float = 0.9):
+        """
+        :param capacity: request weight allowed by exchange per `period`
+        :param period: window in seconds
+        :param safety_margin: part of the capacity to use, so requests are queued just under the limit
+        """
+        self.capacity = capacity
+        self.period = period
+        self.safety_margin = safety_margin
+
+    def __repr__(self):
+        return f"RateLimit({self.capacity}/{self.period}s)"
+
+
+class TokenBucket:
+    def __init__(self, rate_limit: RateLimit):
+        self.safety_margin = rate_limit.safety_margin
+        self.capacity = max(rate_limit.capacity * self.safety_margin, 1)
+        self.refill_rate = self.capacity / rate_limit.period
+        self.tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def __repr__(self):
+        return f"TokenBucket(tokens={self.tokens:.2f}/{self.capacity:.2f})"
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated_at) * self.refill_rate
+        )
+        self._updated_at = now
+
+    def _get_lock(self) -> asyncio.Lock:
+        """Bucket is shared by clients and may outlive event loop, lock is bound to the running one"""
+        loop = asyncio.get_running_loop()
+        if self._lock_loop is not loop:
+            self._lock, self._lock_loop = asyncio.Lock(), loop
+        return self._lock
+
+    async def acquire(self, weight: float = 1) -> None:
+        weight = min(weight, self.capacity)
+        async with self._get_lock():  # FIFO: waiting requests are served in order
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._refill()
+                if self.tokens >= weight:
+                    self.tokens -= weight
+                    return
+                await asyncio.sleep((weight - self.tokens) / self.refill_rate)
+
+    def sync(self, remaining: float, reset_in: Optional[float] = None) -> None:
+        """Adjusts bucket to remaining quota reported by exchange"""
+        self._refill()
+        self.tokens = min(self.tokens, remaining * self.safety_margin)
+        if remaining <= 0 and reset_in:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + reset_in)
+
+
+class RateLimiter:
+    """
+    Token buckets for endpoint groups. Group is the longest path prefix from `limits`
+    ("default" is used for unmatched paths), request weight is the longest prefix match from `weights`
+    """
+
+    _shared: dict[Hashable, "RateLimiter"] = {}
+
+    def __init__(
+        self, limits: dict[str, RateLimit], weights: Optional[dict[str, int]] = None
+    ):
+        self.limits = {self._normalize(k): v for k, v in limits.items()}
+        self.weights = {self._normalize(k): v for k, v in (weights or {}).items()}
+        self._buckets: dict[str, TokenBucket] = {}
+
+    @classmethod
+    def shared(
+        cls,
+        key: Hashable,
+        limits: dict[str, RateLimit],
+        weights: Optional[dict[str, int]] = None,
+    ) -> "RateLimiter":
+        """Limiter shared by every client with the same key, e.g. (exchange, api key)"""
+        if key not in cls._shared:
+            cls._shared[key] = cls(limits, weights)
+        return cls._shared[key]
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return path.split("?")[0].lstrip("/")
+
+    @staticmethod
+    def _longest_prefix(path: str, prefixes) -> Optional[str]:
+        matched = None
+        for prefix in prefixes:
+            if path.startswith(prefix) and (matched is None or len(prefix) > len(matched)):
+                matched = prefix
+        return matched
+
+    def group(self, path: str) -> str:
+        return self._longest_prefix(self._normalize(path), self.limits) or "default"
+
+    def weight(self, path: str) -> int:
+        prefix = self._longest_prefix(self._normalize(path), self.weights)
+        return self.weights[prefix] if prefix else 1
+
+    def bucket(self, path: str) -> TokenBucket:
+        group = self.group(path)
+        if group not in self._buckets:
+            self._buckets[group] = TokenBucket(
+                self.limits.get(group) or self.limits.get("default") or RateLimit(10, 1)
+            )
+        return self._buckets[group]
+
+    async def acquire(self, path: str) -> TokenBucket:
+        bucket = self.bucket(path)
+        await bucket.acquire(self.weight(path))
+        return bucket
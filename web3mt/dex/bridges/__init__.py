@@ -1,8 +1,10 @@
 from .bungee import Bungee
 from .relay import Relay
 from .routernitro import RouterNitro
+from .aggregator import BridgeAggregator
 
 __all__ = [
+    'BridgeAggregator',
     'Bungee',
     'Relay',
     'RouterNitro',
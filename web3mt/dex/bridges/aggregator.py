@@ -0,0 +1,184 @@
+import asyncio
+import math
+import time
+from decimal import Decimal
+
+from web3db import Profile
+
+from web3mt.dex.bridges import bungee, relay, routernitro  # noqa: F401, subclasses are added to `Bridge.registry`
+from web3mt.dex.bridges.base import Bridge, BridgeInfo
+from web3mt.dex.models import DEX
+from web3mt.onchain.evm.client import ProfileClient, BaseClient
+from web3mt.onchain.evm.gas import GasOracle
+from web3mt.onchain.evm.models import Chain, Token, TokenAmount
+from web3mt.utils import curl_cffiAsyncSession, logger
+
+__all__ = ['BridgeAggregator']
+
+
+class BridgeAggregator(DEX):
+    """
+    Requests quotes of every registered bridge concurrently within `deadline` and ranks them by net output in USD:
+    output minus bridge fee minus gas cost by current gas price. Gas is taken from quote if bridge API returns it,
+    otherwise it's `GAS_LIMIT` of bridge. Quotes are cached
+    per (bridge, route, amount bucket) for `quote_ttl` seconds. Only the winner estimates gas, it is quoted again
+    if cached quote was made for another amount of the same bucket
+    """
+
+    NAME = 'BridgeAggregator'
+    _quotes: dict[tuple, tuple[float, BridgeInfo]] = {}  # shared by all aggregators
+
+    def __init__(
+            self,
+            session: curl_cffiAsyncSession = None,
+            client: ProfileClient | BaseClient = None,
+            profile: Profile = None,
+            bridges: list[type[Bridge]] = None,
+            deadline: float = 10,
+            quote_ttl: float = 30,
+            bucket_size: float = 0.01,
+    ):
+        """
+        :param bridges: `Bridge.registry` by default
+        :param bucket_size: relative width of amount bucket, amounts within 1% share cached quotes by default
+        """
+        super().__init__(session, client, profile)
+        self.bridges = [
+            bridge(session=self.http_session, client=self.evm_client)
+            for bridge in (bridges or Bridge.registry.values())
+        ]
+        self.deadline = deadline
+        self.quote_ttl = quote_ttl
+        self.bucket_size = bucket_size
+
+    def __str__(self):
+        return f'{self.evm_client.log_info} | {self.NAME}'
+
+    def _key(self, bridge: Bridge, bridge_info: BridgeInfo) -> tuple:
+        token_in, token_out = bridge_info.token_amount_in.token, bridge_info.token_out
+        wei = bridge_info.token_amount_in.wei
+        bucket = round(math.log(wei) / math.log1p(self.bucket_size)) if wei > 0 else 0
+        return (
+            bridge.NAME, token_in.chain.chain_id, token_in.address.lower(), token_out.chain.chain_id,
+            token_out.address.lower(), bridge_info.user, bridge_info.recipient, bridge_info.exact_output, bucket
+        )
+
+    async def _quote(self, bridge: Bridge, bridge_info: BridgeInfo) -> BridgeInfo | None:
+        key = self._key(bridge, bridge_info)
+        if (cached := self._quotes.get(key)) and time.monotonic() - cached[0] < self.quote_ttl:
+            quote = cached[1].copy()
+            quote.log_info = bridge_info.log_info
+            quote.token_amount_in = bridge_info.token_amount_in
+            return quote
+        try:
+            quote = await bridge.quote(bridge_info)
+        except NotImplementedError:
+            return None
+        except Exception as e:
+            logger.warning(f'{self} | Couldn\'t get {bridge.NAME} quote. {e}')
+            return None
+        if quote:
+            self._quotes[key] = (time.monotonic(), quote.copy())
+        return quote
+
+    async def _usd_per_gas(self, token_amount_in: TokenAmount) -> Decimal:
+        chain = token_amount_in.token.chain
+        gas_oracle = GasOracle.get(chain, self.evm_client.http_provider_config.request_kwargs)
+        gas_oracle, _ = await asyncio.gather(gas_oracle.update(), chain.native_token.update_price())
+        return TokenAmount(gas_oracle.gas_price, True, chain.native_token).amount_in_usd or Decimal(0)
+
+    def _client(self, chain: Chain) -> BaseClient:
+        """Client of source chain, `evm_client` isn't switched as bridges may use it concurrently"""
+        if chain == self.evm_client.chain:
+            return self.evm_client
+        return BaseClient(
+            self.evm_client.account, chain, self.evm_client.config, self.evm_client.http_provider_config
+        )
+
+    @staticmethod
+    def _gas_limit(bridge: Bridge, bridge_info: BridgeInfo) -> int:
+        return bridge_info.gas_limit or bridge.GAS_LIMIT
+
+    @staticmethod
+    def _net_output_in_usd(bridge_info: BridgeInfo, gas_fee_in_usd: Decimal) -> Decimal:
+        bridge_fee = bridge_info.bridge_fee.amount_in_usd if bridge_info.bridge_fee else None
+        token_amount_out = bridge_info.token_amount_out.amount_in_usd or Decimal(0)
+        return token_amount_out - (bridge_fee or Decimal(0)) - gas_fee_in_usd
+
+    async def quote(
+            self,
+            token_amount_in: TokenAmount,
+            token_out: Token,
+            user: str = None,
+            recipient: str = None,
+            exact_output: bool = False,
+    ) -> list[tuple[Bridge, BridgeInfo]]:
+        """Quotes of bridges answered within deadline, the best first"""
+        user = user or self.evm_client.account.address
+        recipient = recipient or user
+        tasks = {
+            asyncio.create_task(self._quote(bridge, BridgeInfo(
+                bridge.NAME, user, recipient, self.evm_client.log_info, token_amount_in, token_out, exact_output
+            ))): bridge
+            for bridge in self.bridges
+        }
+        usd_per_gas, *_ = await asyncio.gather(
+            self._usd_per_gas(token_amount_in),
+            token_amount_in.token.update_price(),
+            token_out.update_price(),
+            return_exceptions=True,
+        )
+        if isinstance(usd_per_gas, Exception):
+            logger.warning(f'{self} | Couldn\'t get gas price, ranking without gas. {usd_per_gas}')
+            usd_per_gas = Decimal(0)
+        done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+        for task in pending:
+            task.cancel()
+            logger.warning(f'{self} | {tasks[task].NAME} didn\'t quote in {self.deadline}s')
+        quotes = [(tasks[task], task.result()) for task in done if task.result()]
+        fee_tokens = {id(quote.bridge_fee.token): quote.bridge_fee.token for _, quote in quotes if quote.bridge_fee}
+        await asyncio.gather(
+            *[token.update_price() for token in fee_tokens.values() if not token.price], return_exceptions=True
+        )
+        quotes.sort(
+            key=lambda item: self._net_output_in_usd(item[1], usd_per_gas * self._gas_limit(*item)), reverse=True
+        )
+        for bridge, quote in quotes:
+            logger.debug(
+                f'{self} | {bridge.NAME}: +{quote.token_amount_out}, fee {quote.bridge_fee}, net '
+                f'{self._net_output_in_usd(quote, usd_per_gas * self._gas_limit(bridge, quote)):.2f}$'
+            )
+        return quotes
+
+    async def build_tx(
+            self, quotes: list[tuple[Bridge, BridgeInfo]], use_full_balance: bool = False
+    ) -> BridgeInfo | None:
+        """Estimates gas of the best quote, falls back to the next one if it fails"""
+        for bridge, quote in quotes:
+            key = self._key(bridge, quote)
+            cached = self._quotes.get(key)
+            if cached and cached[1].token_amount_in.wei != quote.token_amount_in.wei:
+                # Quote was made for another amount of the same bucket, its tx data has that amount
+                self._quotes.pop(key)
+                quote = await self._quote(bridge, quote.copy())
+                if not quote:
+                    continue
+            client = self._client(quote.token_amount_in.token.chain)
+            try:
+                if client is not self.evm_client:
+                    bridge = type(bridge)(session=self.http_session, client=client)
+                if bridge_info := await bridge.build_tx(quote, use_full_balance):
+                    return bridge_info
+            finally:
+                if client is not self.evm_client:
+                    await client.close()
+            logger.warning(f'{self} | Couldn\'t build {bridge.NAME} tx, trying next bridge')
+        return None
+
+    async def bridge(
+            self, token_amount_in: TokenAmount, token_out: Token, use_full_balance: bool = False
+    ) -> BridgeInfo | None:
+        if not (quotes := await self.quote(token_amount_in, token_out)):
+            logger.warning(f'{self} | No quotes for {token_amount_in} to {token_out.chain}')
+            return None
+        return await self.build_tx(quotes, use_full_balance)
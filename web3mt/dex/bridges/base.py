@@ -23,6 +23,8 @@ class BridgeInfo:
         self.exact_output = exact_output
         self.token_amount_out: TokenAmount | None = None
         self.bridge_fee: TokenAmount | None = None
+        self.tx: dict | None = None  # to and data of quoted tx, gas isn't estimated yet
+        self.gas_limit: int | None = None  # gas of quoted tx if bridge API returns it
         self._tx_params: TransactionParameters | None = None
 
     def __str__(self):
@@ -32,6 +34,18 @@ class BridgeInfo:
             f'+{self.token_amount_out}. Bridge fee: {self.bridge_fee}. {self.tx_params}'
         )
 
+    def copy(self) -> 'BridgeInfo':
+        """Quote without tx params, so cached quote isn't changed by gas estimation of its user"""
+        bridge_info = BridgeInfo(
+            self.name, self.user, self.recipient, self.log_info, self.token_amount_in, self.token_out,
+            self.exact_output
+        )
+        bridge_info.token_amount_out = self.token_amount_out
+        bridge_info.bridge_fee = self.bridge_fee
+        bridge_info.tx = self.tx
+        bridge_info.gas_limit = self.gas_limit
+        return bridge_info
+
     @property
     def tx_params(self):
         return self._tx_params
@@ -47,9 +61,32 @@ class BridgeInfo:
 class Bridge(DEX, ABC):
     NAME = 'Bridge'
     ABI = FileManager.read_json(Path(__file__).parent / 'abi.json')
+    GAS_LIMIT = 300_000  # rough gas of bridge tx to rank quotes before gas estimation if API doesn't return it
+    registry: dict[str, type['Bridge']] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Bridge.registry[cls.NAME] = cls
+
+    async def quote(self, bridge_info: BridgeInfo) -> BridgeInfo | None:
+        """Fills `token_amount_out`, `bridge_fee` and `tx` of bridge info, returns None if route isn't supported"""
+        raise NotImplementedError
+
+    async def build_tx(self, bridge_info: BridgeInfo, use_full_balance: bool = False) -> BridgeInfo | None:
+        """Estimates gas of quoted tx"""
+        tx_params = await self.evm_client.create_tx_params(
+            to=bridge_info.tx['to'], value=bridge_info.token_amount_in,
+            data=bridge_info.tx['data'], use_full_balance=use_full_balance
+        )
+        if not isinstance(tx_params, TransactionParameters):  # (False, error) if gas estimation failed
+            return None
+        bridge_info.tx_params = tx_params
+        return self.validate_bridge_info(bridge_info)
 
     async def bridge(self, bridge_info: BridgeInfo, use_full_balance: bool = False) -> BridgeInfo | None:
-        pass
+        if not await self.quote(bridge_info):
+            return None
+        return await self.build_tx(bridge_info, use_full_balance)
 
     async def refuel(self, bridge_info: BridgeInfo, use_full_balance: bool = False) -> BridgeInfo | None:
         pass
@@ -1,4 +1,3 @@
-from eth_utils import to_checksum_address
 from web3mt.dex.bridges.base import Bridge, BridgeInfo
 from web3mt.onchain.evm.models import TokenAmount
 from web3mt.utils import logger
@@ -8,8 +7,14 @@ class Bungee(Bridge):
     NAME = 'Bungee'
     REFUEL_API_URL = 'https://refuel.socket.tech'
     BRIDGE_API_URL = 'https://api.socket.tech/v2'
+    GAS_LIMIT = 80_000  # depositNativeToken of refuel contract
 
-    async def refuel(self, bridge_info: BridgeInfo, use_full_balance: bool = False) -> BridgeInfo | None:
+    async def quote(self, bridge_info: BridgeInfo) -> BridgeInfo | None:
+        if (
+                bridge_info.token_amount_in.token != bridge_info.token_amount_in.token.chain.native_token
+                or bridge_info.token_out != bridge_info.token_out.chain.native_token
+        ):
+            return None  # refuel of native tokens only
         _, data = await self.http_session.get(
             f'{self.REFUEL_API_URL}/quote', params=dict(
                 fromChainId=bridge_info.token_amount_in.token.chain.chain_id,
@@ -25,16 +30,14 @@ class Bungee(Bridge):
         bridge_info.token_amount_out = TokenAmount(
             data["estimatedOutput"], True, bridge_info.token_out
         )
-        bridge_info.tx_params = await self.evm_client.create_tx_params(
-            to=data['contractAddress'], value=bridge_info.token_amount_in,
-            data=(
-                self.evm_client.w3.eth.contract(
-                    to_checksum_address(data['contractAddress']), abi=self.ABI['bungee_refuel']
-                ).encodeABI(
-                    'depositNativeToken',
-                    args=[bridge_info.token_out.chain.chain_id, self.evm_client.account.address]
-                )
-            ),
-            use_full_balance=use_full_balance
+        bridge_info.tx = dict(
+            to=data['contractAddress'],
+            data=self.evm_client.contract(data['contractAddress'], self.ABI['bungee_refuel']).encode_abi(
+                'depositNativeToken',
+                args=[bridge_info.token_out.chain.chain_id, bridge_info.recipient]
+            )
         )
-        return self.validate_bridge_info(bridge_info)
+        return bridge_info
+
+    async def refuel(self, bridge_info: BridgeInfo, use_full_balance: bool = False) -> BridgeInfo | None:
+        return await self.bridge(bridge_info, use_full_balance)
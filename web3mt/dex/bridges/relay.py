@@ -8,8 +8,9 @@ from web3mt.utils import logger
 class Relay(Bridge):
     NAME = 'Relay'
     API_URL = 'https://api.relay.link/'
+    GAS_LIMIT = 60_000  # deposit to solver, plain transfer with request id for native token
 
-    async def bridge(self, bridge_info: BridgeInfo, use_full_balance: bool = False) -> BridgeInfo | None:
+    async def quote(self, bridge_info: BridgeInfo) -> BridgeInfo | None:
         origin_currency: str = (
             bridge_info.token_amount_in.token.burner_address
             if (
@@ -48,8 +49,6 @@ class Relay(Bridge):
             )
         )
         tx_data = data['steps'][0]['items'][0]['data']
-        bridge_info.tx_params = await self.evm_client.create_tx_params(
-            to=tx_data['to'], value=bridge_info.token_amount_in,
-            data=tx_data['data'], use_full_balance=use_full_balance
-        )
-        return self.validate_bridge_info(bridge_info)
+        bridge_info.tx = dict(to=tx_data['to'], data=tx_data['data'])
+        bridge_info.gas_limit = int(str(tx_data['gas']), 0) if tx_data.get('gas') else None
+        return bridge_info
@@ -1,4 +1,4 @@
-from eth_utils import to_checksum_address, to_bytes
+from eth_utils import to_bytes
 
 from web3mt.dex.bridges.base import BridgeInfo, Bridge
 from web3mt.onchain.evm.models import TokenAmount
@@ -7,8 +7,9 @@ from web3mt.onchain.evm.models import TokenAmount
 class RouterNitro(Bridge):
     NAME = 'RouterNitro'
     API_URL = 'https://api-beta.pathfinder.routerprotocol.com/api/v2/'
+    GAS_LIMIT = 200_000  # iDeposit of asset forwarder
 
-    async def bridge(self, bridge_info: BridgeInfo, use_full_balance: bool = False) -> BridgeInfo | None:
+    async def quote(self, bridge_info: BridgeInfo) -> BridgeInfo | None:
         params = dict(
             fromTokenAddress=bridge_info.token_amount_in.token.address,
             toTokenAddress=bridge_info.token_out.address, amount=bridge_info.token_amount_in.wei,
@@ -31,8 +32,9 @@ class RouterNitro(Bridge):
             amount=int(data["destination"]["tokenAmount"]), is_wei=True, token=bridge_info.token_out
         )
         tx_data = data["txn"]
-        bridge_info.tx_params = await self.evm_client.create_tx_params(
-            to=tx_data['to'], value=bridge_info.token_amount_in,
+        bridge_info.gas_limit = int(str(tx_data['gasLimit']), 0) if tx_data.get('gasLimit') else None
+        bridge_info.tx = dict(
+            to=tx_data['to'],
             data=self.get_data(
                 to=tx_data['to'],
                 source_value=bridge_info.token_amount_in.wei,
@@ -43,9 +45,9 @@ class RouterNitro(Bridge):
                     str(bridge_info.token_out.chain.chain_id)
                     .encode('ascii').ljust(32, b'\0').hex()
                 )
-            ), use_full_balance=use_full_balance
+            )
         )
-        return self.validate_bridge_info(bridge_info)
+        return bridge_info
 
     def get_data(
             self,
@@ -57,7 +59,7 @@ class RouterNitro(Bridge):
             destination_chain_id_bytes: str,
             partner_id: int = 1
     ):
-        return self.evm_client.w3.eth.contract(to_checksum_address(to), abi=self.ABI['router_asset_forwarder']).encode_abi(
+        return self.evm_client.contract(to, self.ABI['router_asset_forwarder']).encode_abi(
             'iDeposit',
             args=[
                 [
@@ -1,13 +1,13 @@
-import asyncio
 import random
 from abc import ABC
 from decimal import Decimal
-from eth_utils import to_checksum_address
 from web3db import Profile
 
 from web3mt.models import Coin
 from web3mt.offchain.coingecko import CoinGecko
+from web3mt.offchain.prices import price_service
 from web3mt.onchain.evm.client import ProfileClient, BaseClient
+from web3mt.onchain.evm.contracts import checksum, encode_deposit, encode_withdraw
 from web3mt.onchain.evm.models import *
 from web3mt.utils import curl_cffiAsyncSession, Profilecurl_cffiAsyncSession, logger
 
@@ -28,7 +28,7 @@ class DEX(ABC):
         profile: Profile = None,
     ):
         self.http_session = session or (
-            Profilecurl_cffiAsyncSession(profile) if profile else curl_cffiAsyncSession()
+            Profilecurl_cffiAsyncSession(profile) if profile else curl_cffiAsyncSession(pooled=True)
         )
         self.evm_client = client or (
             ProfileClient(profile) if profile else BaseClient()
@@ -46,7 +46,7 @@ class DEX(ABC):
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.http_session.close()
-        await self.evm_client.w3.provider.disconnect()
+        await self.evm_client.close()
 
     async def close(self):
         return await self.__aexit__(None, None, None)
@@ -96,36 +96,34 @@ class DEX(ABC):
             amount = ether_amount or balance * (
                 percentage or random.randint(20, 30) / 100
             )
-        contract = self.evm_client.w3.eth.contract(
-            to_checksum_address(await self.get_weth_address()), abi=DefaultABIs.WETH
-        )
         return await self.evm_client.tx(
-            contract.address,
+            checksum(await self.get_weth_address()),
             f"{method_name} {balance.token}",
-            contract.encodeABI(
-                abi_name, args=[amount.wei] if abi_name == "Unwrap" else None
-            ),
+            encode_deposit() if abi_name == "deposit" else encode_withdraw(amount.wei),
             value=amount if method_name == "Wrap" else TokenAmount(0),
             return_fee_in_usd=True,
             use_full_balance=use_full_balance if method_name == "Wrap" else False,
         )
 
-    async def price_impact_defender(
-        self, token_amount_in: TokenAmount, token_amount_out: TokenAmount
-    ) -> Decimal:
-        await asyncio.gather(
-            *[
-                CoinGecko().get_coin_price(token_amount_in.token),
-                CoinGecko().get_coin_price(token_amount_out.token),
-            ]
-        )
-        dex_slippage = (
-            100 - (token_amount_out.amount_in_usd / token_amount_in.amount_in_usd) * 100
-        )
-
+    def check_price_impact(self, dex_slippage: Decimal) -> Decimal:
         if dex_slippage > self.SLIPPAGE:
             raise PriceImpactException(
                 f"{self.NAME} slippage: {dex_slippage:.3}% > Your slippage {self.SLIPPAGE}%"
             )
-
         return dex_slippage
+
+    async def price_impact_defender(
+        self, token_amount_in: TokenAmount, token_amount_out: TokenAmount, mid_price: Decimal = None
+    ) -> Decimal:
+        """
+        Price impact in percents. With `mid_price` of pools (wei of token out per wei of token in) it's computed
+        locally, otherwise by USD prices of both tokens
+        """
+        if mid_price:
+            dex_slippage = 100 - Decimal(token_amount_out.wei) / (token_amount_in.wei * mid_price) * 100
+            return self.check_price_impact(dex_slippage)
+        await price_service.get_prices([token_amount_in.token, token_amount_out.token])
+        dex_slippage = (
+            100 - (token_amount_out.amount_in_usd / token_amount_in.amount_in_usd) * 100
+        )
+        return self.check_price_impact(dex_slippage)
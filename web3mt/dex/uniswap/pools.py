@@ -0,0 +1,92 @@
+from decimal import Decimal
+from pathlib import Path
+from typing import Optional
+
+from eth_abi import encode
+from eth_utils import keccak
+
+from web3mt.onchain.evm.contracts import checksum, selector
+from web3mt.utils.cache import JSONCache
+
+__all__ = ['POOL_INIT_CODE_HASH', 'sort_tokens', 'compute_pool_address', 'mid_price', 'PoolCache', 'pool_cache']
+
+POOL_INIT_CODE_HASH = '0xe34f199b19b2b4f47f68442619d555527d244f78a3297ea89325f843f87b8b54'
+LIQUIDITY_SELECTOR = selector('liquidity()')
+SLOT0_SELECTOR = selector('slot0()')  # sqrtPriceX96 is the first field
+
+
+def sort_tokens(token_a: str, token_b: str) -> tuple[str, str]:
+    return (token_a, token_b) if int(token_a, 16) < int(token_b, 16) else (token_b, token_a)
+
+
+def compute_pool_address(
+        factory: str, token_a: str, token_b: str, fee: int, init_code_hash: str = POOL_INIT_CODE_HASH
+) -> str:
+    """Uniswap V3 pool address via CREATE2, the same as `factory.getPool` returns for deployed pool"""
+    token0, token1 = sort_tokens(token_a, token_b)
+    salt = keccak(encode(['address', 'address', 'uint24'], [token0, token1, fee]))
+    address = keccak(b'\xff' + bytes.fromhex(factory.removeprefix('0x')) + salt + bytes.fromhex(
+        init_code_hash.removeprefix('0x')
+    ))[12:]
+    return checksum('0x' + address.hex())
+
+
+def mid_price(sqrt_price_x96: int, token_in: str, token_out: str) -> Optional[Decimal]:
+    """Pool price without fee and price impact: wei of token out per wei of token in. None if pool isn't initialized"""
+    if not sqrt_price_x96:
+        return None
+    price = Decimal(sqrt_price_x96) ** 2 / Decimal(2 ** 192)  # token1 per token0
+    token0, _ = sort_tokens(token_in, token_out)
+    return price if token0.lower() == token_in.lower() else 1 / price
+
+
+class PoolCache:
+    """
+    Deployed pools keyed by (chain id, token0, token1, fee). Pool can't be undeployed, so entries never expire.
+    Pools that weren't found aren't stored, they may be created later. Pools of every chain are indexed as graph
+    token -> neighbour token -> fees for route search
+    """
+
+    LOCAL_STORAGE = Path(__file__).parent / 'pools.json'
+
+    def __init__(self, path: Path | str = LOCAL_STORAGE):
+        self._cache = JSONCache(path)
+        self._graphs: dict[int, dict[str, dict[str, set[int]]]] = {}
+        for key in self._cache.keys():
+            chain_id, token0, token1, fee = key.split(':')
+            self._link(int(chain_id), token0, token1, int(fee))
+
+    def __repr__(self):
+        return f'PoolCache({self._cache})'
+
+    @staticmethod
+    def _key(chain_id: int, token_a: str, token_b: str, fee: int) -> str:
+        token0, token1 = sort_tokens(token_a, token_b)
+        return f'{chain_id}:{token0.lower()}:{token1.lower()}:{fee}'
+
+    def get(self, chain_id: int, token_a: str, token_b: str, fee: int) -> Optional[str]:
+        return self._cache.get(self._key(chain_id, token_a, token_b, fee))
+
+    def add(self, chain_id: int, token_a: str, token_b: str, fee: int, address: str, save: bool = True) -> None:
+        key = self._key(chain_id, token_a, token_b, fee)
+        if key in self._cache:
+            return
+        self._cache.set(key, address)
+        self._link(chain_id, token_a.lower(), token_b.lower(), fee)
+        if save:
+            self._cache.save()
+
+    def _link(self, chain_id: int, token_a: str, token_b: str, fee: int) -> None:
+        graph = self._graphs.setdefault(chain_id, {})
+        graph.setdefault(token_a, {}).setdefault(token_b, set()).add(fee)
+        graph.setdefault(token_b, {}).setdefault(token_a, set()).add(fee)
+
+    def graph(self, chain_id: int) -> dict[str, dict[str, set[int]]]:
+        """Lowercase token address -> neighbour token address -> fees of deployed pools"""
+        return self._graphs.get(chain_id, {})
+
+    def save(self) -> None:
+        self._cache.save()
+
+
+pool_cache = PoolCache()
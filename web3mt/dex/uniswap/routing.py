@@ -0,0 +1,64 @@
+from itertools import product
+from typing import Iterator, NamedTuple
+
+from web3mt.onchain.evm.contracts import checksum
+
+__all__ = ['Route', 'encode_path', 'find_routes']
+
+
+def encode_path(tokens: tuple[str, ...] | list[str], fees: tuple[int, ...] | list[int]) -> bytes:
+    """Uniswap V3 path: token, then fee (uint24) and token for every pool"""
+    if len(tokens) != len(fees) + 1:
+        raise ValueError(f'Path of {len(tokens)} tokens needs {len(tokens) - 1} fees, got {len(fees)}')
+    path = bytes.fromhex(tokens[0].removeprefix('0x'))
+    for fee, token in zip(fees, tokens[1:]):
+        path += fee.to_bytes(3, 'big') + bytes.fromhex(token.removeprefix('0x'))
+    return path
+
+
+class Route(NamedTuple):
+    tokens: tuple[str, ...]
+    fees: tuple[int, ...]
+
+    def __str__(self):
+        hops = ''.join(f' -({fee})-> {checksum(token)}' for fee, token in zip(self.fees, self.tokens[1:]))
+        return f'{checksum(self.tokens[0])}{hops}'
+
+    @property
+    def path(self) -> bytes:
+        return encode_path(self.tokens, self.fees)
+
+
+def _token_paths(
+        graph: dict[str, dict[str, set[int]]], token_in: str, token_out: str, hops: int
+) -> Iterator[tuple[str, ...]]:
+    """Token sequences of exactly `hops` pools without repeated tokens"""
+
+    def walk(tokens: tuple[str, ...]) -> Iterator[tuple[str, ...]]:
+        neighbours = graph.get(tokens[-1], {})
+        if len(tokens) == hops:
+            if token_out in neighbours:
+                yield tokens + (token_out,)
+            return
+        if len(tokens) == hops - 1:  # next token must be a neighbour of token out, pruning the widest level
+            neighbours = neighbours.keys() & graph.get(token_out, {}).keys()
+        for neighbour in neighbours:
+            if neighbour != token_out and neighbour not in tokens:
+                yield from walk(tokens + (neighbour,))
+
+    yield from walk((token_in,))
+
+
+def find_routes(
+        graph: dict[str, dict[str, set[int]]], token_in: str, token_out: str, max_hops: int = 3, max_routes: int = 64
+) -> list[Route]:
+    """Routes of up to `max_hops` pools in pool graph, shorter first. Search stops after `max_routes` routes"""
+    token_in, token_out = token_in.lower(), token_out.lower()
+    routes = []
+    for hops in range(1, max_hops + 1):
+        for tokens in _token_paths(graph, token_in, token_out, hops):
+            for fees in product(*[sorted(graph[a][b]) for a, b in zip(tokens, tokens[1:])]):
+                routes.append(Route(tokens, fees))
+                if len(routes) >= max_routes:
+                    return routes
+    return routes
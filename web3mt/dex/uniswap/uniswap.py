@@ -4,9 +4,15 @@ from decimal import Decimal
 from enum import Enum
 from pathlib import Path
 from typing import AsyncIterable
+
+from eth_abi import encode
 from web3db import Profile
 from web3mt.dex.models import DEX, PriceImpactException
+from web3mt.dex.uniswap.pools import LIQUIDITY_SELECTOR, SLOT0_SELECTOR, compute_pool_address, mid_price, pool_cache
+from web3mt.dex.uniswap.routing import Route, find_routes
 from web3mt.onchain.evm.client import ProfileClient
+from web3mt.onchain.evm.contracts import selector
+from web3mt.onchain.evm.multicall import Call
 from web3mt.onchain.evm.models import *
 from web3mt.onchain.evm.models import Sepolia
 from web3mt.utils import FileManager, logger, curl_cffiAsyncSession
@@ -28,6 +34,8 @@ class Fee(Enum):
 
 ONE_HOUR = 10 * 60
 ABI = FileManager.read_json(Path(__file__).parent / './abi.json')
+QUOTE_EXACT_INPUT_SINGLE_SELECTOR = selector('quoteExactInputSingle(address,address,uint24,uint256,uint160)')
+QUOTE_EXACT_INPUT_SELECTOR = selector('quoteExactInput(bytes,uint256)')
 
 
 class Uniswap(DEX):
@@ -46,73 +54,99 @@ class Uniswap(DEX):
         )
     }
 
+    _weth_addresses: dict[int, str] = {}  # WETH9 of periphery contracts never changes, shared by all instances
+    _missing_pools: set[tuple] = set()  # pools checked in this run and not found
+
     def __init__(self, client: ProfileClient = None, session: curl_cffiAsyncSession = None, profile: Profile = None):
-        self._weth_address = None
         super().__init__(session, client, profile)
 
     @property
     async def weth_address(self):
-        if not self._weth_address:
-            contract = self.evm_client.w3.eth.contract(self.CONTRACTS[self.evm_client.chain].quoter, abi=ABI['quoter'])
-            self.weth_address = await contract.functions.WETH9().call()
-        return self._weth_address
+        chain_id = self.evm_client.chain.chain_id
+        if chain_id not in self._weth_addresses:
+            contract = self.evm_client.contract(self.CONTRACTS[self.evm_client.chain].quoter, ABI['quoter'])
+            self._weth_addresses[chain_id] = await contract.functions.WETH9().call()
+        return self._weth_addresses[chain_id]
 
     @weth_address.setter
     def weth_address(self, address):
-        self._weth_address = address
+        self._weth_addresses[self.evm_client.chain.chain_id] = address
 
     async def get_weth_address(self, chain: Chain = None) -> str:
         return await self.weth_address
 
-    async def swap(self, token_amount_in: TokenAmount, token_out: Token):
-        is_native_token_in = token_amount_in.token.address == self.evm_client.chain.native_token.address
-        is_native_token_out = token_out.address == self.evm_client.chain.native_token.address
-
-        contract = self.evm_client.w3.eth.contract(self.CONTRACTS[self.evm_client.chain].router, abi=ABI['router'])
-        if is_native_token_in or is_native_token_out:
-            self.weth_address = await contract.functions.WETH9().call()
+    async def _token_address(self, token: Token) -> str:
+        return token.address if token.address != self.evm_client.chain.native_token.address else await self.weth_address
 
-        async for fee in self.get_pool_fee(token_amount_in.token, token_out):
-            token_amount_out = await self.quote(token_amount_in, token_out, fee)
+    async def swap(self, token_amount_in: TokenAmount, token_out: Token):
+        """Swaps in the best direct pool, if none of them passes price impact check swaps by multi-hop route"""
+        contract = self.evm_client.contract(self.CONTRACTS[self.evm_client.chain].router, ABI['router'])
+        for fee, (token_amount_out, price) in (await self.quote_all(token_amount_in, token_out)).items():
             try:
-                dex_slippage = await self.price_impact_defender(token_amount_in, token_amount_out)
+                dex_slippage = await self.price_impact_defender(token_amount_in, token_amount_out, price)
                 logger.debug(f'{self.evm_client.log_info} | Found pool with fee {fee.value}')
                 break
             except PriceImpactException as e:
                 logger.warning(f'{self.evm_client.log_info} | {e}')
         else:
-            raise KeyError(f'No pool found for {token_amount_in.token} and {token_out}')
+            return await self.swap_route(token_amount_in, token_out)
         token_amount_out.wei = int(token_amount_out.wei * (1 - ((self.SLIPPAGE - dex_slippage) / 100)))
         swap_args = (
-            await self.weth_address if is_native_token_in else token_amount_in.token.address,
-            await self.weth_address if is_native_token_out else token_amount_out.token.address,
+            await self._token_address(token_amount_in.token),
+            await self._token_address(token_amount_out.token),
             fee.value,
-            str(self.evm_client.account.address) if not is_native_token_out
-            else '0x0000000000000000000000000000000000000002',
+            self._recipient(token_out),
             token_amount_in.wei,
             token_amount_out.wei,
             0
         )
-        swap_data = contract.encodeABI('exactInputSingle', args=[swap_args])
+        await self._send_swap(contract, contract.encode_abi('exactInputSingle', args=[swap_args]), token_amount_in,
+                              token_amount_out)
+
+    def _recipient(self, token_out: Token) -> str:
+        """Router keeps WETH of native token out until `unwrapWETH9`"""
+        if token_out.address == self.evm_client.chain.native_token.address:
+            return '0x0000000000000000000000000000000000000002'
+        return str(self.evm_client.account.address)
+
+    async def _send_swap(self, contract, swap_data: str, token_amount_in: TokenAmount, token_amount_out: TokenAmount):
+        is_native_token_in = token_amount_in.token.address == self.evm_client.chain.native_token.address
+        is_native_token_out = token_amount_out.token.address == self.evm_client.chain.native_token.address
         data = [swap_data]
         if is_native_token_out:
             unwrap_args = token_amount_out.wei, str(self.evm_client.account.address)
-            unwrap_data = contract.encodeABI('unwrapWETH9', args=unwrap_args)
+            unwrap_data = contract.encode_abi('unwrapWETH9', args=unwrap_args)
             data.append(unwrap_data)
+        if not is_native_token_in:
             await self.evm_client.approve(contract, token_amount_in)
         await self.evm_client.tx(
             contract.address, f'Swap {token_amount_in} to {token_amount_out}',
-            contract.encodeABI('multicall', args=[int(time.time()) + ONE_HOUR, data]),
+            contract.encode_abi('multicall', args=[int(time.time()) + ONE_HOUR, data]),
             token_amount_in if is_native_token_in else TokenAmount(0, token=token_amount_in.token)
         )
 
+    async def swap_route(self, token_amount_in: TokenAmount, token_out: Token, max_hops: int = 3):
+        """Swaps by the best route of up to `max_hops` pools with one `exactInput`"""
+        contract = self.evm_client.contract(self.CONTRACTS[self.evm_client.chain].router, ABI['router'])
+        for route, token_amount_out, price in await self.quote_routes(token_amount_in, token_out, max_hops):
+            try:
+                dex_slippage = await self.price_impact_defender(token_amount_in, token_amount_out, price)
+                logger.debug(f'{self.evm_client.log_info} | Found route {route}')
+                break
+            except PriceImpactException as e:
+                logger.warning(f'{self.evm_client.log_info} | {e}')
+        else:
+            raise KeyError(f'No route found for {token_amount_in.token} and {token_out}')
+        token_amount_out.wei = int(token_amount_out.wei * (1 - ((self.SLIPPAGE - dex_slippage) / 100)))
+        swap_args = (route.path, self._recipient(token_out), token_amount_in.wei, token_amount_out.wei)
+        await self._send_swap(contract, contract.encode_abi('exactInput', args=[swap_args]), token_amount_in,
+                              token_amount_out)
+
     async def quote(self, token_amount_in: TokenAmount, token_out: Token, fee: Fee = Fee.TIER_100):
-        contract = self.evm_client.w3.eth.contract(self.CONTRACTS[self.evm_client.chain].quoter, abi=ABI['quoter'])
+        contract = self.evm_client.contract(self.CONTRACTS[self.evm_client.chain].quoter, ABI['quoter'])
         args = (
-            token_amount_in.token.address if token_amount_in.token.address != self.evm_client.chain.native_token.address
-            else await self.weth_address,
-            token_out.address if token_out.address != self.evm_client.chain.native_token.address
-            else await self.weth_address, fee.value, token_amount_in.wei, 0
+            await self._token_address(token_amount_in.token), await self._token_address(token_out), fee.value,
+            token_amount_in.wei, 0
         )
         res = await contract.functions.quoteExactInputSingle(*args).call()
         if token_out != self.evm_client.chain.native_token:
@@ -120,18 +154,153 @@ class Uniswap(DEX):
         token_amount_out = TokenAmount(res, True, token_out)
         return token_amount_out
 
+    def _pool_address(self, token_a: str, token_b: str, fee: Fee) -> str:
+        return pool_cache.get(self.evm_client.chain.chain_id, token_a, token_b, fee.value) or compute_pool_address(
+            self.CONTRACTS[self.evm_client.chain].factory, token_a, token_b, fee.value
+        )
+
+    def _remember_pools(self, token_a: str, token_b: str, pools: dict[Fee, str]) -> None:
+        chain_id = self.evm_client.chain.chain_id
+        new_pools = {
+            fee: pool for fee, pool in pools.items() if not pool_cache.get(chain_id, token_a, token_b, fee.value)
+        }
+        for fee, pool in new_pools.items():
+            pool_cache.add(chain_id, token_a, token_b, fee.value, pool, save=False)
+        if new_pools:
+            pool_cache.save()
+
+    async def quote_all(
+            self, token_amount_in: TokenAmount, token_out: Token
+    ) -> dict[Fee, tuple[TokenAmount, Decimal | None]]:
+        """
+        Liquidity, price and quote of every fee tier in one multicall, pool addresses are computed locally.
+        Returns quotes and mid prices of pools with liquidity, the best quote first
+        """
+        token_in_address = await self._token_address(token_amount_in.token)
+        token_out_address = await self._token_address(token_out)
+        quoter = self.CONTRACTS[self.evm_client.chain].quoter
+        pools = {fee: self._pool_address(token_in_address, token_out_address, fee) for fee in Fee}
+        calls = []
+        for fee, pool in pools.items():
+            calls += [
+                Call(pool, LIQUIDITY_SELECTOR, ('uint128',)),
+                Call(pool, SLOT0_SELECTOR, ('uint160',)),
+                Call(quoter, QUOTE_EXACT_INPUT_SINGLE_SELECTOR + encode(
+                    ['address', 'address', 'uint24', 'uint256', 'uint160'],
+                    [token_in_address, token_out_address, fee.value, token_amount_in.wei, 0]
+                )),
+            ]
+        results = await self.evm_client.multicall.aggregate3(calls)
+        if token_out != self.evm_client.chain.native_token:
+            await token_out.get_token_info()
+        deployed, quotes = {}, {}
+        for i, (fee, pool) in enumerate(pools.items()):
+            liquidity, sqrt_price_x96, amount_out = results[3 * i: 3 * i + 3]
+            if liquidity is None:  # no code at pool address
+                continue
+            deployed[fee] = pool
+            if liquidity and amount_out:
+                quotes[fee] = (
+                    TokenAmount(amount_out, True, token_out),
+                    mid_price(sqrt_price_x96, token_in_address, token_out_address),
+                )
+        self._remember_pools(token_in_address, token_out_address, deployed)
+        return dict(sorted(quotes.items(), key=lambda item: item[1][0].wei, reverse=True))
+
+    async def get_pools(self, token_in: Token, token_out: Token) -> dict[Fee, str]:
+        """Deployed pools of every fee tier. Cached pools are known without RPC, others are checked in one multicall"""
+        token_in_address = await self._token_address(token_in)
+        token_out_address = await self._token_address(token_out)
+        pools = {fee: self._pool_address(token_in_address, token_out_address, fee) for fee in Fee}
+        chain_id = self.evm_client.chain.chain_id
+        unknown = [fee for fee in Fee if not pool_cache.get(chain_id, token_in_address, token_out_address, fee.value)]
+        if unknown:
+            results = await self.evm_client.multicall.aggregate3(
+                [Call(pools[fee], LIQUIDITY_SELECTOR, ('uint128',)) for fee in unknown]
+            )
+            for fee, liquidity in zip(unknown, results):
+                if liquidity is None:
+                    pools.pop(fee)
+            self._remember_pools(token_in_address, token_out_address, pools)
+        return pools
+
     async def get_pool_fee(self, token_in: Token, token_out: Token) -> AsyncIterable[Fee]:
-        contract = self.evm_client.w3.eth.contract(self.CONTRACTS[self.evm_client.chain].factory, abi=ABI['factory'])
-        for fee in Fee:
-            pool_address = await contract.functions.getPool(
-                token_in.address if token_in.address != self.evm_client.chain.native_token.address
-                else await self.weth_address,
-                token_out.address if token_out.address != self.evm_client.chain.native_token.address else
-                await self.weth_address,
-                fee.value
-            ).call()
-            if pool_address != '0x0000000000000000000000000000000000000000':
-                yield fee
+        for fee in await self.get_pools(token_in, token_out):
+            yield fee
+
+    def _connectors(self) -> list[str]:
+        """Tokens most of pools are paired with, intermediate tokens of routes are searched among them first"""
+        chain = self.evm_client.chain
+        return [token.address for tokens in TOKENS.values() for token in tokens.values() if token.chain == chain]
+
+    async def discover_pools(self, token_in_address: str, token_out_address: str) -> None:
+        """
+        Checks not yet known pools of every fee tier between tokens, connectors and each other in one multicall
+        """
+        chain_id = self.evm_client.chain.chain_id
+        tokens = [token_in_address, token_out_address, await self.weth_address, *self._connectors()]
+        tokens = list(dict.fromkeys(token.lower() for token in tokens))
+        pairs = {tuple(sorted((token_a, token_b))) for token_a in tokens for token_b in tokens if token_a != token_b}
+        candidates = [
+            (token_a, token_b, fee) for token_a, token_b in pairs for fee in Fee
+            if not pool_cache.get(chain_id, token_a, token_b, fee.value)
+            and (chain_id, token_a, token_b, fee) not in self._missing_pools
+        ]
+        if not candidates:
+            return
+        pools = [self._pool_address(token_a, token_b, fee) for token_a, token_b, fee in candidates]
+        results = await self.evm_client.multicall.aggregate3(
+            [Call(pool, LIQUIDITY_SELECTOR, ('uint128',)) for pool in pools]
+        )
+        found = False
+        for (token_a, token_b, fee), pool, liquidity in zip(candidates, pools, results):
+            if liquidity is None:
+                self._missing_pools.add((chain_id, token_a, token_b, fee))
+            else:
+                pool_cache.add(chain_id, token_a, token_b, fee.value, pool, save=False)
+                found = True
+        if found:
+            pool_cache.save()
+
+    async def quote_routes(
+            self, token_amount_in: TokenAmount, token_out: Token, max_hops: int = 3, max_routes: int = 64
+    ) -> list[tuple[Route, TokenAmount, Decimal | None]]:
+        """
+        Routes of up to `max_hops` pools from pool graph of the chain, all quoted by `quoteExactInput` in one
+        multicall with prices of their pools. Returns routes with quotes and mid prices, the best quote first
+        """
+        token_in_address = await self._token_address(token_amount_in.token)
+        token_out_address = await self._token_address(token_out)
+        await self.discover_pools(token_in_address, token_out_address)
+        routes = find_routes(
+            pool_cache.graph(self.evm_client.chain.chain_id), token_in_address, token_out_address, max_hops, max_routes
+        )
+        if not routes:
+            return []
+        quoter = self.CONTRACTS[self.evm_client.chain].quoter
+        hops = {
+            (token_a, token_b, fee): self._pool_address(token_a, token_b, Fee(fee))
+            for route in routes for token_a, token_b, fee in zip(route.tokens, route.tokens[1:], route.fees)
+        }
+        results = await self.evm_client.multicall.aggregate3([
+            *[Call(quoter, QUOTE_EXACT_INPUT_SELECTOR + encode(['bytes', 'uint256'], [route.path, token_amount_in.wei]))
+              for route in routes],
+            *[Call(pool, SLOT0_SELECTOR, ('uint160',)) for pool in hops.values()],
+        ])
+        prices = {
+            hop: mid_price(sqrt_price_x96, hop[0], hop[1]) for hop, sqrt_price_x96 in zip(hops, results[len(routes):])
+        }
+        if token_out != self.evm_client.chain.native_token:
+            await token_out.get_token_info()
+        quotes = []
+        for route, amount_out in zip(routes, results):
+            if not amount_out:
+                continue
+            route_price = Decimal(1)
+            for hop in zip(route.tokens, route.tokens[1:], route.fees):
+                route_price = route_price * prices[hop] if route_price and prices[hop] else None
+            quotes.append((route, TokenAmount(amount_out, True, token_out), route_price))
+        return sorted(quotes, key=lambda item: item[1].wei, reverse=True)
 
     async def create_pool(self, token_in: Token, token_out: Token, fee: int = Fee.TIER_100):
         ...
@@ -5,7 +5,6 @@ from web3mt.utils import format_number, logger
 
 class Coin:
     _instances = {}
-    _prices = {}
 
     def __new__(cls, symbol: str, *args, **kwargs):
         symbol = symbol.upper()
@@ -31,13 +30,26 @@ class Coin:
 
     @property
     def price(self) -> Decimal | None:
-        return self._prices.get(self.symbol) or self._prices.get(
+        """Price from `price_service`, None once it's older than its `stale_ttl`"""
+        return self._get_price(self.symbol) or self._get_price(
             self.symbol.removeprefix("W")
         )
 
     @price.setter
     def price(self, value: int | float | str | Decimal):
-        self._prices[self.symbol] = Decimal(str(value))
+        self._set_price(self.symbol, value)
+
+    @staticmethod
+    def _get_price(symbol: str) -> Decimal | None:
+        from web3mt.offchain.prices import price_service
+
+        return price_service.get_cached(symbol)
+
+    @staticmethod
+    def _set_price(symbol: str, value: int | float | str | Decimal) -> None:
+        from web3mt.offchain.prices import price_service
+
+        price_service.set_price(symbol, Decimal(str(value)))
 
     @classmethod
     def from_instance(cls, instance):
@@ -48,9 +60,9 @@ class Coin:
         return cls._instances
 
     async def update_price(self) -> Decimal:
-        from web3mt.cex import OKX
+        from web3mt.offchain.prices import price_service
 
-        self.price = await OKX().get_coin_price(self)
+        await price_service.get_price(self)
         return self.price
 
 
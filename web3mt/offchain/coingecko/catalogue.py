@@ -0,0 +1,133 @@
+import asyncio
+import json
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Iterable, Optional
+
+from web3mt.utils import logger
+
+__all__ = ["CoinCatalogue"]
+
+
+class CoinCatalogue:
+    """
+    Memory-resident list of CoinGecko coins with hash indexes by id, symbol, (symbol, name) and
+    (platform, contract address). Loaded lazily once per process from local pickle cache, which is seeded from
+    `coins.json` on the first run and loads faster than it. File IO runs in a thread, so it doesn't block the event
+    loop. Stale catalogue is still served while the fresh one is fetched in the background
+    """
+
+    JSON_STORAGE = Path(__file__).parent / "coins.json"
+    LOCAL_STORAGE = Path(__file__).parent / "coins_cache.pickle"
+
+    def __init__(
+        self,
+        path: Path | str = LOCAL_STORAGE,
+        seed_path: Path | str = JSON_STORAGE,
+        ttl: float = 7 * 24 * 3600,
+    ):
+        self.path = Path(path)
+        self.seed_path = Path(seed_path)
+        self.ttl = ttl
+        self.updated_at: float = 0
+        self._loaded = False
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._load_lock = asyncio.Lock()
+        self._by_id: dict[str, dict] = {}
+        self._by_symbol: dict[str, list[dict]] = {}
+        self._by_symbol_and_name: dict[tuple[str, str], dict] = {}
+        self._by_contract: dict[tuple[str, str], dict] = {}
+
+    def __repr__(self):
+        return f"CoinCatalogue({self.path.name}, coins={len(self._by_id)})"
+
+    def __len__(self):
+        return len(self._by_id)
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() - self.updated_at > self.ttl
+
+    def _index(self, coins: Iterable[dict]) -> None:
+        by_id, by_symbol, by_symbol_and_name, by_contract = {}, {}, {}, {}
+        for coin in coins:
+            by_id[coin["id"]] = coin
+            by_symbol.setdefault(coin["symbol"], []).append(coin)
+            by_symbol_and_name.setdefault((coin["symbol"], coin["name"]), coin)
+            for platform, address in coin["platforms"].items():
+                if address:
+                    by_contract.setdefault((platform, address.lower()), coin)
+        self._by_id, self._by_symbol = by_id, by_symbol
+        self._by_symbol_and_name, self._by_contract = by_symbol_and_name, by_contract
+
+    def _read(self) -> Optional[list[dict]]:
+        try:
+            with open(self.path, "rb") as file:
+                data = pickle.load(file)
+            updated_at, coins = data["updated_at"], data["coins"]
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, KeyError, TypeError, OSError) as e:
+            logger.warning(f"{self} | Couldn't load catalogue, reseeding. {e}")
+            return None
+        self.updated_at = updated_at
+        return coins
+
+    def _write(self, coins: list[dict], updated_at: float) -> None:
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "wb") as file:
+            pickle.dump(dict(updated_at=updated_at, coins=coins), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> None:
+        coins = self._read()
+        if coins is None and self.seed_path.exists():
+            with open(self.seed_path, encoding="utf-8") as file:
+                coins = json.load(file)
+            for coin in coins:
+                coin["platforms"] = coin.get("platforms") or {}
+            self.updated_at = self.seed_path.stat().st_mtime
+            self._write(coins, self.updated_at)
+            logger.debug(f"{self} | Seeded from {self.seed_path.name}")
+        self._index(coins or [])
+        self._loaded = True
+
+    def update(self, coins: list[dict]) -> None:
+        for coin in coins:
+            coin["platforms"] = coin.get("platforms") or {}
+        self.updated_at = time.time()
+        self._write(coins, self.updated_at)
+        self._index(coins)
+        self._loaded = True
+
+    async def refresh(self, fetch: Callable[[], Awaitable[list[dict]]]) -> None:
+        try:
+            await asyncio.to_thread(self.update, await fetch())
+            logger.debug(f"{self} | Refreshed")
+        except Exception as e:
+            logger.warning(f"{self} | Couldn't refresh coins list. {e}")
+
+    async def ensure(self, fetch: Callable[[], Awaitable[list[dict]]]) -> None:
+        """Loads catalogue on first use. Empty catalogue is fetched right away, stale one in the background"""
+        if not self._loaded or not self._by_id:
+            async with self._load_lock:  # concurrent first callers wait for one load and one fetch
+                if not self._loaded:
+                    await asyncio.to_thread(self.load)
+                if not self._by_id:
+                    await self.refresh(fetch)
+        elif self.is_stale and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self.refresh(fetch))
+
+    def by_id(self, coin_id: str) -> Optional[dict]:
+        return self._by_id.get(coin_id)
+
+    def by_symbol(self, symbol: str) -> list[dict]:
+        return self._by_symbol.get(symbol.lower(), [])
+
+    def by_symbol_and_name(self, symbol: str, name: str) -> Optional[dict]:
+        return self._by_symbol_and_name.get((symbol.lower(), name))
+
+    def by_contract(self, platform: str, address: str) -> Optional[dict]:
+        return self._by_contract.get((platform, address.lower()))
@@ -1,16 +1,14 @@
-from datetime import datetime, timedelta
 from decimal import Decimal
-from pathlib import Path
 from web3mt.config import env
 from web3mt.models import Coin
+from web3mt.offchain.coingecko.catalogue import CoinCatalogue
 from web3mt.utils import curl_cffiAsyncSession
-from web3mt.utils import FileManager
 from web3mt.utils.http_sessions import SessionConfig
 
 
 class CoinGecko(curl_cffiAsyncSession):
     URL = 'https://api.coingecko.com/api/v3/'
-    LOCAL_STORAGE = Path(__file__).parent / 'coins.json'
+    catalogue = CoinCatalogue()
 
     def __new__(cls):
         if not hasattr(cls, 'instance'):
@@ -23,29 +21,26 @@ class CoinGecko(curl_cffiAsyncSession):
             headers={'x-cg-demo-api-key': env.coingecko_api_key}
         )
 
-    async def _get_coins_list(self, include_contracts_in_response: bool = True) -> list:
-        if (
-                FileManager.file_last_modification_time(self.LOCAL_STORAGE) <
-                (datetime.now() - timedelta(weeks=1)).timestamp()
-                or FileManager.file_data(self.LOCAL_STORAGE).st_size == 0
-        ):
-            _, data = await self.get(
-                self.URL + 'coins/list',
-                params={'include_platform': include_contracts_in_response}
-            )
-            await FileManager.write_async(self.LOCAL_STORAGE, data)
-        else:
-            data = FileManager.read_json(self.LOCAL_STORAGE)
+    async def _fetch_coins_list(self) -> list:
+        _, data = await self.get(self.URL + 'coins/list', params={'include_platform': 'true'})
         return data
 
+    async def get_catalogue(self) -> CoinCatalogue:
+        await self.catalogue.ensure(self._fetch_coins_list)
+        return self.catalogue
+
     async def get_brief_coin_data(
             self, coin: Coin = Coin('ETH'), include_contracts_in_response: bool = True
     ) -> dict | None:
         """Returns id, symbol, name + contract addresses, if include_contracts_in_response=True"""
-        for _coin in await self._get_coins_list(include_contracts_in_response):
-            if _coin.get('symbol') == coin.symbol.lower() and _coin.get('name') == coin.name:
-                return _coin
-        return None
+        _coin = (await self.get_catalogue()).by_symbol_and_name(coin.symbol, coin.name)
+        if _coin and not include_contracts_in_response:
+            return {key: value for key, value in _coin.items() if key != 'platforms'}
+        return _coin
+
+    async def get_coin_by_contract(self, platform: str, address: str) -> dict | None:
+        """Platform is CoinGecko asset platform id, e.g. `ethereum`, `arbitrum-one`"""
+        return (await self.get_catalogue()).by_contract(platform, address)
 
     async def _get_coin_data_by_id(self, coin_id: str = 'ethereum'):
         return (await self.get(self.URL + f'coins/{coin_id.lower()}'))[1]
@@ -58,17 +53,40 @@ class CoinGecko(curl_cffiAsyncSession):
         coin = Coin(coin) if isinstance(coin, str) else coin
         if coin.price:
             return coin.price
-        coins_list = await self._get_coins_list()
-        for coin_data in coins_list:
-            if coin_data.get('symbol') == coin.symbol.lower():
-                data = await self._get_coin_data_by_id(coin_data.get("id"))
-                if 'market_data' in data:
-                    token_info = data['market_data']
-                    if token_info['current_price']:
-                        coin.price = token_info['current_price']['usd']
-                        break
+        for coin_data in (await self.get_catalogue()).by_symbol(coin.symbol):
+            data = await self._get_coin_data_by_id(coin_data.get("id"))
+            if 'market_data' in data:
+                token_info = data['market_data']
+                if token_info['current_price']:
+                    coin.price = token_info['current_price']['usd']
+                    break
         return coin.price
 
+    async def get_prices(self, symbols: list[str], max_ids_per_request: int = 250) -> dict[str, Decimal]:
+        """
+        USD prices of many coins with few `/simple/price` requests. Symbol shared by several coins is resolved to the
+        coin with the largest market cap
+        """
+        catalogue = await self.get_catalogue()
+        ids = {coin['id']: symbol.upper() for symbol in symbols for coin in catalogue.by_symbol(symbol)}
+        coin_ids = list(ids)
+        prices, market_caps = {}, {}
+        for i in range(0, len(coin_ids), max_ids_per_request):
+            _, data = await self.get(
+                self.URL + 'simple/price',
+                params={
+                    'ids': ','.join(coin_ids[i: i + max_ids_per_request]),
+                    'vs_currencies': 'usd',
+                    'include_market_cap': 'true',
+                },
+            )
+            for coin_id, coin_data in data.items():
+                symbol, price = ids[coin_id], coin_data.get('usd')
+                market_cap = coin_data.get('usd_market_cap') or 0
+                if price and market_cap >= market_caps.get(symbol, 0):
+                    prices[symbol], market_caps[symbol] = Decimal(str(price)), market_cap
+        return prices
+
 
 if __name__ == '__main__':
     print(id(CoinGecko()))
@@ -0,0 +1,199 @@
+import asyncio
+import time
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from web3mt.config import env
+from web3mt.models import Coin
+from web3mt.utils import httpxAsyncClient, logger
+from web3mt.utils.http_sessions import SessionConfig
+
+__all__ = ["PriceService", "price_service"]
+
+
+class PriceService:
+    """
+    Process-wide USD prices. Spot tickers of all pairs are fetched with one request per exchange (OKX, Binance, Bybit),
+    coins missing there are priced in bulk by CoinGecko. Price is fresh for `ttl` seconds, after that it's still served
+    for `stale_ttl` seconds while being refreshed in the background. Concurrent requests for the same symbols share
+    one fetch
+    """
+
+    OKX_TICKERS_URL = "https://www.okx.com/api/v5/market/tickers"
+    BINANCE_TICKERS_URL = "https://api.binance.com/api/v3/ticker/price"
+    BYBIT_TICKERS_URL = "https://api.bybit.com/v5/market/tickers"
+    USD_TICKERS = ("USDT", "USDC")
+    STABLECOINS = {"USDT", "USDC", "USD1"}
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        stale_ttl: float = 600,
+        proxy: str = env.default_proxy,
+        use_coingecko: bool = True,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.proxy = proxy
+        self.use_coingecko = use_coingecko
+        self._prices: dict[str, tuple[Optional[Decimal], float]] = {}  # symbol: (price, fetched at)
+        self._tickers_updated_at = -float("inf")
+        self._tickers_task: Optional[asyncio.Task] = None
+        self._pending: dict[str, asyncio.Task] = {}
+        self._background: set[asyncio.Task] = set()
+        self._session: Optional[httpxAsyncClient] = None
+
+    def __repr__(self):
+        return "PriceService"
+
+    @property
+    def session(self) -> httpxAsyncClient:
+        if self._session is None:
+            self._session = httpxAsyncClient(
+                proxy=self.proxy, config=SessionConfig(str(self), requests_echo=False), pooled=True
+            )
+        return self._session
+
+    def _age(self, symbol: str) -> float:
+        return time.monotonic() - self._prices[symbol][1] if symbol in self._prices else float("inf")
+
+    def _set(self, symbol: str, price: Optional[Decimal], fetched_at: float = None) -> None:
+        self._prices[symbol] = (price, fetched_at or time.monotonic())
+
+    @classmethod
+    def _split_pair(cls, pair: str) -> Optional[tuple[str, str]]:
+        for usd_ticker in cls.USD_TICKERS:
+            if pair.endswith(usd_ticker) and len(pair) > len(usd_ticker):
+                return pair.removesuffix(usd_ticker).removesuffix("-"), usd_ticker
+        return None
+
+    async def _okx_tickers(self) -> dict[tuple[str, str], Decimal]:
+        _, data = await self.session.get(self.OKX_TICKERS_URL, params={"instType": "SPOT"})
+        return {
+            pair: Decimal(ticker["askPx"])
+            for ticker in data["data"]
+            if ticker.get("askPx") and (pair := self._split_pair(ticker["instId"]))
+        }
+
+    async def _binance_tickers(self) -> dict[tuple[str, str], Decimal]:
+        _, data = await self.session.get(self.BINANCE_TICKERS_URL)
+        return {
+            pair: Decimal(ticker["price"])
+            for ticker in data
+            if ticker.get("price") and (pair := self._split_pair(ticker["symbol"]))
+        }
+
+    async def _bybit_tickers(self) -> dict[tuple[str, str], Decimal]:
+        _, data = await self.session.get(self.BYBIT_TICKERS_URL, params={"category": "spot"})
+        return {
+            pair: Decimal(ticker["ask1Price"])
+            for ticker in data["result"]["list"]
+            if ticker.get("ask1Price") and (pair := self._split_pair(ticker["symbol"]))
+        }
+
+    async def _update_tickers(self) -> None:
+        sources = [self._okx_tickers(), self._binance_tickers(), self._bybit_tickers()]
+        fetched_at = time.monotonic()
+        prices: dict[str, Decimal] = {}
+        for tickers in await asyncio.gather(*sources, return_exceptions=True):  # sources are in priority order
+            if isinstance(tickers, Exception):
+                logger.warning(f"{self} | Couldn't get tickers. {tickers}")
+                continue
+            for usd_ticker in self.USD_TICKERS:
+                for (symbol, quote), price in tickers.items():
+                    if quote == usd_ticker and price and symbol not in prices:
+                        prices[symbol] = price
+        for symbol, price in prices.items():
+            self._set(symbol, price, fetched_at)
+        self._tickers_updated_at = fetched_at
+        logger.debug(f"{self} | Got prices of {len(prices)} coins from exchanges")
+
+    async def _fetch(self, symbols: list[str]) -> None:
+        if time.monotonic() - self._tickers_updated_at > self.ttl:
+            if self._tickers_task is None or self._tickers_task.done():
+                self._tickers_task = asyncio.create_task(self._update_tickers())
+            await asyncio.shield(self._tickers_task)
+        missing = []
+        for symbol in symbols:
+            if self._age(symbol) <= self.ttl:
+                continue
+            unwrapped = symbol.removeprefix("W")
+            if unwrapped != symbol and self._age(unwrapped) <= self.ttl and self._prices[unwrapped][0]:
+                self._set(symbol, *self._prices[unwrapped])
+            else:
+                missing.append(symbol)
+        if missing and self.use_coingecko:
+            from web3mt.offchain.coingecko import CoinGecko
+
+            try:
+                prices = await CoinGecko().get_prices(missing)
+            except Exception as e:
+                logger.warning(f"{self} | Couldn't get prices of {len(missing)} coins from CoinGecko. {e}")
+                return
+            for symbol in missing:
+                self._set(symbol, prices.get(symbol))  # not found price is cached too, so it isn't requested again
+
+    async def _refresh(self, symbols: list[str]) -> None:
+        new = [symbol for symbol in symbols if symbol not in self._pending]
+        if new:
+            task = asyncio.create_task(self._fetch(new))
+            for symbol in new:
+                self._pending[symbol] = task
+            task.add_done_callback(
+                lambda _: [self._pending.pop(symbol) for symbol in new if self._pending.get(symbol) is task]
+            )
+        tasks = {self._pending[symbol] for symbol in symbols if symbol in self._pending}
+        # Shielded, so cancellation of one caller doesn't cancel fetch awaited by others
+        for result in await asyncio.gather(*[asyncio.shield(task) for task in tasks], return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.warning(f"{self} | Couldn't refresh prices. {result}")
+
+    def _refresh_in_background(self, symbols: list[str]) -> None:
+        task = asyncio.create_task(self._refresh(symbols))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def set_price(self, symbol: str, price: Decimal) -> None:
+        """Price got elsewhere, e.g. from CEX ticker, it expires like fetched ones"""
+        self._set(symbol.upper(), price)
+
+    def get_cached(self, symbol: str) -> Optional[Decimal]:
+        symbol = symbol.upper()
+        if symbol in self.STABLECOINS:
+            return Decimal("1")
+        if self._age(symbol) > self.stale_ttl:
+            return None
+        return self._prices[symbol][0]
+
+    async def get_prices(self, coins: Iterable[str | Coin]) -> dict[str, Optional[Decimal]]:
+        """Returns {symbol: price}. Prices are also set to passed `Coin` instances"""
+        coins = list(coins)
+        symbols = list(dict.fromkeys(
+            (coin.symbol if isinstance(coin, Coin) else coin).upper() for coin in coins
+        ))
+        missing, stale = [], []
+        for symbol in symbols:
+            if symbol in self.STABLECOINS:
+                continue
+            age = self._age(symbol)
+            if age > self.stale_ttl:
+                missing.append(symbol)
+            elif age > self.ttl:
+                stale.append(symbol)
+        if stale:
+            self._refresh_in_background(stale)
+        if missing:
+            await self._refresh(missing)
+        prices = {symbol: self.get_cached(symbol) for symbol in symbols}
+        for coin in coins:
+            # Coin.price reads this cache, only tokens priced by unwrapped symbol need a copy
+            if isinstance(coin, Coin) and (price := prices[coin.symbol.upper()]) and coin.price is None:
+                coin.price = price
+        return prices
+
+    async def get_price(self, coin: str | Coin) -> Optional[Decimal]:
+        symbol = (coin.symbol if isinstance(coin, Coin) else coin).upper()
+        return (await self.get_prices([coin]))[symbol]
+
+
+price_service = PriceService()
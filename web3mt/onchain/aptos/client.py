@@ -1,4 +1,5 @@
 import time
+from typing import Optional
 
 from aptos_sdk.authenticator import Authenticator, Ed25519Authenticator
 from aptos_sdk.transactions import (
@@ -8,15 +9,16 @@ from aptos_sdk.transactions import (
     EntryFunction,
 )
 from web3db import Profile
-from web3db.utils import decrypt
 from aptos_sdk.account import Account
 from aptos_sdk.async_client import RestClient, ResourceNotFound, ClientConfig
 from pathlib import Path
 
 from web3mt.onchain.aptos.models import Token, NFT, TokenAmount
+from web3mt.onchain.token_metadata import token_metadata
 from web3mt.config import env
 from web3mt.utils import Profilecurl_cffiAsyncSession, logger, FileManager
-from web3mt.utils.http_sessions import SessionConfig
+from web3mt.utils.http_sessions import SessionConfig, curl_cffiAsyncSession
+from web3mt.utils.key_loader import key_loader
 
 
 class Client(RestClient):
@@ -39,19 +41,30 @@ class Client(RestClient):
     ):
         super().__init__(node_url)
         self.profile = profile
+        self._encryption_password = encryption_password
+        self._account: Optional[Account] = None
         if private:
-            self.account_ = Account.load_key(private)
-        elif self.profile:
-            if self.profile.aptos_private.startswith("-----BEGIN PGP MESSAGE-----"):
-                self.account_: Account = Account.load_key(
-                    decrypt(self.profile.aptos_private, encryption_password)
-                )
-            elif self.profile.aptos_private.startswith("0x"):
-                self.account_: Account = Account.load_key(self.profile.aptos_private)
-        else:
-            self.account_: Account = Account.generate()
-        self.session = Profilecurl_cffiAsyncSession(self.profile, SessionConfig())
-        self.log_info = f"{f'{self.profile.id} | ' if self.profile else ''}{str(self.account_.address())}"
+            self._account = Account.load_key(private)
+        elif not self.profile:
+            self._account = Account.generate()
+        self.session = (
+            Profilecurl_cffiAsyncSession(self.profile, SessionConfig())
+            if self.profile
+            else curl_cffiAsyncSession(pooled=True)
+        )
+        self._update_log_info()
+
+    @property
+    def account_(self) -> Account:
+        if self._account is None:  # decrypted on first use, see `key_loader.preload_profiles` for bulk decryption
+            self._account = key_loader.aptos_account(self.profile.aptos_private, self._encryption_password)
+            self._update_log_info()
+        return self._account
+
+    def _update_log_info(self):
+        """Address is added once account is decrypted, logging alone doesn't decrypt the key"""
+        address = str(self._account.address()) if self._account else ""
+        self.log_info = " | ".join(filter(None, [str(self.profile.id) if self.profile else "", address]))
 
     async def __aenter__(self):
         logger.success(f"{self.log_info} | Started")
@@ -169,9 +182,44 @@ class Client(RestClient):
             url=self.GRAPHQL_URL, json={"query": query, "variables": variables}
         )
         assets = data["data"]["current_fungible_asset_balances"]
+        metadata = {
+            asset["asset_type"]: cached
+            for asset in assets
+            if (cached := token_metadata.get("aptos", asset["asset_type"]))
+        }
+        if missing := list({asset["asset_type"] for asset in assets} - metadata.keys()):
+            metadata |= await self._tokens_metadata(missing)
         return [
             TokenAmount(
-                amount=token["amount"], is_wei=True, token=Token(**token["metadata"])
+                amount=asset["amount"],
+                is_wei=True,
+                token=Token(
+                    asset_type=asset["asset_type"],
+                    token_standard=asset["token_standard"],
+                    **metadata[asset["asset_type"]],
+                ),
             )
-            for token in assets
+            for asset in assets
+            if asset["asset_type"] in metadata
         ]
+
+    async def _tokens_metadata(self, asset_types: list[str]) -> dict[str, dict]:
+        """Metadata of tokens that aren't cached yet, they are added to cache"""
+        query = await FileManager.read_txt_async(
+            self._queries_folder / "tokens_metadata.graphql"
+        )
+        response, data = await self.session.post(
+            url=self.GRAPHQL_URL, json={"query": query, "variables": {"asset_types": asset_types}}
+        )
+        metadata = {}
+        added = False
+        for token in data["data"]["fungible_asset_metadata"]:
+            added |= token_metadata.add(
+                "aptos", token["asset_type"], token["symbol"], token["decimals"], token.get("name"), save=False
+            )
+            metadata[token["asset_type"]] = dict(
+                symbol=token["symbol"], name=token.get("name"), decimals=token["decimals"]
+            )
+        if added:
+            token_metadata.save()
+        return metadata
@@ -1,4 +1,7 @@
-from typing import List, Optional, Union, Dict
+import asyncio
+from decimal import Decimal
+from functools import lru_cache
+from typing import List, Optional, Union, Dict, Literal
 
 from bitcoinrpc.bitcoin_rpc import BitcoinRPC
 from bitcoinlib.keys import HDKey
@@ -9,7 +12,9 @@ from web3mt.utils import httpxAsyncClient
 from web3mt.utils.logger import logger
 from web3mt.config import btc_env, DEV
 from web3mt.onchain.btclike.models import Litecoin, Bitcoin
+from web3mt.onchain.btclike.utxos import AddressUtxos, utxo_cache
 from web3mt.models import TokenAmount, Chain
+from web3mt.utils.seeds import mnemonic_seed
 
 
 class BitcoindRPCError(Exception):
@@ -19,22 +24,45 @@ class BitcoindRPCError(Exception):
 
 
 class _Space(httpxAsyncClient):
-    def __init__(self, base_api_url: str):
-        super().__init__(base_url=base_api_url)
+    CHAIN_TXS_PAGE_SIZE = 25
+
+    def __init__(self, base_api_url: str, **kwargs):
+        super().__init__(base_url=base_api_url, **kwargs)
 
     async def get_utxo(self, address: str) -> list[dict]:
         resp, data = await self.get(f"address/{address}/utxo")
         return data
 
+    async def get_tip_height(self) -> int:
+        resp, data = await self.get("blocks/tip/height")
+        return int(data)
+
+    async def get_mempool_txs(self, address: str) -> list[dict]:
+        resp, data = await self.get(f"address/{address}/txs/mempool")
+        return data
+
+    async def get_chain_txs(self, address: str, after_height: int, max_pages: int = None) -> Optional[list[dict]]:
+        """Confirmed txs above `after_height`, newest first. None if there are more than `max_pages` pages of them"""
+        txs, last_txid, pages = [], None, 0
+        while max_pages is None or pages < max_pages:
+            resp, page = await self.get(f"address/{address}/txs/chain" + (f"/{last_txid}" if last_txid else ""))
+            pages += 1
+            new_txs = [tx for tx in page if tx["status"]["block_height"] > after_height]
+            txs += new_txs
+            if len(new_txs) < len(page) or len(page) < self.CHAIN_TXS_PAGE_SIZE:
+                return txs
+            last_txid = page[-1]["txid"]
+        return None
+
 
 class LitecoinSpace(_Space):
-    def __init__(self):
-        super().__init__(Litecoin.explorer.rstrip("/") + "/api")
+    def __init__(self, **kwargs):
+        super().__init__(Litecoin.explorer.rstrip("/") + "/api", **kwargs)
 
 
 class MempoolSpace(_Space):
-    def __init__(self):
-        super().__init__(Bitcoin.explorer.rstrip("/") + "/api")
+    def __init__(self, **kwargs):
+        super().__init__(Bitcoin.explorer.rstrip("/") + "/api", **kwargs)
 
 
 # m / purpose' / coin_type' / account' / change / address_index
@@ -43,6 +71,25 @@ space_api_map = {
     Bitcoin: MempoolSpace,
     Litecoin: LitecoinSpace,
 }
+_spaces: dict[Chain, _Space] = {}
+
+
+def get_space(chain: Chain) -> _Space:
+    """Explorer client shared by all clients of chain, so connections are kept alive between calls"""
+    if chain not in _spaces:
+        _spaces[chain] = space_api_map[chain](pooled=True)
+    return _spaces[chain]
+
+
+@lru_cache(maxsize=4096)
+def derive_key(mnemonic: str, network: str, path: str = "m") -> HDKey:
+    """HD key of path, every prefix of path is cached, so sibling indexes are derived from cached parent key"""
+    parent, _, level = path.rpartition("/")
+    if not parent:
+        return HDKey.from_seed(mnemonic_seed(mnemonic), network=network)
+    return derive_key(mnemonic, network, parent).child_private(
+        int(level.rstrip("'")), hardened=level.endswith("'"), network=network
+    )
 
 
 class BaseClient(BitcoinRPC):
@@ -120,15 +167,20 @@ class Client(BaseClient):
         chain: Chain = Bitcoin,
         mnemonic: str = btc_env.bitcoin_mnemonic,
         derivation_path: str = native_segwit_derivation_path.format(i=0),
+        utxo_source: Literal["explorer", "rpc"] = "explorer",
+        utxo_max_age: float = 10,
         **kwargs,
     ):
+        """
+        :param utxo_source: "rpc" takes UTXOs from `listunspent` of node, addresses must be watched by its wallet
+        :param utxo_max_age: seconds synced UTXO set is reused without requests
+        """
         super().__init__(chain)
-        self.master_key = HDKey.from_passphrase(
-            mnemonic, network=self.chain.name.lower()
-        )
-        self.hk = self.master_key.subkey_for_path(
-            path=derivation_path, network=self.chain.name.lower()
-        )
+        self.mnemonic = mnemonic
+        self.utxo_source = utxo_source
+        self.utxo_max_age = utxo_max_age
+        self.master_key = derive_key(mnemonic, self.chain.name.lower())
+        self.hk = derive_key(mnemonic, self.chain.name.lower(), derivation_path)
 
     def __str__(self):
         return f"{self.hk.address()} ({self.chain.name.capitalize()})"
@@ -137,22 +189,50 @@ class Client(BaseClient):
         self, address_index: int = None, echo: bool = DEV
     ) -> tuple[TokenAmount, list[dict]]:
         if address_index:
-            hk = self.master_key.subkey_for_path(
-                path=native_segwit_derivation_path.format(i=address_index),
-                network=self.chain.name.lower(),
+            hk = derive_key(
+                self.mnemonic,
+                self.chain.name.lower(),
+                native_segwit_derivation_path.format(i=address_index),
             )
         else:
             hk = self.hk
-        utxos = await space_api_map[self.chain]().get_utxo(hk.address())
+        utxos = await self.get_utxos(hk.address())
         total = TokenAmount(token=self.chain.native_token, amount=0)
         for u in utxos:
             total.sats += u["value"]
         if echo:
             logger.info(
-                f"{hk.address()}, index={self.hk.child_index} ({self.chain.name.capitalize()}) | Balance: {total}"
+                f"{hk.address()}, index={hk.child_index} ({self.chain.name.capitalize()}) | Balance: {total}"
             )
         return total, utxos
 
+    async def _sync_rpc(self, utxos: AddressUtxos) -> None:
+        height, unspent = await asyncio.gather(
+            self.acall("getblockcount", []), self.listunspent(minconf=0, addresses=[utxos.address])
+        )
+        utxos.replace(height, [
+            {
+                "txid": u["txid"],
+                "vout": u["vout"],
+                "status": {"confirmed": True, "block_height": height - u["confirmations"] + 1}
+                if u["confirmations"] else {"confirmed": False},
+                "value": int(Decimal(str(u["amount"])) * 10 ** self.chain.native_token.decimals),
+            }
+            for u in unspent
+        ])
+
+    async def get_utxos(self, address: str, max_age: float = None) -> list[dict]:
+        """UTXOs of address from cached set, synced incrementally if it's older than `max_age`"""
+        utxos = utxo_cache.get(self.chain, address)
+        async with utxos.lock:  # concurrent calls wait for one sync
+            if utxos.is_stale(self.utxo_max_age if max_age is None else max_age):
+                if self.utxo_source == "rpc":
+                    await self._sync_rpc(utxos)
+                else:
+                    await utxos.sync(get_space(self.chain))
+                utxo_cache.save(utxos)
+        return utxos.view()
+
     async def sign_tx(
         self,
         to: Optional[str] = None,
@@ -161,6 +241,19 @@ class Client(BaseClient):
         fee: Optional[TokenAmount] = None,
         use_full_balance: Optional[bool] = False,
     ):
+        if signed := await self._build_tx(to, amount, custom_outputs, fee, use_full_balance):
+            return signed[0].as_hex()
+        return None
+
+    async def _build_tx(
+        self,
+        to: Optional[str] = None,
+        amount: Optional[TokenAmount] = None,
+        custom_outputs: Optional[list[Output]] = None,
+        fee: Optional[TokenAmount] = None,
+        use_full_balance: Optional[bool] = False,
+    ) -> Optional[tuple[Transaction, list[dict], list[dict]]]:
+        """Signed tx, UTXOs it spends and its outputs to our address without txid, txid is known once tx is sent"""
         fee = fee or TokenAmount(token=self.chain.native_token, amount=0.0001)
         balance, utxos = await self.get_balance()
 
@@ -201,7 +294,14 @@ class Client(BaseClient):
                 Output(change.sats, self.hk.address(), network=self.chain.name.lower())
             )
         tx.sign()
-        return tx.as_hex()
+        # Change and outputs to ourselves. Not tx.txid, bitcoinlib computes it in Transaction.__init__ before inputs
+        # and change are added
+        own_utxos = [
+            {"vout": n, "status": {"confirmed": False}, "value": output.value}
+            for n, output in enumerate(tx.outputs)
+            if output.address == self.hk.address()
+        ]
+        return tx, utxos, own_utxos
 
     async def transfer(
         self,
@@ -211,16 +311,21 @@ class Client(BaseClient):
         fee: Optional[TokenAmount] = None,
         use_full_balance: Optional[bool] = False,
     ):
-        sign_hash = await self.sign_tx(
+        signed = await self._build_tx(
             to=to,
             amount=amount,
             custom_outputs=custom_outputs,
             fee=fee,
             use_full_balance=use_full_balance,
         )
-        if not sign_hash:
+        if not signed:
             return None
-        tx_hash = await self.send_raw_transaction(sign_hash)
+        tx, spent, own_utxos = signed
+        tx_hash = await self.send_raw_transaction(tx.as_hex())
+        # Next transfer doesn't try to spend the same outputs before explorer sees this tx
+        utxo_cache.get(self.chain, self.hk.address()).mark_spent(
+            tx_hash, spent, [{"txid": tx_hash} | u for u in own_utxos]
+        )
         if to:
             logger.debug(
                 f"{self} | Transfer {amount} to {to} sent. Tx: {self.chain.explorer.rstrip('/')}/tx/{tx_hash}"
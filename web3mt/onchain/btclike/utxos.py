@@ -0,0 +1,180 @@
+import asyncio
+import copy
+import time
+from pathlib import Path
+from typing import Optional, TYPE_CHECKING
+
+from web3mt.models import Chain
+from web3mt.utils.cache import JSONCache
+
+if TYPE_CHECKING:
+    from web3mt.onchain.btclike.client import _Space
+
+__all__ = ["AddressUtxos", "UtxoCache", "utxo_cache"]
+
+REORG_DEPTH = 6  # blocks above watermark minus this depth are rescanned on every sync
+LOCAL_TTL = 600  # broadcast tx that didn't show up in mempool within this time is considered dropped
+
+
+def outpoint(utxo: dict) -> str:
+    return f"{utxo['txid']}:{utxo['vout']}"
+
+
+def block_height(utxo: dict) -> int:
+    return utxo["status"].get("block_height") or 0
+
+
+class AddressUtxos:
+    """
+    UTXO set of address synced up to `height`. Confirmed outputs are persisted, unconfirmed ones are taken from
+    mempool on every sync. Outputs spent by our broadcast tx are hidden until explorer or node sees the spend
+    """
+
+    def __init__(self, chain: Chain, address: str, data: dict = None):
+        data = data or {}
+        self.chain = chain
+        self.address = address
+        self.height: int = data.get("height", 0)
+        self.utxos: dict[str, dict] = data.get("utxos", {})
+        self.spent: dict[str, dict] = data.get("spent", {})  # spent within reorg depth, restored on rollback
+        self.mempool_utxos: dict[str, dict] = {}
+        self.mempool_spent: set[str] = set()
+        self.local: dict[str, tuple[float, list[str], list[dict]]] = {}  # txid -> (broadcast at, spent, outputs)
+        self.synced_at: Optional[float] = None
+        self.lock = asyncio.Lock()
+
+    def __str__(self):
+        return f"{self.address} ({self.chain.name.capitalize()})"
+
+    def to_dict(self) -> dict:
+        return {"height": self.height, "utxos": self.utxos, "spent": self.spent}
+
+    def is_stale(self, max_age: float) -> bool:
+        return self.synced_at is None or time.monotonic() - self.synced_at >= max_age
+
+    async def sync(self, space: "_Space", max_pages: int = 10) -> None:
+        """
+        Applies confirmed txs above watermark paging `/address/:a/txs/chain` from the newest. First sync and sync
+        that needs more than `max_pages` pages take the whole set from `/address/:a/utxo` instead
+        """
+        tip, mempool_txs = await asyncio.gather(space.get_tip_height(), space.get_mempool_txs(self.address))
+        txs = None
+        if self.height and tip != self.height:
+            safe_height = min(tip, self.height) - REORG_DEPTH
+            txs = await space.get_chain_txs(self.address, safe_height, max_pages)
+            if txs is not None:
+                self._rollback(safe_height)
+                self._apply(txs)
+        if not self.height or txs is None and tip != self.height:
+            utxos = await space.get_utxo(self.address)
+            self.utxos = {outpoint(u): u for u in utxos if u["status"]["confirmed"]}
+            self.spent = {}
+        self.height = tip
+        self._set_mempool(mempool_txs)
+
+    def replace(self, height: int, utxos: list[dict]) -> None:
+        """Sets the whole set, e.g. from bitcoind `listunspent` which already excludes outputs spent in mempool"""
+        self.height = height
+        self.utxos = {outpoint(u): u for u in utxos if u["status"]["confirmed"]}
+        self.spent = {}
+        self.mempool_utxos = {outpoint(u): u for u in utxos if not u["status"]["confirmed"]}
+        self.mempool_spent = set()
+        self._synced()
+
+    def _rollback(self, safe_height: int) -> None:
+        for key, utxo in list(self.spent.items()):
+            spent_height = utxo.pop("spent_height")
+            self.spent.pop(key)
+            if spent_height > safe_height:
+                self.utxos[key] = utxo
+        for key, utxo in list(self.utxos.items()):
+            if block_height(utxo) > safe_height:
+                self.utxos.pop(key)
+
+    def _outputs(self, tx: dict) -> dict[str, dict]:
+        return {
+            f"{tx['txid']}:{n}": {"txid": tx["txid"], "vout": n, "status": tx["status"], "value": output["value"]}
+            for n, output in enumerate(tx["vout"])
+            if output.get("scriptpubkey_address") == self.address
+        }
+
+    def _inputs(self, tx: dict) -> list[str]:
+        return [
+            f"{vin['txid']}:{vin['vout']}"
+            for vin in tx["vin"]
+            if (vin.get("prevout") or {}).get("scriptpubkey_address") == self.address
+        ]
+
+    def _apply(self, txs: list[dict]) -> None:
+        """Outputs are added before inputs are spent, so txs of the same block can come in any order"""
+        for tx in txs:
+            self.utxos.update(self._outputs(tx))
+        for tx in txs:
+            for key in self._inputs(tx):
+                if utxo := self.utxos.pop(key, None):
+                    self.spent[key] = utxo | {"spent_height": tx["status"]["block_height"]}
+
+    def _set_mempool(self, txs: list[dict]) -> None:
+        self.mempool_utxos, self.mempool_spent = {}, set()
+        for tx in txs:
+            self.mempool_utxos.update(self._outputs(tx))
+            self.mempool_spent.update(self._inputs(tx))
+        self._synced()
+
+    def _synced(self) -> None:
+        self.synced_at = time.monotonic()
+        synced = self.utxos.keys() | self.mempool_utxos.keys()
+        for txid, (broadcast_at, spent, _) in list(self.local.items()):
+            # Spend is seen once none of its inputs is unspent anymore
+            seen = not any(key in synced and key not in self.mempool_spent for key in spent)
+            if seen or time.monotonic() - broadcast_at > LOCAL_TTL:
+                self.local.pop(txid)
+
+    def mark_spent(self, txid: str, spent: list[dict], outputs: list[dict] = None) -> None:
+        """Hides outputs spent by broadcast tx and shows its outputs to this address, e.g. change"""
+        self.local[txid] = (time.monotonic(), [outpoint(u) for u in spent], outputs or [])
+
+    def view(self) -> list[dict]:
+        utxos = self.utxos | self.mempool_utxos
+        for _, _, outputs in self.local.values():
+            utxos.update({outpoint(u): u for u in outputs})
+        spent = self.mempool_spent.union(*[spent for _, spent, _ in self.local.values()])
+        return [utxo for key, utxo in utxos.items() if key not in spent]
+
+
+class UtxoCache:
+    """UTXO sets keyed by (chain, address), confirmed part is persisted with its watermark between runs"""
+
+    LOCAL_STORAGE = Path(__file__).parent / "utxos.json"
+
+    def __init__(self, path: Path | str = LOCAL_STORAGE):
+        self._cache = JSONCache(path)
+        self._sets: dict[str, AddressUtxos] = {}
+        self._saved: dict[str, dict] = {}  # persisted state of sets, sets are changed in place
+
+    def __repr__(self):
+        return f"UtxoCache({self._cache})"
+
+    @staticmethod
+    def _key(chain: Chain, address: str) -> str:
+        return f"{chain.name.lower()}:{address}"
+
+    def get(self, chain: Chain, address: str) -> AddressUtxos:
+        key = self._key(chain, address)
+        if key not in self._sets:
+            data = self._cache.get(key)
+            self._sets[key] = AddressUtxos(chain, address, copy.deepcopy(data))
+            self._saved[key] = data
+        return self._sets[key]
+
+    def save(self, utxos: AddressUtxos) -> None:
+        """Writes the file only if watermark or set changed since the last save"""
+        key, data = self._key(utxos.chain, utxos.address), utxos.to_dict()
+        if data == self._saved.get(key):
+            return
+        self._saved[key] = copy.deepcopy(data)
+        self._cache.set(key, self._saved[key])
+        self._cache.save()
+
+
+utxo_cache = UtxoCache()
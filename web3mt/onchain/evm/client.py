@@ -1,16 +1,17 @@
 from _decimal import Decimal
+from typing import Optional
 from hexbytes import HexBytes
 
 from aiohttp import ClientHttpProxyError, ClientResponseError
-from web3 import AsyncWeb3, AsyncHTTPProvider
+from web3 import AsyncWeb3
 from web3.eth import AsyncEth
 from web3.middleware import (
     ExtraDataToPOAMiddleware,
     AttributeDictMiddleware,
     ENSNameToAddressMiddleware,
     ValidationMiddleware,
-    Web3Middleware,
 )
+from web3.middleware.base import Web3MiddlewareBuilder
 from web3.net import AsyncNet
 from web3.types import _Hash32
 from web3.contract import AsyncContract
@@ -19,12 +20,21 @@ from eth_account import Account
 from eth_account.messages import encode_defunct
 from eth_account.signers.local import LocalAccount
 from eth_utils import to_checksum_address, from_wei
+from eth_utils.toolz import curry
 from web3db import Profile
-from web3db.utils import decrypt
 
+from web3mt.onchain.evm.contracts import ContractCache, checksum, encode_approve, encode_transfer
+from web3mt.onchain.evm.gas import GasOracle
 from web3mt.onchain.evm.models import *
+from web3mt.onchain.evm.multicall import Call, Multicall
+from web3mt.onchain.evm.nonce import NonceManager
+from web3mt.onchain.evm.providers import FailoverHTTPProvider
+from web3mt.onchain.evm.receipts import ReceiptTracker
+from web3mt.onchain.evm.signer import TransactionSigner
+from web3mt.onchain.token_metadata import token_metadata
 from web3mt.config import env, DEV
 from web3mt.utils import sleep, logger
+from web3mt.utils.key_loader import key_loader
 
 __all__ = ["TransactionParameters", "ProfileClient", "Config", "BaseClient", "HTTPProviderConfig"]
 
@@ -121,9 +131,10 @@ class TransactionParameters:
         d = {
             "from": self.from_,
             "to": self.to,
-            "nonce": self.nonce,
             "chainId": self.chain.chain_id,
         }
+        if self.nonce is not None:
+            d["nonce"] = self.nonce
         if self.data:
             d["data"] = self.data
         if self.value:
@@ -139,31 +150,54 @@ class TransactionParameters:
         return d
 
 
-class SleepAfterRequestMiddleware(Web3Middleware):
-    delay_between_requests = 0
-    log_info = "BaseClient"
-    sleep_echo = True
+class SleepAfterRequestMiddleware(Web3MiddlewareBuilder):
+    """Sleeps `delay_between_requests` from config of its client after each request"""
+
+    client: "BaseClient" = None
+
+    @staticmethod
+    @curry
+    def build(client: "BaseClient", w3: AsyncWeb3) -> "SleepAfterRequestMiddleware":
+        middleware = SleepAfterRequestMiddleware(w3)
+        middleware.client = client
+        return middleware
 
     async def async_wrap_make_request(self, make_request):
         async def middleware(method, params):
             response = await make_request(method, params)
             await sleep(
-                self.delay_between_requests,
-                log_info=self.log_info,
-                echo=self.sleep_echo,
+                self.client.config.delay_between_requests,
+                log_info=self.client.log_info,
+                echo=self.client.config.sleep_echo,
             )
             return response
 
         return middleware
 
+
 class HTTPProviderConfig:
     def __init__(
             self,
             proxy: str = env.default_proxy,
             timeout: int = 10,
+            hedge: bool = False,
+            batch_window: float = 0,
+            max_batch_size: int = 50,
     ):
+        """
+        :param hedge: race latency-sensitive reads against the next RPC if the first one is slower than its p95
+        :param batch_window: send concurrent reads issued within this number of seconds (e.g. 0.003) as one JSON-RPC
+        batch, at most `max_batch_size` requests in a batch
+        """
         self.proxy = proxy
         self.timeout = timeout
+        self.hedge = hedge
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+
+    @property
+    def request_kwargs(self) -> dict:
+        return dict(proxy=self.proxy, timeout=self.timeout)
 
 class Config:
     def __init__(
@@ -172,11 +206,24 @@ class Config:
         sleep_echo: bool = DEV,
         do_no_matter_what: bool = False,
         wait_for_gwei: bool = True,
+        pipelined: bool = False,
+        signer: TransactionSigner = None,
+        ws_rpcs: dict[int, str] = None,
     ):
+        """
+        :param pipelined: reserve nonces locally with `NonceManager`, so concurrent `tx` calls of one account don't wait
+        for each other to be mined. Gas limit of tx depending on not yet mined one should be passed explicitly
+        :param signer: sign txs off the event loop. Share one signer between clients, it owns a worker pool
+        :param ws_rpcs: websocket RPC by chain id, receipts are checked on every new head from its subscription
+        instead of polling block number
+        """
         self.delay_between_requests = delay_between_requests
         self.sleep_echo = sleep_echo
         self.do_no_matter_what = do_no_matter_what
         self.wait_for_gwei = wait_for_gwei
+        self.pipelined = pipelined
+        self.signer = signer
+        self.ws_rpcs = ws_rpcs or {}
 
 
 class BaseClient:
@@ -187,9 +234,10 @@ class BaseClient:
             config: Config = Config(),
             http_provider_config: HTTPProviderConfig = HTTPProviderConfig(),
     ):
+        self._web3s: dict[tuple, tuple[AsyncWeb3, ContractCache]] = {}
         self._chain = chain
         self.config = config
-        self.account = account or Account.create()
+        self.account = account or self._default_account()
         self.http_provider_config = http_provider_config
 
     def __str__(self):
@@ -204,6 +252,14 @@ class BaseClient:
             logger.error(f"{self.log_info} | {exc_val}")
         else:
             logger.success(f"{self.log_info} | Tasks done")
+        await self.close()
+
+    async def close(self) -> None:
+        """Releases HTTP providers of every chain client was on, client can be used again after it"""
+        web3s, self._web3s = self._web3s, {}
+        for w3, _ in web3s.values():
+            await w3.provider.disconnect()
+        self._update_web3()
 
     @property
     def http_provider_config(self) -> HTTPProviderConfig:
@@ -223,6 +279,9 @@ class BaseClient:
         self._account: LocalAccount = account
         self._update_log_info()
 
+    def _default_account(self) -> Optional[LocalAccount]:
+        return Account.create()
+
     @property
     def chain(self) -> Chain:
         return self._chain
@@ -235,53 +294,58 @@ class BaseClient:
 
     @staticmethod
     async def get_max_priority_fee_per_gas(w3: AsyncWeb3, block: dict) -> int:
-        block_number = block["number"]
-        latest_block_transaction_count = w3.eth.get_block_transaction_count(
-            block_number
-        )
-        max_priority_fee_per_gas_lst = []
-        for i in range(latest_block_transaction_count):
-            try:
-                transaction = w3.eth.get_transaction_by_block(block_number, i)
-                if "maxPriorityFeePerGas" in transaction:
-                    max_priority_fee_per_gas_lst.append(
-                        transaction.max_priority_fee_per_gas
-                    )
-            except Exception as e:
-                continue
+        """Median priority fee of block's transactions"""
+        history = await w3.eth.fee_history(1, block["number"], [50])
+        if rewards := history.get("reward"):
+            return rewards[0][0]
+        return await w3.eth.max_priority_fee
 
-        if not max_priority_fee_per_gas_lst:
-            max_priority_fee_per_gas = w3.eth.max_priority_fee
-        else:
-            max_priority_fee_per_gas_lst.sort()
-            max_priority_fee_per_gas = max_priority_fee_per_gas_lst[
-                len(max_priority_fee_per_gas_lst) // 2
-                ]
-        return max_priority_fee_per_gas
+    @property
+    def gas_oracle(self) -> GasOracle:
+        return GasOracle.get(self.chain, self.http_provider_config.request_kwargs)
+
+    @property
+    def receipt_tracker(self) -> ReceiptTracker:
+        return ReceiptTracker.get(
+            self.chain, self.http_provider_config.request_kwargs, self.config.ws_rpcs.get(self.chain.chain_id)
+        )
 
     def _update_log_info(self):
         self.log_info = f"{self._account.address} ({self._chain.name})"
 
     def _update_web3(self):
-        SleepAfterRequestMiddleware.delay_between_requests = (
-            self.config.delay_between_requests
-        )
-        SleepAfterRequestMiddleware.log_info = self.log_info
-        SleepAfterRequestMiddleware.echo = self.config.sleep_echo
-        self.w3 = AsyncWeb3(
-            # TODO: If rpc sends exception try to get another rpc from self._chain.rpc list
-            AsyncHTTPProvider(
-                self._chain.rpc, request_kwargs=self.http_provider_config.__dict__
-            ),
-            modules={"eth": (AsyncEth,), "net": (AsyncNet,)},
-            middleware=[
-                AttributeDictMiddleware,
-                ENSNameToAddressMiddleware,
-                ValidationMiddleware,
-                SleepAfterRequestMiddleware,
-            ],
+        """w3 of every chain client was on is kept, HTTP sessions are shared with other clients by `provider_registry`"""
+        config = self.http_provider_config
+        key = (
+            self._chain.chain_id, tuple(self._chain.rpcs), config.proxy, config.timeout, config.hedge,
+            config.batch_window, config.max_batch_size
         )
-        self.w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+        if key not in self._web3s:
+            w3 = AsyncWeb3(
+                FailoverHTTPProvider(
+                    self._chain.rpcs,
+                    request_kwargs=config.request_kwargs,
+                    timeout=config.timeout,
+                    hedge=config.hedge,
+                    chain_id=self._chain.chain_id,
+                    batch_window=config.batch_window,
+                    max_batch_size=config.max_batch_size,
+                ),
+                modules={"eth": (AsyncEth,), "net": (AsyncNet,)},
+                middleware=[
+                    AttributeDictMiddleware,
+                    ENSNameToAddressMiddleware,
+                    ValidationMiddleware,
+                    SleepAfterRequestMiddleware.build(self),
+                ],
+            )
+            w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+            self._web3s[key] = (w3, ContractCache(w3))
+        self.w3, self.contracts = self._web3s[key]
+
+    def contract(self, address: str, abi: list | str) -> AsyncContract:
+        """Cached contract object, pass the same ABI object to hit the cache"""
+        return self.contracts.get(address, abi)
 
     def sign(self, text) -> str:
         return self.w3.eth.account.sign_message(
@@ -292,29 +356,39 @@ class BaseClient:
         owner_address = owner_address or self.account.address
         return await self.w3.eth.get_transaction_count(owner_address)
 
+    @property
+    def nonce_manager(self) -> NonceManager:
+        return NonceManager.get(self.chain.chain_id, self.account.address)
+
+    async def sign_transaction(self, tx_params: TransactionParameters) -> bytes:
+        if self.config.signer:
+            return await self.config.signer.sign(tx_params, self.account.key)
+        return self.w3.eth.account.sign_transaction(
+            tx_params.to_dict(), self.account.key
+        ).raw_transaction
+
     async def get_onchain_token_info(
             self, contract: AsyncContract = None, token: Token = None
     ) -> Token | None:
         if token == self.chain.native_token:
             logger.warning(f"{self.log_info} | Can't get native token info")
             return None
-        contract = contract or self.w3.eth.contract(
-            to_checksum_address(token.address), abi=DefaultABIs.token
-        )
         token = token or Token(self.chain, address=contract.address)
+        if token_metadata.apply(self.chain.chain_id, token):
+            return token
+        contract = contract or self.contract(token.address, DefaultABIs.token)
         async with self.w3.batch_requests() as batch:
             batch.add(contract.functions.decimals())
             batch.add(contract.functions.name())
             batch.add(contract.functions.symbol())
             token.decimals, token.name, token.symbol = await batch.async_execute()
+        token_metadata.add(self.chain.chain_id, token.address, token.symbol, token.decimals, token.name)
         return token
 
     async def get_allowance(
             self, spender_contract: AsyncContract, token: Token, owner_address: str = None
     ) -> TokenAmount:
-        contract = self.w3.eth.contract(
-            to_checksum_address(token.address), abi=DefaultABIs.token
-        )
+        contract = self.contract(token.address, DefaultABIs.token)
         amount = await contract.functions.allowance(
             owner_address, spender_contract.address
         ).call()
@@ -341,9 +415,7 @@ class BaseClient:
         token = token or self.chain.native_token
         if token != self.chain.native_token:
             token = await self.get_onchain_token_info(contract=contract, token=token)
-            contract = contract or self.w3.eth.contract(
-                to_checksum_address(token.address), abi=DefaultABIs.token
-            )
+            contract = contract or self.contract(token.address, DefaultABIs.token)
             amount = await contract.functions.balanceOf(owner_address).call()
             balance = TokenAmount(amount, True, token)
         else:
@@ -355,6 +427,80 @@ class BaseClient:
                 logger.debug(f"{self.log_info} | Balance - {balance}")
         return balance
 
+    @property
+    def multicall(self) -> Multicall:
+        return Multicall(self.w3, self.chain.chain_id, log_info=self.log_info)
+
+    async def update_tokens_info(self, tokens: list[Token]) -> list[Token]:
+        """Fills metadata of ERC-20 tokens from cache, missing ones are fetched with one multicall"""
+        tokens = [token for token in tokens if token != self.chain.native_token]
+        missing = [token for token in tokens if not token_metadata.apply(self.chain.chain_id, token)]
+        if not missing:
+            return tokens
+        calls = [
+            call
+            for token in missing
+            for call in (Call.decimals(token.address), Call.symbol(token.address), Call.name(token.address))
+        ]
+        results = await self.multicall.aggregate3(calls)
+        for token, decimals, symbol, name in zip(missing, results[::3], results[1::3], results[2::3]):
+            if decimals is None or not symbol:
+                logger.warning(f"{self.log_info} | Couldn't get metadata of {token.address}")
+                continue
+            token.decimals, token.symbol, token.name = decimals, symbol.upper(), name
+            token_metadata.add(self.chain.chain_id, token.address, token.symbol, token.decimals, name, save=False)
+        token_metadata.save()
+        return tokens
+
+    async def balances_of(
+            self, addresses: list[str] = None, tokens: list[Token] = None
+    ) -> dict[str, list[TokenAmount | None]]:
+        """
+        Balances of every address for every token via Multicall3, native balance is fetched with `getEthBalance`
+
+        :return: {address: [balance of tokens[0], balance of tokens[1], ...]}, None if call failed
+        """
+        addresses = [to_checksum_address(address) for address in addresses or [self.account.address]]
+        tokens = tokens or [self.chain.native_token]
+        await self.update_tokens_info(tokens)
+        multicall = self.multicall
+        calls = [
+            Call.eth_balance(multicall.address, address)
+            if token == self.chain.native_token
+            else Call.balance_of(token.address, address)
+            for address in addresses
+            for token in tokens
+        ]
+        results = iter(await multicall.aggregate3(calls))
+        return {
+            address: [
+                TokenAmount(amount, True, token) if (amount := next(results)) is not None else None
+                for token in tokens
+            ]
+            for address in addresses
+        }
+
+    async def allowances_of(
+            self, spender: str, tokens: list[Token], addresses: list[str] = None
+    ) -> dict[str, list[TokenAmount | None]]:
+        """:return: {address: [allowance of tokens[0], allowance of tokens[1], ...]}, None if call failed"""
+        addresses = [to_checksum_address(address) for address in addresses or [self.account.address]]
+        spender = to_checksum_address(spender)
+        await self.update_tokens_info(tokens)
+        calls = [
+            Call.allowance(token.address, address, spender)
+            for address in addresses
+            for token in tokens
+        ]
+        results = iter(await self.multicall.aggregate3(calls))
+        return {
+            address: [
+                TokenAmount(amount, True, token) if (amount := next(results)) is not None else None
+                for token in tokens
+            ]
+            for address in addresses
+        }
+
     async def _native_balance(self, owner_address: str) -> TokenAmount:
         balance = 0
         try:
@@ -371,15 +517,7 @@ class BaseClient:
 
     async def wait_for_gwei(self):
         if self.chain.max_gwei and self.config.wait_for_gwei:
-            while True:
-                gas_price = from_wei(await self.w3.eth.gas_price, "gwei")
-                if gas_price > self.chain.max_gwei:
-                    logger.debug(
-                        f"{self.log_info} | Current GWEI: {gas_price} > {self.chain.max_gwei}. Waiting for gwei..."
-                    )
-                    await sleep(15, log_info=self.log_info, echo=self.config.sleep_echo)
-                else:
-                    break
+            await self.gas_oracle.wait_for_gas_price(self.chain.max_gwei, self.log_info)
 
     async def tx(
             self,
@@ -423,19 +561,22 @@ class BaseClient:
             tx_params: TransactionParameters = None,
             **kwargs,
     ) -> TransactionParameters | tuple[bool, str]:
-        nonce = kwargs.get("nonce", await self.nonce())
         value = value or TokenAmount(0, token=self.chain.native_token)
-        tx_params = tx_params or TransactionParameters(
-            from_=self.account.address,
-            to=to,
-            nonce=nonce,
-            data=data,
-            value=value,
-            gas_limit=gas_limit,
-            max_priority_fee_per_gas=max_priority_fee_per_gas,
-            max_fee_per_gas=max_fee_per_gas,
-            chain=self.chain,
-        )
+        if not tx_params:
+            nonce = kwargs.get("nonce")
+            if nonce is None and not self.config.pipelined:  # pipelined nonce is reserved right before sending
+                nonce = await self.nonce()
+            tx_params = TransactionParameters(
+                from_=self.account.address,
+                to=to,
+                nonce=nonce,
+                data=data,
+                value=value,
+                gas_limit=gas_limit,
+                max_priority_fee_per_gas=max_priority_fee_per_gas,
+                max_fee_per_gas=max_fee_per_gas,
+                chain=self.chain,
+            )
         await self.wait_for_gwei()
         if not tx_params.gas_limit:
             try:
@@ -446,17 +587,16 @@ class BaseClient:
                     f"{self.log_info} | Couldn't estimate gas. Transaction wasn't send - {err}"
                 )
                 return False, err
+        gas_oracle = await self.gas_oracle.update()
         if self.chain.eip1559_tx:
             if not tx_params.max_priority_fee_per_gas:
-                tx_params.max_priority_fee_per_gas = await self.w3.eth.max_priority_fee
-            latest_block = await self.w3.eth.get_block("latest")
-            base_fee_per_gas = latest_block.get("baseFeePerGas", 0)
+                tx_params.max_priority_fee_per_gas = gas_oracle.priority_fee()
             if not tx_params.max_fee_per_gas:
                 tx_params.max_fee_per_gas = (
-                        base_fee_per_gas + tx_params.max_priority_fee_per_gas
+                        gas_oracle.base_fee + tx_params.max_priority_fee_per_gas
                 )
         else:
-            tx_params.gas_price = await self.w3.eth.gas_price
+            tx_params.gas_price = gas_oracle.gas_price
         if value.token == self.chain.native_token and use_full_balance:
             tx_params.value = (
                     await self.balance_of()
@@ -469,15 +609,37 @@ class BaseClient:
             self, name: str, tx_params: TransactionParameters
     ) -> tuple[bool, Exception | HexBytes | str]:
         while True:
-            ok, tx_hash_or_err = await self._send_transaction(tx_params)
+            if self.config.pipelined and tx_params.nonce is None:
+                tx_params.nonce = await self.nonce_manager.reserve(self.w3)
+            try:
+                ok, tx_hash_or_err = await self._send_transaction(tx_params)
+            except BaseException:  # e.g. cancelled, nonce must not stay reserved
+                if self.config.pipelined:
+                    self.nonce_manager.release(tx_params.nonce)
+                raise
+            if not ok:
+                if self.config.pipelined:
+                    self.nonce_manager.release(tx_params.nonce)
+                return ok, tx_hash_or_err
+            if self.config.pipelined:
+                self.nonce_manager.sent(tx_params.nonce, tx_hash_or_err)
             try:
                 res = await self.verify_transaction(tx_hash_or_err, name)
-                break
             except TimeExhausted:
-                if self.config.do_no_matter_what:
-                    tx_params = await self.create_tx_params(tx_params=tx_params)
-                else:
-                    return ok, tx_hash_or_err
+                if self.config.pipelined:  # frees nonce if tx was dropped, so later txs don't wait behind the gap
+                    await self.nonce_manager.reconcile(self.w3)
+                if not self.config.do_no_matter_what:
+                    return False, tx_hash_or_err
+                if self.config.pipelined:  # resending with the same nonce, it mustn't be reserved by another tx
+                    self.nonce_manager.discard(tx_params.nonce)
+                tx_params = await self.create_tx_params(tx_params=tx_params)
+                continue
+            except Exception:  # raised in pipelined mode only, receipt wasn't received
+                await self.nonce_manager.reconcile(self.w3)
+                return False, tx_hash_or_err
+            if self.config.pipelined:
+                self.nonce_manager.mined(tx_params.nonce)
+            break
         if res:
             logger.debug(
                 f"{self.log_info} | {name} done. Cost - {tx_params.value}. Fee - {tx_params.fee}"
@@ -489,20 +651,24 @@ class BaseClient:
     ) -> tuple[bool, Exception | HexBytes | str]:
         while True:
             try:
-                sign = self.w3.eth.account.sign_transaction(
-                    tx_params.to_dict(), self.account.key.hex()
-                )
+                raw_transaction = await self.sign_transaction(tx_params)
             except Exception as e:
-                input()
+                logger.error(f"{self.log_info} | Couldn't sign transaction {tx_params}. {e}")
+                return False, e
             try:
                 tx_hash = (
-                    await self.w3.eth.send_raw_transaction(sign.raw_transaction)
+                    await self.w3.eth.send_raw_transaction(raw_transaction)
                 ).hex()
                 break
             except ValueError as e:
                 error_message = e.args[0]["message"]
                 if "invalid nonce" in error_message or "nonce too low" in error_message:
-                    tx_params.nonce += 1
+                    if self.config.pipelined:
+                        self.nonce_manager.discard(tx_params.nonce)
+                        await self.nonce_manager.reconcile(self.w3)
+                        tx_params.nonce = await self.nonce_manager.reserve(self.w3)
+                    else:
+                        tx_params.nonce += 1
                 elif "replacement transaction underpriced" in error_message:
                     last_block = await self.w3.eth.get_block("latest")
                     tx_params.max_priority_fee_per_gas = (
@@ -542,10 +708,14 @@ class BaseClient:
         return True, tx_hash
 
     async def verify_transaction(self, tx_hash: _Hash32, tx_name: str) -> bool:
+        """
+        False if tx failed. If receipt wasn't received, `TimeExhausted` is raised with `do_no_matter_what` or in
+        pipelined mode, other errors are raised in pipelined mode, so nonce of tx isn't considered used
+        """
         explorer_link = f"{self.chain.explorer}/tx/{tx_hash}"
         while True:
             try:
-                data = await self.w3.eth.wait_for_transaction_receipt(tx_hash, 240)
+                data = await self.receipt_tracker.wait(tx_hash, 240)
                 if "status" in data and data["status"] == 1:
                     logger.debug(
                         f"{self.log_info} | Transaction {tx_name} ({explorer_link}) was successful"
@@ -561,13 +731,15 @@ class BaseClient:
                 logger.warning(
                     f"{self.log_info} | Transaction {tx_name} ({explorer_link}) failed: {e}"
                 )
-                if self.config.do_no_matter_what:
+                if self.config.do_no_matter_what or self.config.pipelined:
                     raise e
                 return False
             except Exception as err:
                 logger.warning(
                     f"{self.log_info} | Transaction {tx_name} ({tx_hash}) failed: {err}"
                 )
+                if self.config.pipelined:
+                    raise err
                 return False
 
 
@@ -581,22 +753,29 @@ class ProfileClient(BaseClient):
     ):
         self.profile = profile
         self._encryption_password = encryption_password
-        account = (
-            Account.from_key(
-                decrypt(self.profile.evm_private, self._encryption_password)
-            )
-            if self.profile.evm_private.startswith("-----BEGIN PGP MESSAGE-----")
-            else Account.from_key(self.profile.evm_private)
-        )
         super().__init__(
-            account=account,
             chain=chain,
             config=config,
             http_provider_config=HTTPProviderConfig(proxy=profile.proxy.proxy_string),
         )
 
+    @property
+    def account(self) -> LocalAccount:
+        if self._account is None:  # decrypted on first use, see `key_loader.preload_profiles` for bulk decryption
+            self.account = key_loader.evm_account(self.profile.evm_private, self._encryption_password)
+        return self._account
+
+    @account.setter
+    def account(self, account: LocalAccount):
+        self._account: LocalAccount = account
+        self._update_log_info()
+
+    def _default_account(self) -> Optional[LocalAccount]:
+        return None
+
     def _update_log_info(self):
-        self.log_info = f"{self._account.address} ({self._chain.name})"
+        address = f"{self._account.address} " if self._account else ""
+        self.log_info = f"{address}({self._chain.name})"
         if self.profile:
             self.log_info = f"{self.profile.id} | {self.log_info}"
 
@@ -640,9 +819,7 @@ class ProfileClient(BaseClient):
         return await self.tx(
             amount.token.address,
             f"Approve {amount}",
-            self.w3.eth.contract(
-                to_checksum_address(amount.token.address), abi=DefaultABIs.token
-            ).encode_abi("approve", args=(spender_contract.address, amount.wei)),
+            encode_approve(spender_contract.address, amount.wei),
         )
 
     async def transfer_token(
@@ -660,10 +837,9 @@ class ProfileClient(BaseClient):
         if balance.wei < amount.wei:
             logger.warning(f"{self.log_info} | Balance - {balance} < amount - {amount}")
             return False, ""
-        contract = self.w3.eth.contract(amount.token.address, abi=DefaultABIs.token)
         return await self.tx(
-            contract.address,
+            checksum(amount.token.address),
             name or f"Transfer {amount} to {to}",
-            data=contract.encode_abi("transfer", args=[to, amount.wei]),
+            data=encode_transfer(to, amount.wei),
             **kwargs,
         )
@@ -0,0 +1,112 @@
+from collections import OrderedDict
+from functools import lru_cache
+
+from eth_utils import keccak, to_checksum_address
+from web3 import AsyncWeb3
+from web3.contract import AsyncContract
+
+__all__ = [
+    "checksum",
+    "selector",
+    "ContractCache",
+    "encode_transfer",
+    "encode_approve",
+    "encode_transfer_from",
+    "encode_balance_of",
+    "encode_allowance",
+    "encode_deposit",
+    "encode_withdraw",
+]
+
+
+@lru_cache(maxsize=4096)
+def checksum(address: str) -> str:
+    return to_checksum_address(address)
+
+
+def selector(signature: str) -> bytes:
+    return keccak(text=signature)[:4]
+
+
+TRANSFER_SELECTOR = selector("transfer(address,uint256)")
+APPROVE_SELECTOR = selector("approve(address,uint256)")
+TRANSFER_FROM_SELECTOR = selector("transferFrom(address,address,uint256)")
+BALANCE_OF_SELECTOR = selector("balanceOf(address)")
+ALLOWANCE_SELECTOR = selector("allowance(address,address)")
+DECIMALS_SELECTOR = selector("decimals()")
+SYMBOL_SELECTOR = selector("symbol()")
+NAME_SELECTOR = selector("name()")
+DEPOSIT_SELECTOR = selector("deposit()")
+WITHDRAW_SELECTOR = selector("withdraw(uint256)")
+
+
+def _address(address: str) -> bytes:
+    raw = bytes.fromhex(address.removeprefix("0x"))
+    if len(raw) != 20:
+        raise ValueError(f"Invalid address: {address}")
+    return raw.rjust(32, b"\0")
+
+
+def _uint256(value: int) -> bytes:
+    return int(value).to_bytes(32, "big")  # raises OverflowError for negative and too big values
+
+
+def _calldata(*chunks: bytes) -> str:
+    return "0x" + b"".join(chunks).hex()
+
+
+def encode_transfer(to: str, amount: int) -> str:
+    return _calldata(TRANSFER_SELECTOR, _address(to), _uint256(amount))
+
+
+def encode_approve(spender: str, amount: int) -> str:
+    return _calldata(APPROVE_SELECTOR, _address(spender), _uint256(amount))
+
+
+def encode_transfer_from(owner: str, to: str, amount: int) -> str:
+    return _calldata(TRANSFER_FROM_SELECTOR, _address(owner), _address(to), _uint256(amount))
+
+
+def encode_balance_of(owner: str) -> str:
+    return _calldata(BALANCE_OF_SELECTOR, _address(owner))
+
+
+def encode_allowance(owner: str, spender: str) -> str:
+    return _calldata(ALLOWANCE_SELECTOR, _address(owner), _address(spender))
+
+
+def encode_deposit() -> str:
+    return _calldata(DEPOSIT_SELECTOR)
+
+
+def encode_withdraw(amount: int) -> str:
+    return _calldata(WITHDRAW_SELECTOR, _uint256(amount))
+
+
+class ContractCache:
+    """
+    LRU of contract objects of one w3 keyed by (address, ABI identity), so ABI isn't parsed again for every call.
+    Entry keeps its ABI alive, so `id(abi)` of cached entry can't be reused by another ABI
+    """
+
+    def __init__(self, w3: AsyncWeb3, maxsize: int = 256):
+        self.w3 = w3
+        self.maxsize = maxsize
+        self._contracts: OrderedDict[tuple[str, int], tuple[list | str, AsyncContract]] = OrderedDict()
+
+    def __repr__(self):
+        return f"ContractCache(size={len(self._contracts)})"
+
+    def __len__(self):
+        return len(self._contracts)
+
+    def get(self, address: str, abi: list | str) -> AsyncContract:
+        key = (address.lower(), id(abi))
+        if key in self._contracts:
+            self._contracts.move_to_end(key)
+            return self._contracts[key][1]
+        contract = self.w3.eth.contract(checksum(address), abi=abi)
+        self._contracts[key] = (abi, contract)
+        if len(self._contracts) > self.maxsize:
+            self._contracts.popitem(last=False)
+        return contract
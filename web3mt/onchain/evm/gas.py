@@ -0,0 +1,136 @@
+import asyncio
+import statistics
+import time
+from typing import Optional
+
+from eth_utils import from_wei
+from web3 import AsyncWeb3
+from web3.eth import AsyncEth
+
+from web3mt.onchain.evm.models import Chain
+from web3mt.onchain.evm.providers import FailoverHTTPProvider
+from web3mt.utils import logger
+
+__all__ = ["GasOracle"]
+
+
+class GasOracle:
+    """
+    Fees of chain shared by every client of the same RPC and proxy: one `eth_feeHistory` request (`eth_gasPrice` for
+    legacy chains) per new block, whatever number of clients asks for them. Block number is checked at most once per
+    `block_check_interval` seconds. Clients waiting for gas price to drop below threshold wait on one condition, that
+    is notified by a single poller on every new block
+    """
+
+    _shared: dict[tuple, "GasOracle"] = {}
+
+    def __init__(
+        self,
+        chain: Chain,
+        request_kwargs: Optional[dict] = None,
+        percentiles: tuple[int, ...] = (10, 50, 90),
+        block_count: int = 10,
+        block_check_interval: float = 1,
+    ):
+        self.chain = chain
+        self.w3 = AsyncWeb3(
+            FailoverHTTPProvider(chain.rpcs, request_kwargs=request_kwargs, chain_id=chain.chain_id),
+            modules={"eth": (AsyncEth,)},
+        )
+        self.percentiles = percentiles
+        self.block_count = block_count
+        self.block_check_interval = block_check_interval
+        self.block_number: Optional[int] = None
+        self.base_fee = 0
+        self.priority_fees: dict[int, int] = {}
+        self._gas_price = 0
+        self._checked_at = -float("inf")
+        self._update_task: Optional[asyncio.Task] = None
+        self._poller: Optional[asyncio.Task] = None
+        self._condition = asyncio.Condition()
+        self._waiters = 0
+
+    def __repr__(self):
+        return f"GasOracle({self.chain.name})"
+
+    @classmethod
+    def get(cls, chain: Chain, request_kwargs: Optional[dict] = None) -> "GasOracle":
+        key = (chain.chain_id, tuple(chain.rpcs), (request_kwargs or {}).get("proxy"))
+        if key not in cls._shared:
+            cls._shared[key] = cls(chain, request_kwargs)
+        return cls._shared[key]
+
+    @property
+    def gas_price(self) -> int:
+        if self.chain.eip1559_tx:
+            return self.base_fee + self.priority_fee()
+        return self._gas_price
+
+    @property
+    def gwei(self):
+        return from_wei(self.gas_price, "gwei")
+
+    def priority_fee(self, percentile: int = 50) -> int:
+        return self.priority_fees.get(percentile, 0)
+
+    async def _update(self, force: bool = False) -> bool:
+        """Fetches fees of the latest block if it's a new one. Returns whether fees were fetched"""
+        block_number = await self.w3.eth.block_number
+        self._checked_at = time.monotonic()
+        if block_number == self.block_number and not force:
+            return False
+        if not self.chain.eip1559_tx:
+            self._gas_price = await self.w3.eth.gas_price
+        else:
+            history = await self.w3.eth.fee_history(self.block_count, block_number, list(self.percentiles))
+            self.base_fee = history["baseFeePerGas"][-1]  # base fee of the next block
+            if rewards := [reward for reward in history.get("reward") or [] if reward]:
+                self.priority_fees = {
+                    percentile: int(statistics.median(reward[i] for reward in rewards))
+                    for i, percentile in enumerate(self.percentiles)
+                }
+            else:  # RPC doesn't return rewards or blocks were empty
+                max_priority_fee = await self.w3.eth.max_priority_fee
+                self.priority_fees = {percentile: max_priority_fee for percentile in self.percentiles}
+        self.block_number = block_number
+        return True
+
+    async def update(self, force: bool = False) -> "GasOracle":
+        """
+        Fetches fees if there is a new block since the last check, block number is checked at most once per
+        `block_check_interval`. Concurrent calls share one request
+        """
+        if force or time.monotonic() - self._checked_at > self.block_check_interval:
+            if self._update_task is None or self._update_task.done():
+                self._update_task = asyncio.create_task(self._update(force))
+            await asyncio.shield(self._update_task)
+        return self
+
+    async def _poll(self) -> None:
+        notified_block = self.block_number
+        while self._waiters:
+            await asyncio.sleep(self.block_check_interval)
+            try:
+                await self.update()
+            except Exception as e:
+                logger.warning(f"{self} | Couldn't update fees. {e}")
+                continue
+            if self.block_number == notified_block:
+                continue
+            notified_block = self.block_number
+            async with self._condition:
+                self._condition.notify_all()
+
+    async def wait_for_gas_price(self, max_gwei: float, log_info: str = None) -> None:
+        await self.update()
+        if self.gwei <= max_gwei:
+            return
+        logger.debug(f"{log_info or self} | Current GWEI: {self.gwei:.3f} > {max_gwei}. Waiting for gwei...")
+        self._waiters += 1
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll())
+        try:
+            async with self._condition:
+                await self._condition.wait_for(lambda: self.gwei <= max_gwei)
+        finally:
+            self._waiters -= 1
@@ -4,6 +4,7 @@ from _decimal import Decimal, InvalidOperation
 from eth_utils import to_checksum_address
 
 from web3mt.models import Coin
+from web3mt.onchain.token_metadata import token_metadata
 from web3mt.utils import format_number, logger
 from typing import Union, TYPE_CHECKING
 
@@ -358,11 +359,11 @@ class Token(Coin):
 
     @property
     def price(self) -> Decimal | None:
-        return self._prices.get(self.get_unwrapped_symbol())
+        return self._get_price(self.get_unwrapped_symbol())
 
     @price.setter
     def price(self, value: int | float | str | Decimal):
-        self._prices[self.get_unwrapped_symbol()] = Decimal(str(value))
+        self._set_price(self.get_unwrapped_symbol(), value)
 
     def get_unwrapped_symbol(self) -> str:
         symbol = self.symbol
@@ -371,6 +372,8 @@ class Token(Coin):
         return symbol
 
     async def get_token_info(self) -> "Token":
+        if token_metadata.apply(self.chain.chain_id, self):
+            return self
         from web3mt.onchain.evm.client import BaseClient
 
         return await BaseClient(chain=self.chain).get_onchain_token_info(token=self)
@@ -507,6 +510,7 @@ class Chain:
         max_gwei: int = None,
         eip1559_tx: bool = False,
         native_token: "Token" = None,
+        rpcs: list[str] = None,
     ):
         if chain_id in cls._instances:
             raise ValueError(f"Instance with chain_id {chain_id} already exists.")
@@ -523,9 +527,15 @@ class Chain:
         max_gwei: int = None,
         eip1559_tx: bool = False,
         native_token: "Token" = None,
+        rpcs: list[str] = None,
     ):
+        """
+        :param rpc: main RPC
+        :param rpcs: fallback RPCs in order of preference
+        """
         self.name = name
         self.rpc = rpc
+        self.fallback_rpcs = rpcs or []
         self.chain_id = chain_id
         self.eip1559_tx = eip1559_tx
         self.explorer = explorer.rstrip("/")
@@ -535,6 +545,10 @@ class Chain:
     def __str__(self):
         return self.name
 
+    @property
+    def rpcs(self) -> list[str]:
+        return [self.rpc] + [rpc for rpc in self.fallback_rpcs if rpc != self.rpc]
+
     def __repr__(self):
         return (
             f"Chain(name={self.name}, rpc={self.rpc}, chain_id={self.chain_id}, explorer={self.explorer}, "
@@ -554,6 +568,7 @@ class Chain:
 Ethereum = Chain(
     name="Ethereum",
     rpc="https://ethereum.publicnode.com",
+    rpcs=["https://1rpc.io/eth", "https://eth.llamarpc.com", "https://eth.drpc.org"],
     chain_id=1,
     explorer="https://etherscan.io/",
     max_gwei=5,
@@ -570,6 +585,7 @@ Sepolia = Chain(
 Arbitrum = Chain(
     name="Arbitrum One",
     rpc="https://arbitrum.gateway.tenderly.co/1RhHTwPZOQv3RtsoB0EJ51",
+    rpcs=["https://arb1.arbitrum.io/rpc", "https://arbitrum-one-rpc.publicnode.com", "https://1rpc.io/arb"],
     chain_id=42161,
     explorer="https://arbiscan.io/",
     eip1559_tx=True,
@@ -585,6 +601,7 @@ ARB_Sepolia = Chain(
 Optimism = Chain(
     name="Optimism",
     rpc="https://op-pokt.nodies.app",
+    rpcs=["https://mainnet.optimism.io", "https://optimism-rpc.publicnode.com", "https://1rpc.io/op"],
     chain_id=10,
     explorer="https://optimistic.etherscan.io/",
     eip1559_tx=True,
@@ -600,6 +617,7 @@ OP_Sepolia = Chain(
 Polygon = Chain(
     name="Polygon",
     rpc="https://1rpc.io/matic",
+    rpcs=["https://polygon-rpc.com", "https://polygon-bor-rpc.publicnode.com"],
     chain_id=137,
     explorer="https://polygonscan.com/",
     eip1559_tx=True,
@@ -617,6 +635,7 @@ Mumbai.native_token.symbol = "POL"
 Avalanche = Chain(
     name="Avalanche C-Chain",
     rpc="https://rpc.ankr.com/avalanche/192d48a1a5b6c9408d2ef50d94e8fcc92902a511cf08e658473feca9f30650b9",
+    rpcs=["https://api.avax.network/ext/bc/C/rpc", "https://avalanche-c-chain-rpc.publicnode.com"],
     chain_id=43114,
     explorer="https://snowtrace.io/",
     eip1559_tx=True,
@@ -635,6 +654,7 @@ Fantom.native_token.symbol = "FTM"
 opBNB = Chain(
     name="opBNB",
     rpc="https://opbnb.publicnode.com",
+    rpcs=["https://opbnb-mainnet-rpc.bnbchain.org"],
     chain_id=204,
     explorer="https://bscscan.com/",
     eip1559_tx=True,
@@ -644,6 +664,7 @@ opBNB.native_token.symbol = "BNB"
 BSC = Chain(
     name="BSC",
     rpc="https://rpc.ankr.com/bsc/192d48a1a5b6c9408d2ef50d94e8fcc92902a511cf08e658473feca9f30650b9",
+    rpcs=["https://bsc-dataseed.bnbchain.org", "https://bsc-rpc.publicnode.com", "https://1rpc.io/bnb"],
     chain_id=56,
     explorer="https://bscscan.com/",
     eip1559_tx=True,
@@ -661,6 +682,7 @@ Xterio.native_token.symbol = "BNB"
 Linea = Chain(
     name="Linea",
     rpc="https://rpc.linea.build",
+    rpcs=["https://linea-rpc.publicnode.com", "https://1rpc.io/linea"],
     chain_id=59144,
     explorer="https://lineascan.build/",
     eip1559_tx=True,
@@ -669,6 +691,7 @@ Linea = Chain(
 zkSync = Chain(
     name="zkSync",
     rpc="https://rpc.ankr.com/zksync_era",
+    rpcs=["https://mainnet.era.zksync.io", "https://1rpc.io/zksync2-era"],
     chain_id=324,
     explorer="https://explorer.zksync.io/",
     eip1559_tx=True,
@@ -686,6 +709,7 @@ ZetaChain.native_token.symbol = "ZETA"
 Scroll = Chain(
     name="Scroll",
     rpc="https://1rpc.io/scroll",
+    rpcs=["https://rpc.scroll.io", "https://scroll-rpc.publicnode.com"],
     chain_id=534352,
     explorer="https://scrollscan.com/",
     eip1559_tx=True,
@@ -702,6 +726,7 @@ Zora = Chain(
 Base = Chain(
     name="Base",
     rpc="https://base-rpc.publicnode.com",
+    rpcs=["https://mainnet.base.org", "https://1rpc.io/base", "https://base.llamarpc.com"],
     chain_id=8453,
     explorer="https://basescan.org/",
     eip1559_tx=True,
@@ -735,51 +760,51 @@ Ronin = Chain(
 Ronin.native_token.symbol = "RON"
 
 ETHEREUM_TOKENS = dict(
-    WETH=Token(Ethereum, address="0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"),
-    USDT=Token(Ethereum, address="0xdAC17F958D2ee523a2206206994597C13D831ec7"),
-    USDC=Token(Ethereum, address="0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"),
+    WETH=Token(Ethereum, symbol="WETH", address="0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"),
+    USDT=Token(Ethereum, symbol="USDT", address="0xdAC17F958D2ee523a2206206994597C13D831ec7", decimals=6),
+    USDC=Token(Ethereum, symbol="USDC", address="0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48", decimals=6),
 )
 BASE_TOKENS = dict(
-    WETH=Token(Base, address="0x4200000000000000000000000000000000000006"),
-    USDC=Token(Base, address="0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"),
-    USDT=Token(Base, address="0xfde4C96c8593536E31F229EA8f37b2ADa2699bb2"),
+    WETH=Token(Base, symbol="WETH", address="0x4200000000000000000000000000000000000006"),
+    USDC=Token(Base, symbol="USDC", address="0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913", decimals=6),
+    USDT=Token(Base, symbol="USDT", address="0xfde4C96c8593536E31F229EA8f37b2ADa2699bb2", decimals=6),
 )
 SCROLL_TOKENS = dict(
-    WETH=Token(Scroll, address="0x5300000000000000000000000000000000000004"),
-    SCR=Token(Scroll, address="0xd29687c813d741e2f938f4ac377128810e217b1b"),
-    USDT=Token(Scroll, address="0xf55BEC9cafDbE8730f096Aa55dad6D22d44099Df"),
-    USDC=Token(Scroll, address="0x06eFdBFf2a14a7c8E15944D1F4A48F9F95F663A4"),
+    WETH=Token(Scroll, symbol="WETH", address="0x5300000000000000000000000000000000000004"),
+    SCR=Token(Scroll, symbol="SCR", address="0xd29687c813d741e2f938f4ac377128810e217b1b"),
+    USDT=Token(Scroll, symbol="USDT", address="0xf55BEC9cafDbE8730f096Aa55dad6D22d44099Df", decimals=6),
+    USDC=Token(Scroll, symbol="USDC", address="0x06eFdBFf2a14a7c8E15944D1F4A48F9F95F663A4", decimals=6),
 )
 BSC_TOKENS = dict(
-    USDC=Token(BSC, address="0x8AC76a51cc950d9822D68b83fE1Ad97B32Cd580d"),
-    USDT=Token(BSC, address="0x55d398326f99059fF775485246999027B3197955"),
+    USDC=Token(BSC, symbol="USDC", address="0x8AC76a51cc950d9822D68b83fE1Ad97B32Cd580d"),
+    USDT=Token(BSC, symbol="USDT", address="0x55d398326f99059fF775485246999027B3197955"),
 )
 ARBITRUM_TOKENS = dict(
-    WETH=Token(Arbitrum, address="0x82aF49447D8a07e3bd95BD0d56f35241523fBab1"),
-    USDC=Token(Arbitrum, address="0xaf88d065e77c8cC2239327C5EDb3A432268e5831"),
-    USDT=Token(Arbitrum, address="0xFd086bC7CD5C481DCC9C85ebE478A1C0b69FCbb9"),
+    WETH=Token(Arbitrum, symbol="WETH", address="0x82aF49447D8a07e3bd95BD0d56f35241523fBab1"),
+    USDC=Token(Arbitrum, symbol="USDC", address="0xaf88d065e77c8cC2239327C5EDb3A432268e5831", decimals=6),
+    USDT=Token(Arbitrum, symbol="USDT", address="0xFd086bC7CD5C481DCC9C85ebE478A1C0b69FCbb9", decimals=6),
 )
 POLYGON_TOKENS = dict(
-    USDT=Token(Polygon, address="0xc2132D05D31c914a87C6611C10748AEb04B58e8F"),
-    USDC=Token(Polygon, address="0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359"),
+    USDT=Token(Polygon, symbol="USDT", address="0xc2132D05D31c914a87C6611C10748AEb04B58e8F", decimals=6),
+    USDC=Token(Polygon, symbol="USDC", address="0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359", decimals=6),
 )
 OPTIMISM_TOKENS = dict(
-    WETH=Token(Optimism, address="0x4200000000000000000000000000000000000006"),
-    USDT=Token(Optimism, address="0x94b008aA00579c1307B0EF2c499aD98a8ce58e58"),
-    USDC=Token(Optimism, address="0x0b2C639c533813f4Aa9D7837CAf62653d097Ff85"),
+    WETH=Token(Optimism, symbol="WETH", address="0x4200000000000000000000000000000000000006"),
+    USDT=Token(Optimism, symbol="USDT", address="0x94b008aA00579c1307B0EF2c499aD98a8ce58e58", decimals=6),
+    USDC=Token(Optimism, symbol="USDC", address="0x0b2C639c533813f4Aa9D7837CAf62653d097Ff85", decimals=6),
 )
 ZKSYNC_TOKENS = dict(
-    WETH=Token(zkSync, address="0xf00DAD97284D0c6F06dc4Db3c32454D4292c6813"),
-    USDT=Token(zkSync, address="0x493257fD37EDB34451f62EDf8D2a0C418852bA4C"),
-    USDC=Token(zkSync, address="0x1d17CBcF0D6D143135aE902365D2E5e2A16538D4"),
+    WETH=Token(zkSync, symbol="WETH", address="0xf00DAD97284D0c6F06dc4Db3c32454D4292c6813"),
+    USDT=Token(zkSync, symbol="USDT", address="0x493257fD37EDB34451f62EDf8D2a0C418852bA4C", decimals=6),
+    USDC=Token(zkSync, symbol="USDC", address="0x1d17CBcF0D6D143135aE902365D2E5e2A16538D4", decimals=6),
 )
 ZORA_TOKENS = dict(
-    WETH=Token(Zora, address="0x4200000000000000000000000000000000000006")
+    WETH=Token(Zora, symbol="WETH", address="0x4200000000000000000000000000000000000006")
 )
 LINEA_TOKENS = dict(
-    LXP=Token(Linea, address="0xd83af4fbD77f3AB65C3B1Dc4B38D7e67AEcf599A"),
-    USDC=Token(Linea, address="0x176211869ca2b568f2a7d4ee941e073a821ee1ff"),
-    USDT=Token(Linea, address="0xa219439258ca9da29e9cc4ce5596924745e12b93")
+    LXP=Token(Linea, symbol="LXP", address="0xd83af4fbD77f3AB65C3B1Dc4B38D7e67AEcf599A"),
+    USDC=Token(Linea, symbol="USDC", address="0x176211869ca2b568f2a7d4ee941e073a821ee1ff", decimals=6),
+    USDT=Token(Linea, symbol="USDT", address="0xa219439258ca9da29e9cc4ce5596924745e12b93", decimals=6)
 )
 TOKENS = {
     "ETHEREUM": ETHEREUM_TOKENS,
@@ -791,7 +816,9 @@ TOKENS = {
     "OPTIMISM": OPTIMISM_TOKENS,
     "ZORA": ZORA_TOKENS,
     "LINEA": LINEA_TOKENS,
+    "ZKSYNC": ZKSYNC_TOKENS,
 }
+token_metadata.warm(token for tokens in TOKENS.values() for token in tokens.values())
 
 if __name__ == "__main__":
     a = Token(chain=Optimism, address="0x4200000000000000000000000000000000000006")
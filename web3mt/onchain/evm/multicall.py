@@ -0,0 +1,127 @@
+import asyncio
+from typing import Any
+
+from eth_abi import decode, encode
+from eth_utils import to_checksum_address
+from web3 import AsyncWeb3
+from web3.exceptions import Web3Exception
+
+from web3mt.onchain.evm.contracts import (
+    ALLOWANCE_SELECTOR,
+    BALANCE_OF_SELECTOR,
+    DECIMALS_SELECTOR,
+    NAME_SELECTOR,
+    SYMBOL_SELECTOR,
+    selector,
+)
+from web3mt.utils import logger
+
+__all__ = ["MULTICALL3_ADDRESS", "Call", "Multicall"]
+
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL3_ADDRESSES = {
+    324: "0xF9cda624FBC7e059355ce98a31693d299FACd963",  # zkSync Era has its own deployment
+}
+
+AGGREGATE3_SELECTOR = selector("aggregate3((address,bool,bytes)[])")
+GET_ETH_BALANCE_SELECTOR = selector("getEthBalance(address)")
+
+
+class Call:
+    def __init__(
+        self,
+        target: str,
+        call_data: bytes,
+        output_types: tuple[str, ...] = ("uint256",),
+        allow_failure: bool = True,
+    ):
+        self.target = to_checksum_address(target)
+        self.call_data = call_data
+        self.output_types = output_types
+        self.allow_failure = allow_failure
+
+    def __repr__(self):
+        return f"Call(target={self.target}, call_data=0x{self.call_data.hex()})"
+
+    @classmethod
+    def eth_balance(cls, multicall_address: str, owner: str) -> "Call":
+        return cls(multicall_address, GET_ETH_BALANCE_SELECTOR + encode(["address"], [owner]))
+
+    @classmethod
+    def balance_of(cls, token_address: str, owner: str) -> "Call":
+        return cls(token_address, BALANCE_OF_SELECTOR + encode(["address"], [owner]))
+
+    @classmethod
+    def allowance(cls, token_address: str, owner: str, spender: str) -> "Call":
+        return cls(token_address, ALLOWANCE_SELECTOR + encode(["address", "address"], [owner, spender]))
+
+    @classmethod
+    def decimals(cls, token_address: str) -> "Call":
+        return cls(token_address, DECIMALS_SELECTOR)
+
+    @classmethod
+    def symbol(cls, token_address: str) -> "Call":
+        return cls(token_address, SYMBOL_SELECTOR, ("string",))
+
+    @classmethod
+    def name(cls, token_address: str) -> "Call":
+        return cls(token_address, NAME_SELECTOR, ("string",))
+
+    def decode(self, success: bool, return_data: bytes) -> Any:
+        """Returns None if call failed or returned something unexpected"""
+        if not success or not return_data:
+            return None
+        try:
+            result = decode(self.output_types, return_data)
+        except Exception:
+            return None
+        return result[0] if len(result) == 1 else result
+
+
+class Multicall:
+    """
+    Packs calls into Multicall3 `aggregate3`. Calls are split into chunks of `batch_size`, chunk that failed as a whole
+    (gas limit, response size limit) is split in half and retried
+    """
+
+    def __init__(
+        self,
+        w3: AsyncWeb3,
+        chain_id: int,
+        batch_size: int = 500,
+        concurrency: int = 5,
+        log_info: str = "Multicall",
+    ):
+        self.w3 = w3
+        self.address = MULTICALL3_ADDRESSES.get(chain_id, MULTICALL3_ADDRESS)
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.log_info = log_info
+
+    async def _aggregate3(self, calls: list[Call]) -> list[Any]:
+        data = AGGREGATE3_SELECTOR + encode(
+            ["(address,bool,bytes)[]"],
+            [[(call.target, call.allow_failure, call.call_data) for call in calls]],
+        )
+        try:
+            return_data = await self.w3.eth.call({"to": self.address, "data": "0x" + data.hex()})
+        except (Web3Exception, ValueError, TimeoutError) as e:
+            if len(calls) == 1:
+                raise e
+            logger.debug(f"{self.log_info} | aggregate3 with {len(calls)} calls failed, splitting. {e}")
+            middle = len(calls) // 2
+            return await self._aggregate3(calls[:middle]) + await self._aggregate3(calls[middle:])
+        (results,) = decode(["(bool,bytes)[]"], bytes(return_data))
+        return [call.decode(success, data) for call, (success, data) in zip(calls, results)]
+
+    async def aggregate3(self, calls: list[Call]) -> list[Any]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(chunk: list[Call]) -> list[Any]:
+            async with semaphore:
+                return await self._aggregate3(chunk)
+
+        chunks = await asyncio.gather(
+            *[run(calls[i: i + self.batch_size]) for i in range(0, len(calls), self.batch_size)]
+        )
+        return [result for chunk in chunks for result in chunk]
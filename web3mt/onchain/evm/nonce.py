@@ -0,0 +1,116 @@
+import asyncio
+import heapq
+import time
+from typing import Optional
+
+from web3 import AsyncWeb3
+from web3.exceptions import TransactionNotFound
+
+from web3mt.utils import logger
+
+__all__ = ["NonceManager"]
+
+
+class NonceManager:
+    """
+    Local nonce allocator of (chain id, address), shared by every client of this account. Nonces are reserved without
+    RPC calls, so several signed txs can be in flight at once. Nonce of tx that wasn't sent or was dropped from mempool
+    is reused by the next reservation, so there are no gaps that would block later txs
+    """
+
+    _shared: dict[tuple[int, str], "NonceManager"] = {}
+
+    def __init__(self, chain_id: int, address: str):
+        self.chain_id = chain_id
+        self.address = address
+        self._lock = asyncio.Lock()
+        self._next: Optional[int] = None
+        self._free: list[int] = []  # heap of reserved but unused nonces below `_next`
+        self._reserved: dict[int, float] = {}  # nonce: reserved at
+        self._in_flight: dict[int, str] = {}  # nonce: tx hash
+
+    def __repr__(self):
+        return (
+            f"NonceManager({self.chain_id}, {self.address}, next={self._next}, free={sorted(self._free)}, "
+            f"in_flight={len(self._in_flight)})"
+        )
+
+    @classmethod
+    def get(cls, chain_id: int, address: str) -> "NonceManager":
+        key = (chain_id, address.lower())
+        if key not in cls._shared:
+            cls._shared[key] = cls(chain_id, address)
+        return cls._shared[key]
+
+    @property
+    def in_flight(self) -> dict[int, str]:
+        return dict(self._in_flight)
+
+    async def _sync(self, w3: AsyncWeb3) -> None:
+        self._next = max(await w3.eth.get_transaction_count(self.address, "pending"), self._next or 0)
+
+    async def reserve(self, w3: AsyncWeb3) -> int:
+        async with self._lock:
+            if self._next is None:
+                await self._sync(w3)
+            if self._free:
+                nonce = heapq.heappop(self._free)
+            else:
+                nonce = self._next
+                self._next += 1
+            self._reserved[nonce] = time.monotonic()
+            return nonce
+
+    def release(self, nonce: int) -> None:
+        """Nonce wasn't used (tx wasn't built or was rejected), next reservation fills the gap"""
+        self._reserved.pop(nonce, None)
+        self._in_flight.pop(nonce, None)
+        if self._next is not None and nonce < self._next and nonce not in self._free:
+            heapq.heappush(self._free, nonce)
+
+    def discard(self, nonce: int) -> None:
+        """Nonce is already used by another tx, it must not be reserved again"""
+        self._reserved.pop(nonce, None)
+        self._in_flight.pop(nonce, None)
+        if nonce in self._free:
+            self._free.remove(nonce)
+            heapq.heapify(self._free)
+
+    def sent(self, nonce: int, tx_hash: str) -> None:
+        """Also used for replacement of in-flight tx, the latest hash is kept"""
+        self._reserved.pop(nonce, None)
+        self._in_flight[nonce] = tx_hash
+
+    def mined(self, nonce: int) -> None:
+        self._reserved.pop(nonce, None)
+        self._in_flight.pop(nonce, None)
+
+    async def reconcile(self, w3: AsyncWeb3, reservation_ttl: float = 120) -> None:
+        """
+        Syncs local state with chain: forgets mined txs, frees nonces of txs dropped from mempool and of reservations
+        that weren't sent within `reservation_ttl` seconds, moves `_next` forward if txs were sent by someone else
+        """
+        async with self._lock:
+            latest = await w3.eth.get_transaction_count(self.address, "latest")
+            for nonce in [nonce for nonce in self._in_flight if nonce < latest]:
+                del self._in_flight[nonce]
+            for nonce, tx_hash in list(self._in_flight.items()):
+                try:
+                    await w3.eth.get_transaction(tx_hash)
+                except TransactionNotFound:
+                    logger.warning(f"{self} | Tx {tx_hash} with nonce {nonce} was dropped, nonce will be reused")
+                    del self._in_flight[nonce]
+                    heapq.heappush(self._free, nonce)
+            for nonce, reserved_at in list(self._reserved.items()):
+                if time.monotonic() - reserved_at > reservation_ttl:
+                    logger.warning(f"{self} | Nonce {nonce} wasn't sent in {reservation_ttl}s, it will be reused")
+                    del self._reserved[nonce]
+                    heapq.heappush(self._free, nonce)
+            self._free = [nonce for nonce in set(self._free) if nonce >= latest]
+            heapq.heapify(self._free)
+            self._reserved = {nonce: at for nonce, at in self._reserved.items() if nonce >= latest}
+            if not self._in_flight and not self._reserved:
+                self._next, self._free = None, []
+                await self._sync(w3)
+            else:
+                self._next = max(self._next or 0, latest)
@@ -0,0 +1,393 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Optional
+
+from web3 import AsyncHTTPProvider
+from web3.providers.async_base import AsyncJSONBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from web3mt.utils import logger
+
+__all__ = ["EndpointStats", "RPCEndpointError", "ProviderRegistry", "provider_registry", "FailoverHTTPProvider"]
+
+
+class EndpointStats:
+    """Latency and errors of RPC endpoint, shared by every provider that uses this URL"""
+
+    _shared: dict[str, "EndpointStats"] = {}
+
+    def __init__(self, url: str, ewma_alpha: float = 0.3, window: int = 100):
+        self.url = url
+        self.ewma_alpha = ewma_alpha
+        self.latency_ewma: Optional[float] = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.latencies: deque[float] = deque(maxlen=window)
+
+    def __repr__(self):
+        latency = f"{self.latency_ewma:.3f}s" if self.latency_ewma is not None else None
+        return f"EndpointStats({self.url}, latency={latency}, error_rate={self.error_rate:.2f}, requests={self.requests})"
+
+    @classmethod
+    def get(cls, url: str) -> "EndpointStats":
+        if url not in cls._shared:
+            cls._shared[url] = cls(url)
+        return cls._shared[url]
+
+    def _record(self, latency: float, error: bool) -> None:
+        self.requests += 1
+        self.errors += error
+        self.error_rate += self.ewma_alpha * (float(error) - self.error_rate)
+        self.latency_ewma = (
+            latency
+            if self.latency_ewma is None
+            else self.latency_ewma + self.ewma_alpha * (latency - self.latency_ewma)
+        )
+
+    def record_success(self, latency: float) -> None:
+        self.latencies.append(latency)
+        self._record(latency, error=False)
+
+    def record_failure(self, penalty: float) -> None:
+        """Failure counts as request that took `penalty` seconds, so even fast failing endpoint is ranked lower"""
+        self._record(penalty, error=True)
+
+    def p95(self) -> Optional[float]:
+        if len(self.latencies) < 20:
+            return None
+        latencies = sorted(self.latencies)
+        return latencies[int(len(latencies) * 0.95) - 1]
+
+    def score(self, default_latency: float, error_penalty: float) -> float:
+        """Lower is better"""
+        latency = self.latency_ewma if self.latency_ewma is not None else default_latency
+        return latency * (1 + error_penalty * self.error_rate)
+
+
+class RPCEndpointError(Exception):
+    """Endpoint answered with an error that is endpoint's fault (rate limit, internal error), not request's"""
+
+    def __init__(self, url: str, response: RPCResponse):
+        self.url = url
+        self.response = response
+        super().__init__(f"{url} | {response.get('error')}")
+
+
+class ProviderRegistry:
+    """
+    HTTP providers keyed by (chain id, RPC, proxy, timeout). Every failover provider of the same RPC and proxy uses
+    one `AsyncHTTPProvider` with its warm aiohttp session, so switching chains back and forth and creating clients
+    doesn't set up new connections. Provider is closed when its last user releases it, `close_all` closes the rest
+    """
+
+    def __init__(self):
+        self.created = 0
+        self.reused = 0
+        self._providers: dict[tuple, AsyncHTTPProvider] = {}
+        self._users: dict[tuple, int] = {}
+
+    def __repr__(self):
+        return f"ProviderRegistry(providers={len(self._providers)}, created={self.created}, reused={self.reused})"
+
+    def __len__(self):
+        return len(self._providers)
+
+    @staticmethod
+    def _key(chain_id: Optional[int], url: str, request_kwargs: Optional[dict]) -> tuple:
+        request_kwargs = request_kwargs or {}
+        return chain_id, url, request_kwargs.get("proxy"), request_kwargs.get("timeout")
+
+    def get(self, chain_id: Optional[int], url: str, request_kwargs: Optional[dict] = None) -> AsyncHTTPProvider:
+        key = self._key(chain_id, url, request_kwargs)
+        self._users[key] = self._users.get(key, 0) + 1
+        if provider := self._providers.get(key):
+            self.reused += 1
+            return provider
+        provider = self._providers[key] = AsyncHTTPProvider(
+            url, request_kwargs=request_kwargs or {}, exception_retry_configuration=None
+        )
+        self.created += 1
+        return provider
+
+    async def release(self, chain_id: Optional[int], url: str, request_kwargs: Optional[dict] = None) -> None:
+        """Counterpart of `get`, closes session of provider nobody uses anymore"""
+        key = self._key(chain_id, url, request_kwargs)
+        if key not in self._users:
+            return
+        self._users[key] -= 1
+        if self._users[key] <= 0:
+            del self._users[key]
+            await self._close(self._providers.pop(key))
+
+    async def _close(self, provider: AsyncHTTPProvider) -> None:
+        try:
+            await provider.disconnect()
+        except Exception as e:
+            logger.warning(f"{self} | Couldn't close {provider}. {e}")
+
+    async def close_all(self) -> None:
+        providers, self._providers, self._users = list(self._providers.values()), {}, {}
+        for provider in providers:
+            await self._close(provider)
+
+
+provider_registry = ProviderRegistry()
+
+
+class FailoverHTTPProvider(AsyncJSONBaseProvider):
+    """
+    Sends request to the best ranked RPC endpoint and fails over to the next one on error or timeout.
+    With `hedge=True` methods from `HEDGED_METHODS` are sent to the second endpoint as well if the first one didn't
+    answer within its p95 latency, the fastest answer wins. Ranking is based on latency EWMA and error rate.
+    With `batch_window` reads from `BATCHED_METHODS` issued within the window are sent as one JSON-RPC batch
+    """
+
+    HEDGED_METHODS = {
+        "eth_getBalance",
+        "eth_estimateGas",
+        "eth_getBlockByNumber",
+        "eth_getBlockByHash",
+        "eth_call",
+        "eth_gasPrice",
+        "eth_maxPriorityFeePerGas",
+        "eth_blockNumber",
+    }
+    BATCHED_METHODS = HEDGED_METHODS | {
+        "eth_chainId",
+        "eth_getTransactionCount",
+        "eth_getCode",
+        "eth_getStorageAt",
+        "eth_feeHistory",
+        "eth_getTransactionByHash",
+        "eth_getTransactionReceipt",
+    }
+    RETRYABLE_ERROR_CODES = {-32005, -32603, -32099, 429}
+    RETRYABLE_ERROR_MESSAGES = ("rate limit", "too many requests", "timeout", "timed out", "capacity", "unavailable")
+
+    def __init__(
+        self,
+        endpoint_uris: list[str],
+        request_kwargs: Optional[dict] = None,
+        timeout: float = 10,
+        hedge: bool = False,
+        hedge_delay: float = 1,
+        min_hedge_delay: float = 0.05,
+        error_penalty: float = 4,
+        chain_id: Optional[int] = None,
+        batch_window: float = 0,
+        max_batch_size: int = 50,
+        **kwargs,
+    ):
+        """
+        :param chain_id: HTTP providers are taken from `provider_registry` by chain id, RPC and proxy
+        :param batch_window: seconds to collect concurrent reads for one batch, 0 disables batching
+        :param max_batch_size: batch is sent right away when it's full. Batches rejected by RPC are split in halves
+        """
+        super().__init__(**kwargs)
+        if not endpoint_uris:
+            raise ValueError("At least one RPC is required")
+        self.providers = {
+            url: provider_registry.get(chain_id, url, request_kwargs) for url in dict.fromkeys(endpoint_uris)
+        }
+        self.chain_id = chain_id
+        self.request_kwargs = request_kwargs
+        self._disconnected = False
+        self.timeout = timeout
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.error_penalty = error_penalty
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._batch: list[tuple[RPCEndpoint, Any, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: set[asyncio.Task] = set()
+
+    def __str__(self):
+        return f"RPC connection {', '.join(self.providers)}"
+
+    @property
+    def endpoint_uri(self) -> str:
+        return self.ranked()[0]
+
+    def ranked(self) -> list[str]:
+        urls = list(self.providers)
+        return sorted(
+            urls,
+            key=lambda url: (
+                EndpointStats.get(url).score(self.timeout, self.error_penalty),
+                urls.index(url),
+            ),
+        )
+
+    def _hedge_delay(self, url: str) -> float:
+        p95 = EndpointStats.get(url).p95()
+        return max(p95 if p95 is not None else self.hedge_delay, self.min_hedge_delay)
+
+    def _is_retryable_error(self, response: RPCResponse) -> bool:
+        error = response.get("error") if isinstance(response, dict) else None
+        if not isinstance(error, dict):
+            return False
+        message = str(error.get("message", "")).lower()
+        return error.get("code") in self.RETRYABLE_ERROR_CODES or any(
+            text in message for text in self.RETRYABLE_ERROR_MESSAGES
+        )
+
+    async def _call(self, url: str, method: RPCEndpoint, params: Any) -> RPCResponse:
+        stats = EndpointStats.get(url)
+        started_at = time.monotonic()
+        try:
+            response = await asyncio.wait_for(
+                self.providers[url].make_request(method, params), self.timeout
+            )
+        except asyncio.CancelledError:
+            # Lost hedged race, real latency is even higher
+            stats.record_success(time.monotonic() - started_at)
+            raise
+        except Exception:
+            stats.record_failure(self.timeout)
+            raise
+        if self._is_retryable_error(response):
+            stats.record_failure(self.timeout)
+            raise RPCEndpointError(url, response)
+        stats.record_success(time.monotonic() - started_at)
+        return response
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        if self.batch_window and method in self.BATCHED_METHODS:
+            return await self._enqueue(method, params)
+        return await self._make_request(method, params)
+
+    async def _make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        urls = self.ranked()
+        hedges = 1 if self.hedge and method in self.HEDGED_METHODS else 0
+        tasks: dict[asyncio.Task, str] = {}
+        last_error: Optional[Exception] = None
+        try:
+            while urls or tasks:
+                if urls and (not tasks or hedges):
+                    if tasks:  # previous endpoint is too slow, racing it with the next one
+                        hedges -= 1
+                    url = urls.pop(0)
+                    tasks[asyncio.create_task(self._call(url, method, params))] = url
+                done, _ = await asyncio.wait(
+                    tasks,
+                    timeout=self._hedge_delay(url) if hedges and urls else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    failed_url = tasks.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+                    logger.debug(f"{self} | {method} failed on {failed_url}. {last_error}")
+        finally:
+            for task in tasks:
+                task.cancel()
+        if isinstance(last_error, RPCEndpointError):
+            return last_error.response
+        raise last_error
+
+    async def make_batch_request(self, batch_requests: list[tuple[RPCEndpoint, Any]]):
+        last_error: Optional[Exception] = None
+        for url in self.ranked():
+            stats = EndpointStats.get(url)
+            started_at = time.monotonic()
+            try:
+                response = await asyncio.wait_for(
+                    self.providers[url].make_batch_request(batch_requests), self.timeout
+                )
+            except Exception as e:
+                stats.record_failure(self.timeout)
+                last_error = e
+                logger.debug(f"{self} | Batch request failed on {url}. {e}")
+                continue
+            if self._is_retryable_error(response):
+                stats.record_failure(self.timeout)
+                last_error = RPCEndpointError(url, response)
+                continue
+            stats.record_success(time.monotonic() - started_at)
+            return response
+        if isinstance(last_error, RPCEndpointError):
+            return last_error.response
+        raise last_error
+
+    def _enqueue(self, method: RPCEndpoint, params: Any) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._batch.append((method, params, future))
+        if len(self._batch) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._batch = self._batch, []
+        task = asyncio.create_task(self._send_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, response: RPCResponse = None, error: Exception = None) -> None:
+        if future.done():  # caller was cancelled
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(response)
+
+    async def _send_one(self, method: RPCEndpoint, params: Any, future: asyncio.Future) -> None:
+        try:
+            self._resolve(future, await self._make_request(method, params))
+        except Exception as e:
+            self._resolve(future, error=e)
+
+    async def _send_batch(self, batch: list[tuple[RPCEndpoint, Any, asyncio.Future]]) -> None:
+        batch = [request for request in batch if not request[2].done()]
+        if len(batch) <= 1:
+            for request in batch:
+                await self._send_one(*request)
+            return
+        try:
+            responses = await self.make_batch_request([(method, params) for method, params, _ in batch])
+        except Exception as e:
+            responses = e
+        if not isinstance(responses, list) or len(responses) != len(batch):
+            # Batch is too large for RPC or batches aren't supported at all
+            logger.debug(f"{self} | Batch of {len(batch)} requests was rejected, splitting it. {responses}")
+            middle = len(batch) // 2
+            if isinstance(responses, dict) and not self._is_retryable_error(responses):
+                self.max_batch_size = min(self.max_batch_size, middle)  # RPC answered, so it's most likely its limit
+            await asyncio.gather(self._send_batch(batch[:middle]), self._send_batch(batch[middle:]))
+            return
+        retry = []
+        for request, response in zip(batch, responses):
+            if self._is_retryable_error(response):
+                retry.append(request)
+            else:
+                self._resolve(request[2], response)
+        if retry:  # partially failed, e.g. some requests were rate limited. Failing over one by one
+            await asyncio.gather(*[self._send_one(*request) for request in retry])
+
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        for provider in self.providers.values():
+            if await provider.is_connected(show_traceback):
+                return True
+        return False
+
+    async def disconnect(self) -> None:
+        """HTTP providers are shared, session of each one is closed once all its failover providers disconnected"""
+        if self._disconnected:
+            return
+        self._disconnected = True
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for url in self.providers:
+            await provider_registry.release(self.chain_id, url, self.request_kwargs)
@@ -0,0 +1,179 @@
+import asyncio
+import time
+from typing import Any, Optional
+
+from web3 import AsyncWeb3, WebSocketProvider
+from web3._utils.method_formatters import receipt_formatter
+from web3.datastructures import AttributeDict
+from web3.eth import AsyncEth
+from web3.exceptions import TimeExhausted
+from web3.types import TxReceipt
+
+from web3mt.onchain.evm.models import Chain
+from web3mt.onchain.evm.providers import FailoverHTTPProvider
+from web3mt.utils import logger
+
+__all__ = ["TransactionDropped", "ReceiptTracker"]
+
+
+class TransactionDropped(TimeExhausted):
+    """Tx disappeared from mempool. Subclass of `TimeExhausted`, so code that resends timed out txs resends it too"""
+
+
+class ReceiptTracker:
+    """
+    Waits for receipts of many txs of chain at once: pending hashes are polled with one JSON-RPC batch per new block
+    (new heads come from `ws_rpc` subscription if it's set, else from polling block number). Tx that isn't found on
+    node `drop_checks` times in a row is considered dropped. Receipts are formatted the same way
+    `eth.wait_for_transaction_receipt` does
+    """
+
+    _shared: dict[tuple, "ReceiptTracker"] = {}
+
+    def __init__(
+        self,
+        chain: Chain,
+        request_kwargs: Optional[dict] = None,
+        ws_rpc: str = None,
+        poll_interval: float = 2,
+        batch_size: int = 100,
+        drop_check_interval: float = 30,
+        drop_checks: int = 3,
+    ):
+        self.chain = chain
+        self.w3 = AsyncWeb3(
+            FailoverHTTPProvider(chain.rpcs, request_kwargs=request_kwargs, chain_id=chain.chain_id),
+            modules={"eth": (AsyncEth,)},
+        )
+        self.ws_rpc = ws_rpc
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.drop_check_interval = drop_check_interval
+        self.drop_checks = drop_checks
+        self.block_number: Optional[int] = None
+        self._pending: dict[str, asyncio.Future] = {}
+        self._waiters: dict[str, int] = {}
+        self._not_found: dict[str, int] = {}
+        self._drop_checked_at = time.monotonic()
+        self._new_block = asyncio.Event()
+        self._poller: Optional[asyncio.Task] = None
+        self._heads: Optional[asyncio.Task] = None
+
+    def __repr__(self):
+        return f"ReceiptTracker({self.chain.name}, pending={len(self._pending)})"
+
+    @classmethod
+    def get(cls, chain: Chain, request_kwargs: Optional[dict] = None, ws_rpc: str = None) -> "ReceiptTracker":
+        key = (chain.chain_id, tuple(chain.rpcs), (request_kwargs or {}).get("proxy"), ws_rpc)
+        if key not in cls._shared:
+            cls._shared[key] = cls(chain, request_kwargs, ws_rpc)
+        return cls._shared[key]
+
+    @staticmethod
+    def _format_receipt(receipt: dict) -> TxReceipt:
+        return AttributeDict.recursive(receipt_formatter(receipt))
+
+    async def _batch(self, method: str, tx_hashes: list[str]) -> dict[str, Any]:
+        results = {}
+        for i in range(0, len(tx_hashes), self.batch_size):
+            chunk = tx_hashes[i: i + self.batch_size]
+            responses = await self.w3.provider.make_batch_request([(method, [tx_hash]) for tx_hash in chunk])
+            if isinstance(responses, dict):  # whole batch was rejected
+                raise ValueError(responses.get("error"))
+            for tx_hash, response in zip(chunk, responses):
+                if "error" not in response:
+                    results[tx_hash] = response.get("result")
+        return results
+
+    async def _check_receipts(self) -> None:
+        tx_hashes = [tx_hash for tx_hash, future in self._pending.items() if not future.done()]
+        receipts = await self._batch("eth_getTransactionReceipt", tx_hashes)
+        for tx_hash, receipt in receipts.items():
+            if receipt:
+                self._resolve(tx_hash, receipt=self._format_receipt(receipt))
+        if time.monotonic() - self._drop_checked_at < self.drop_check_interval:
+            return
+        self._drop_checked_at = time.monotonic()
+        waiting = [tx_hash for tx_hash in tx_hashes if tx_hash in self._pending and not receipts.get(tx_hash)]
+        for tx_hash, tx in (await self._batch("eth_getTransactionByHash", waiting)).items():
+            if tx:
+                self._not_found.pop(tx_hash, None)
+                continue
+            self._not_found[tx_hash] = self._not_found.get(tx_hash, 0) + 1
+            if self._not_found[tx_hash] >= self.drop_checks:
+                self._resolve(tx_hash, error=TransactionDropped(f"Transaction {tx_hash} was dropped from mempool"))
+
+    def _resolve(self, tx_hash: str, receipt: dict = None, error: Exception = None) -> None:
+        future = self._pending.pop(tx_hash, None)
+        self._not_found.pop(tx_hash, None)
+        self._waiters.pop(tx_hash, None)
+        if future is None or future.done():
+            return
+        if error:
+            future.set_exception(error)
+        else:
+            future.set_result(receipt)
+
+    async def _watch_heads(self) -> None:
+        while True:
+            try:
+                async with AsyncWeb3(WebSocketProvider(self.ws_rpc)) as w3:
+                    await w3.eth.subscribe("newHeads")
+                    async for _ in w3.socket.process_subscriptions():
+                        self._new_block.set()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"{self} | newHeads subscription failed, resubscribing. {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def _wait_for_new_block(self) -> None:
+        if self.ws_rpc:
+            if self._heads is None or self._heads.done():
+                self._heads = asyncio.create_task(self._watch_heads())
+            try:
+                await asyncio.wait_for(self._new_block.wait(), self.poll_interval * 5)
+            except asyncio.TimeoutError:
+                pass
+            self._new_block.clear()
+            return
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            block_number = await self.w3.eth.block_number
+            if block_number != self.block_number:
+                self.block_number = block_number
+                return
+
+    async def _poll(self) -> None:
+        while self._pending:
+            try:
+                await self._wait_for_new_block()
+                await self._check_receipts()
+            except Exception as e:
+                logger.warning(f"{self} | Couldn't check receipts. {e}")
+        if self._heads:
+            self._heads.cancel()
+            self._heads = None
+
+    async def wait(self, tx_hash: str | bytes, timeout: float = 240) -> TxReceipt:
+        """Returns receipt. Raises `TimeExhausted` on timeout and `TransactionDropped` if tx was dropped"""
+        tx_hash = tx_hash.hex() if isinstance(tx_hash, bytes) else tx_hash
+        tx_hash = tx_hash if tx_hash.startswith("0x") else "0x" + tx_hash
+        tx_hash = tx_hash.lower()
+        if tx_hash not in self._pending:
+            self._pending[tx_hash] = asyncio.get_running_loop().create_future()
+        future = self._pending[tx_hash]
+        self._waiters[tx_hash] = self._waiters.get(tx_hash, 0) + 1
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll())
+        try:
+            # Shielded, so timeout of one waiter doesn't cancel future awaited by others
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            raise TimeExhausted(f"Transaction {tx_hash} is not in the chain after {timeout} seconds")
+        finally:
+            if tx_hash in self._waiters:
+                self._waiters[tx_hash] -= 1
+                if not self._waiters[tx_hash] and self._pending.get(tx_hash) is future:  # nobody waits anymore
+                    future.cancel()
+                    self._resolve(tx_hash)
@@ -0,0 +1,79 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Iterable, Literal, Optional
+
+from eth_account import Account
+
+__all__ = ["TransactionSigner"]
+
+
+def _sign(tx: dict, key: bytes) -> bytes:
+    return bytes(Account.sign_transaction(tx, key).raw_transaction)
+
+
+def _sign_many(batch: list[tuple[dict, bytes]]) -> list[bytes]:
+    return [_sign(tx, key) for tx, key in batch]
+
+
+class TransactionSigner:
+    """
+    Signs transactions off the event loop, so signing of thousands of txs doesn't stall I/O of other coroutines.
+    `mode="process"` signs in `ProcessPoolExecutor` (secp256k1 and RLP are pure Python mostly and hold the GIL),
+    `mode="thread"` is for backends releasing the GIL, `mode="inline"` signs right in the loop. Private keys are
+    passed to worker processes through pipes, so on Windows script must be guarded by `if __name__ == "__main__"`
+    """
+
+    def __init__(
+        self,
+        mode: Literal["process", "thread", "inline"] = "process",
+        max_workers: Optional[int] = None,
+        chunk_size: int = 64,
+    ):
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor: Optional[Executor] = None
+
+    def __repr__(self):
+        return f"TransactionSigner(mode={self.mode}, max_workers={self.max_workers})"
+
+    @property
+    def executor(self) -> Optional[Executor]:
+        if self._executor is None and self.mode != "inline":
+            executor_class = ProcessPoolExecutor if self.mode == "process" else ThreadPoolExecutor
+            self._executor = executor_class(max_workers=self.max_workers)
+        return self._executor
+
+    @staticmethod
+    def _prepare(tx: Any, key: Any) -> tuple[dict, bytes]:
+        """Only plain dict and bytes are sent to workers, `TransactionParameters` holds unpicklable objects"""
+        return tx if isinstance(tx, dict) else tx.to_dict(), bytes(key)
+
+    async def sign(self, tx: Any, key: Any) -> bytes:
+        """Returns raw transaction. `tx` is tx dict or `TransactionParameters`, `key` is private key"""
+        tx, key = self._prepare(tx, key)
+        if self.executor is None:
+            return _sign(tx, key)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, _sign, tx, key)
+
+    async def sign_many(self, txs: Iterable[tuple[Any, Any]]) -> list[bytes]:
+        """Signs (tx, key) pairs in chunks of `chunk_size`, raw transactions are returned in the same order"""
+        batch = [self._prepare(tx, key) for tx, key in txs]
+        chunks = [batch[i: i + self.chunk_size] for i in range(0, len(batch), self.chunk_size)]
+        if self.executor is None:
+            raw_txs = []
+            for chunk in chunks:
+                raw_txs.extend(_sign_many(chunk))
+                await asyncio.sleep(0)  # let other coroutines run between chunks at least
+            return raw_txs
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *[loop.run_in_executor(self.executor, _sign_many, chunk) for chunk in chunks]
+        )
+        return [raw_tx for chunk in results for raw_tx in chunk]
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,78 @@
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from web3mt.utils.cache import JSONCache
+
+__all__ = ["TokenMetadataCache", "token_metadata"]
+
+
+class TokenMetadataCache:
+    """
+    Symbol, name and decimals of tokens keyed by (chain id, address). Metadata of deployed token never changes,
+    so entries are immutable and never expire: once fetched, token is never queried again, even in next runs.
+    Chain id is `int` for EVM chains and name for others ("tron", "aptos")
+    """
+
+    LOCAL_STORAGE = Path(__file__).parent / "token_metadata.json"
+
+    def __init__(self, path: Path | str = LOCAL_STORAGE):
+        self._cache = JSONCache(path)
+
+    def __repr__(self):
+        return f"TokenMetadataCache({self._cache})"
+
+    @staticmethod
+    def _key(chain_id: int | str, address: str) -> str:
+        return f"{chain_id}:{address.lower()}"
+
+    def get(self, chain_id: int | str, address: str) -> Optional[dict[str, Any]]:
+        return self._cache.get(self._key(chain_id, address))
+
+    def contains(self, chain_id: int | str, address: str) -> bool:
+        return self._key(chain_id, address) in self._cache
+
+    def add(
+        self,
+        chain_id: int | str,
+        address: str,
+        symbol: str,
+        decimals: int,
+        name: str = None,
+        save: bool = True,
+    ) -> bool:
+        """Returns False if token is already cached or metadata is incomplete"""
+        key = self._key(chain_id, address)
+        if key in self._cache or symbol is None or decimals is None:
+            return False
+        self._cache.set(key, dict(symbol=symbol, name=name, decimals=int(decimals)))
+        if save:
+            self._cache.save()
+        return True
+
+    def save(self) -> None:
+        self._cache.save()
+
+    def warm(self, tokens: Iterable, chain_id: int | str = None) -> None:
+        """Adds tokens with known metadata (e.g. static token tables) without writing to disk"""
+        for token in tokens:
+            self.add(
+                chain_id if chain_id is not None else token.chain.chain_id,
+                token.address,
+                token.symbol,
+                token.decimals,
+                getattr(token, "name", None),
+                save=False,
+            )
+
+    def apply(self, chain_id: int | str, token) -> bool:
+        """Fills token's metadata from cache. Returns False if token isn't cached"""
+        if not (metadata := self.get(chain_id, token.address)):
+            return False
+        token.symbol = metadata["symbol"]
+        token.decimals = metadata["decimals"]
+        if metadata["name"]:
+            token.name = metadata["name"]
+        return True
+
+
+token_metadata = TokenMetadataCache()
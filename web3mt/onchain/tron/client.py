@@ -11,6 +11,7 @@ from tronpy.exceptions import AddressNotFound
 
 from web3mt.config import DEV, tron_env
 from web3mt.onchain.evm.models import DefaultABIs
+from web3mt.onchain.token_metadata import token_metadata
 from web3mt.onchain.tron.models import Token, tron_symbol, TokenAmount
 from web3mt.utils.logger import logger
 
@@ -18,6 +19,7 @@ from web3mt.onchain.tron.account import TronAccount
 
 tron_rpcs = ["https://api.trongrid.io", tron_env.tron_public_rpc]
 USDT = Token(address="TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t", symbol="USDT")
+token_metadata.warm([USDT], chain_id="tron")
 
 
 class Resource(str, enum.Enum):
@@ -121,13 +123,15 @@ class BaseClient:
     async def get_onchain_token_info(
         self, contract=None, token: Token = None
     ) -> Token | None:
+        token = token or Token(address=contract.address)
         if token.symbol == tron_symbol:
             logger.warning(f"{self.log_info} | Can't get native token info")
             return None
+        if token_metadata.apply("tron", token):
+            return token
         contract = contract or AsyncContract(
             token.address, abi=DefaultABIs.token, client=self.w3
         )
-        token = token or Token(address=contract.address)
         token.decimals, token.name, token.symbol = await asyncio.gather(
             *[
                 contract.functions.decimals(),
@@ -135,7 +139,7 @@ class BaseClient:
                 contract.functions.symbol(),
             ]
         )
-        # FIXME: use multicall
+        token_metadata.add("tron", token.address, token.symbol, token.decimals, token.name)
         return token
 
     async def balance_of(
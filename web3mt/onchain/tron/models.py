@@ -56,11 +56,11 @@ class Token(Coin):
 
     @property
     def price(self) -> Decimal | None:
-        return self._prices.get(self.get_unwrapped_symbol())
+        return self._get_price(self.get_unwrapped_symbol())
 
     @price.setter
     def price(self, value: int | float | str | Decimal):
-        self._prices[self.get_unwrapped_symbol()] = Decimal(str(value))
+        self._set_price(self.get_unwrapped_symbol(), value)
 
     def get_unwrapped_symbol(self) -> str:
         symbol = self.symbol
@@ -69,6 +69,9 @@ class Token(Coin):
         return symbol
 
     async def get_token_info(self) -> 'Token':
+        from web3mt.onchain.token_metadata import token_metadata
+        if self.address and token_metadata.apply('tron', self):
+            return self
         from web3mt.onchain.tron.client import BaseClient
         return await BaseClient().get_onchain_token_info(token=self)
 
@@ -10,3 +10,5 @@ from .http_sessions import (
 from .imap import IMAPClient
 from .format_number import format_number
 from .file_manager import FileManager
+from .session_registry import session_registry
+from .proxy_pool import ProxyPool
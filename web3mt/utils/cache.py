@@ -0,0 +1,60 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from web3mt.utils import logger
+
+__all__ = ["JSONCache"]
+
+
+class JSONCache:
+    """Key-value cache with TTL persisted in a JSON file. `ttl=None` means entries never expire"""
+
+    def __init__(self, path: Path | str, ttl: Optional[float] = None):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._data: dict[str, dict] = {}
+        self.load()
+
+    def __repr__(self):
+        return f"JSONCache({self.path.name}, entries={len(self._data)})"
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                self._data = json.load(file)
+        except FileNotFoundError:
+            self._data = {}
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"{self} | Couldn't load cache, starting from scratch. {e}")
+            self._data = {}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self._data, file)
+        os.replace(tmp_path, self.path)  # atomic, so interrupted run doesn't corrupt the cache
+
+    def is_fresh(self, key: str) -> bool:
+        entry = self._data.get(key)
+        return bool(entry) and (self.ttl is None or time.time() - entry["updated_at"] < self.ttl)
+
+    def get(self, key: str, default: Any = None, allow_stale: bool = False) -> Any:
+        if key in self._data and (allow_stale or self.is_fresh(key)):
+            return self._data[key]["value"]
+        return default
+
+    def set(self, key: str, value: Any) -> None:
+        self._data[key] = {"value": value, "updated_at": time.time()}
+
+    def keys(self) -> list[str]:
+        return list(self._data)
+
+    def stale_keys(self, keys: Iterable[str]) -> list[str]:
+        return [key for key in keys if not self.is_fresh(key)]
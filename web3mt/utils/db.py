@@ -1,19 +1,36 @@
 import asyncio
 
+from better_proxy import Proxy
 from web3db.core import create_db_instance, DBHelper
 
 from web3mt.offchain.webshare import Webshare
 from web3mt.utils import logger
+from web3mt.utils.proxy_checker import ProxyChecker
 
 
-async def update_shared_proxies(db_helper: DBHelper):
-    ws_proxies = set(await Webshare().proxy_list())
+def _normalize(proxy: str) -> str:
+    """The same proxy can be written in different formats, `ProxyChecker` keys its results by URL form"""
+    return Proxy.from_str(proxy).as_url
+
+
+async def update_shared_proxies(db_helper: DBHelper, checker: ProxyChecker = None):
+    ws_proxies = {_normalize(proxy): proxy for proxy in await Webshare().proxy_list()}
     profiles = await db_helper.get_profiles_with_shared_proxies()
-    used_proxies = {profile.proxy.proxy_string for profile in profiles}
-    new_proxies = ws_proxies.difference(used_proxies)
+    used_proxies = {_normalize(profile.proxy.proxy_string): profile.proxy.proxy_string for profile in profiles}
+    report = await (checker or ProxyChecker()).check_all(set(ws_proxies.values()) | set(used_proxies.values()))
+    alive = {_normalize(result.proxy) for result in report.alive}
+    # Fastest unused proxies first
+    new_proxies = [
+        ws_proxies[key] for result in report.sorted()
+        if result.ok and (key := _normalize(result.proxy)) in ws_proxies and key not in used_proxies
+    ]
     for profile in profiles:
-        if profile.proxy.proxy_string not in ws_proxies:
-            new_proxy = new_proxies.pop()
+        key = _normalize(profile.proxy.proxy_string)
+        if key not in ws_proxies or key not in alive:
+            if not new_proxies:
+                logger.warning(f'{profile.id} | No working proxies left to replace {profile.proxy.proxy_string}')
+                break
+            new_proxy = new_proxies.pop(0)
             logger.info(f'{profile.id} | Changing proxy {profile.proxy.proxy_string} to {new_proxy}')
             profile.proxy.proxy_string = new_proxy
     await db_helper.add_record(profiles)
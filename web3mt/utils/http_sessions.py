@@ -1,20 +1,26 @@
 import asyncio
+import copy
+import random
+import time
 from abc import ABC
 from curses import wrapper
 from json import JSONDecodeError
-from typing import Callable, Any, TYPE_CHECKING, Optional
-from urllib.parse import urlencode
+from typing import Awaitable, Callable, Any, TYPE_CHECKING, Optional, Hashable
+from urllib.parse import urlencode, urlsplit
 
 from pydantic import BaseModel
 from better_proxy import Proxy
 from curl_cffi import CurlMime
 from curl_cffi.requests import AsyncSession, RequestsError, Response, BrowserType
-from httpx import AsyncClient, ReadTimeout, ProxyError
+from httpx import AsyncClient, AsyncHTTPTransport, ReadTimeout, ProxyError
 
 if TYPE_CHECKING:
     from web3db.models import Profile
 from web3mt.config import DEV, env
 from web3mt.utils import logger, sleep, set_windows_event_loop_policy
+from web3mt.utils.proxy_pool import ProxyPool
+from web3mt.utils.retry import RetryPolicy, RetryAction
+from web3mt.utils.session_registry import SharedAsyncCurl, SharedTransport, session_registry
 
 set_windows_event_loop_policy()
 
@@ -34,6 +40,9 @@ class SessionConfig:
             requests_echo: bool = DEV,
             retry_count: int = env.retry_count,
             try_with_default_proxy: bool = False,
+            retry_policy: Optional[RetryPolicy] = None,
+            proxy_pool: Optional[ProxyPool] = None,
+            sticky_key: Optional[Hashable] = None,
     ):
         self.log_info = log_info
         self.sleep_after_request = sleep_after_request
@@ -42,6 +51,9 @@ class SessionConfig:
         self.requests_echo = requests_echo
         self.retry_count = retry_count
         self.try_with_default_proxy = try_with_default_proxy
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.proxy_pool = proxy_pool
+        self.sticky_key = sticky_key  # sticky pool pins proxy only to sessions with key, e.g. profile id
 
     def __repr__(self):
         return (
@@ -53,6 +65,7 @@ class SessionConfig:
 
 class BaseAsyncSession(ABC):
     _google_chrome_stable_version = 131
+    _locations: dict[str, tuple[str, str]] = {}  # host -> (country name, country code)
     DEFAULT_HEADERS = {
         "Accept": "*/*",
         "Accept-Language": "en-US,en",
@@ -77,6 +90,13 @@ class BaseAsyncSession(ABC):
         self.config = config or SessionConfig()
         self._headers = self.DEFAULT_HEADERS | kwargs.pop("headers", {})
         self._proxy: Optional[Proxy] = Proxy.from_str(proxy=proxy) if proxy else None
+        if (
+                self._proxy
+                and self.config.proxy_pool
+                and self.config.proxy_pool.sticky
+                and self.config.sticky_key is not None
+        ):
+            self.config.proxy_pool.pin(self.config.sticky_key, self._proxy)
 
     def __str__(self):
         return self.config.log_info
@@ -98,6 +118,28 @@ class BaseAsyncSession(ABC):
     async def make_request(self, *a, **kw):
         raise NotImplementedError("Must be implemented by subclasses")
 
+    def select_proxy(self) -> None:
+        """Takes the healthiest (or sticky) proxy from `config.proxy_pool`"""
+        proxy = self.config.proxy_pool.pick(self.config.sticky_key)
+        if proxy and proxy.as_url != self.proxy:
+            self.proxy = proxy
+
+    def rotate_proxy(self) -> bool:
+        if pool := self.config.proxy_pool:
+            proxy = pool.pick(self.config.sticky_key, exclude=[self.proxy])
+            if proxy and proxy.as_url != self.proxy:
+                self.proxy = proxy
+                return True
+            return False
+        if (
+                self.config.try_with_default_proxy
+                and env.default_proxy
+                and self.proxy != Proxy.from_str(env.default_proxy).as_url
+        ):
+            self.proxy = env.default_proxy
+            return True
+        return False
+
     async def head(self, *a, **kw):
         return await self.make_request("HEAD", *a, **kw)
 
@@ -136,16 +178,27 @@ class BaseAsyncSession(ABC):
             params = kwargs.get("params", {}) or {}
             params_str = urlencode(params)
             body = kwargs.get("body", {}) or kwargs.get("json", {}) or {}
-            retry_delay = kwargs.pop("retry_delay", self.config.sleep_range)
+            retry_delay = kwargs.pop("retry_delay", None)
+            before_attempt: Optional[Callable[[], Awaitable]] = kwargs.pop("before_attempt", None)
             retry_count = kwargs.pop("retry_count", self.config.retry_count)
+            retry_policy: RetryPolicy = kwargs.pop("retry_policy", self.config.retry_policy)
+            host = urlsplit(str(url)).hostname or urlsplit(str(getattr(self, "base_url", ""))).hostname
             request_info = f'{method} {url} params="{params_str}" body="{body}"'
             if self.config.requests_echo:
                 logger.info(f"{self.config.log_info} | {request_info}")
             response_data = None
+            proxy_pool: Optional[ProxyPool] = self.config.proxy_pool
+            if proxy_pool:
+                self.select_proxy()
             for i in range(retry_count):
+                if before_attempt:  # e.g. rate limiter, so every retry is accounted for
+                    await before_attempt()
+                proxy, started_at = self.proxy, time.monotonic()
                 try:
                     response = None
                     response, response_data = await func(self, *args, **kwargs)
+                    if proxy_pool and proxy:
+                        proxy_pool.report_success(proxy, time.monotonic() - started_at)
                     if not kwargs.get("follow_redirects") or kwargs.get(
                             "allow_redirects"
                     ):
@@ -158,6 +211,7 @@ class BaseAsyncSession(ABC):
                         )
                     return response, response_data
                 except Exception as e:
+                    response = response if response is not None else getattr(e, "response", None)
                     exception = await self.parse_exception(
                         i=i,
                         request_info=request_info,
@@ -165,19 +219,45 @@ class BaseAsyncSession(ABC):
                         response_data=response_data,
                         exception=e,
                     )
+                    action = retry_policy.classify(e, response)
+                    # Proxy is to blame only if there is no response from host
+                    proxy_failed = action == RetryAction.ROTATE_PROXY or response is None
+                    if proxy_pool and proxy:
+                        if proxy_failed:
+                            proxy_pool.report_failure(proxy)
+                        else:
+                            proxy_pool.report_success(proxy, time.monotonic() - started_at)
+                    if action == RetryAction.FATAL:
+                        raise RequestsError(exception.message, response=response) from e
+                    if (
+                            action == RetryAction.ROTATE_PROXY or (proxy_pool and proxy_failed)
+                    ) and self.rotate_proxy():
+                        exception.message += "\nChanged proxy"
+                    if not retry_policy.consume_budget(host):
+                        raise RequestsError(
+                            f"{exception.message}\nRetry budget for {host} is exhausted", response=response
+                        ) from e
+                    if retry_delay is None:
+                        delay = retry_policy.delay(i, action, response)
+                    elif isinstance(retry_delay, (tuple, list)):
+                        delay = random.uniform(*retry_delay)
+                    else:
+                        delay = retry_delay
+                if i + 1 == retry_count:
+                    continue
                 logger.warning(
-                    f"{self.config.log_info} | {exception.message}. Retrying {i + 1} after {retry_delay} seconds"
+                    f"{self.config.log_info} | {exception.message}. Retrying {i + 1} after {delay:.2f} seconds"
                 )
                 await sleep(
-                    *retry_delay,
+                    delay,
                     log_info=self.config.log_info,
                     echo=self.config.sleep_echo,
                 )
             else:
-                error_message = f"Tried to retry {self.config.retry_count} times"
+                error_message = f"Tried to retry {retry_count} times"
                 if self.config.requests_echo:
                     logger.error(f"{self.config.log_info} | {error_message=}")
-                raise RequestsError(error_message)
+                raise RequestsError(error_message, response=response)
 
         return wrapper
 
@@ -216,19 +296,27 @@ class BaseAsyncSession(ABC):
             self, host: str = None, proxy: str = env.default_proxy
     ) -> tuple[str, str]:
         host = host or Proxy.from_str(self.proxy or proxy).host
-        _, data = await self.get("https://api.iplocation.net/", params=dict(ip=host))
-        logger.debug(
-            f"{self.config.log_info} | Proxy {host} in {data['country_code2']}/{data['country_name']}"
-        )
-        return data["country_name"], data["country_code2"]
+        if host not in BaseAsyncSession._locations:
+            _, data = await self.get("https://api.iplocation.net/", params=dict(ip=host))
+            BaseAsyncSession._locations[host] = data["country_name"], data["country_code2"]
+        country_name, country_code = BaseAsyncSession._locations[host]
+        logger.debug(f"{self.config.log_info} | Proxy {host} in {country_code}/{country_name}")
+        return country_name, country_code
 
 
 class curl_cffiAsyncSession(BaseAsyncSession, AsyncSession):
-    def __init__(self, **kwargs) -> None:
+    def __init__(self, pooled: bool = False, **kwargs) -> None:
+        """
+        :param pooled: use connection pool from `session_registry` shared by sessions with the same proxy and
+        impersonation instead of own one
+        """
         BaseAsyncSession.__init__(self, **kwargs)
         impersonate = kwargs.pop("impersonate", BrowserType.chrome120)
         kwargs.pop("config", None)
         kwargs.pop("proxy", None)
+        if pooled:
+            kwargs.setdefault("max_clients", session_registry.max_connections_per_pool)
+            kwargs["async_curl"] = SharedAsyncCurl(session_registry, ("curl_cffi", self.proxy, str(impersonate)))
         AsyncSession.__init__(
             self,
             proxy=self.proxy,
@@ -250,7 +338,7 @@ class curl_cffiAsyncSession(BaseAsyncSession, AsyncSession):
     @BaseAsyncSession.proxy.setter
     def proxy(self, value: str):
         super(curl_cffiAsyncSession, curl_cffiAsyncSession).proxy.fset(self, value)
-        self.proxies["all"] = self.proxy.as_url
+        self.proxies["all"] = self.proxy
 
     async def parse_exception(
             self,
@@ -264,14 +352,7 @@ class curl_cffiAsyncSession(BaseAsyncSession, AsyncSession):
         message = f"{request_info=} {exception=}" + (
             f"\n{response_data=}" if response_data else ""
         )
-        if exception.code in (28, 55, 56):
-            pass
-        elif exception.code == 7 and self.config.try_with_default_proxy:
-            self.proxy = env.default_proxy
-            message += "\nChanged proxy"
-        elif not response or 600 >= response.status_code >= 400:
-            raise RequestsError(message)
-        return HTTPException(message=message)
+        return HTTPException(message=message, code=str(getattr(exception, "code", "")))
 
     @BaseAsyncSession.retry_request
     async def make_request(
@@ -310,16 +391,31 @@ class curl_cffiAsyncSession(BaseAsyncSession, AsyncSession):
 
 
 class httpxAsyncClient(BaseAsyncSession, AsyncClient):
+    # Client arguments that configure transport, clients with any of them can't share a pool
+    TRANSPORT_KWARGS = {"verify", "cert", "http1", "http2", "limits", "transport", "mounts"}
+
     def __init__(
             self,
+            pooled: bool = False,
             **kwargs,
     ) -> None:
+        """
+        :param pooled: use transport from `session_registry` shared by clients with the same proxy instead of own one.
+        Only pooled client can change proxy, so it's always pooled with `config.proxy_pool`
+        """
         BaseAsyncSession.__init__(self, **kwargs)
         kwargs.pop("config", None)
         kwargs.pop("proxy", None)
+        proxy = self.proxy
+        self._shared_transport: Optional[SharedTransport] = None
+        if (pooled or self.config.proxy_pool) and not self.TRANSPORT_KWARGS.intersection(kwargs):
+            self._shared_transport = kwargs["transport"] = SharedTransport(
+                session_registry, ("httpx", proxy), self._transport_factory(proxy)
+            )
+            proxy = None  # proxy is already set in transport
         AsyncClient.__init__(
             self,
-            proxy=self.proxy,
+            proxy=proxy,
             headers=self._headers,
             **kwargs,
         )
@@ -335,13 +431,31 @@ class httpxAsyncClient(BaseAsyncSession, AsyncClient):
         message = f"{request_info=} {exception=}" + (
             f"\n{response_data=}" if response_data else ""
         )
-        match exception: # TODO: possible exceptions ProxyError('407 Proxy Authentication Required')
+        match exception:
             case ReadTimeout():
                 message += "\nRequest timed out"
             case ProxyError():
-                message += "\nProxy error. " + ' '.join(exception.args)
+                message += "\nProxy error. " + ' '.join(map(str, exception.args))
         return HTTPException(message=message)
 
+    @staticmethod
+    def _transport_factory(proxy: Optional[str]) -> Callable[[], AsyncHTTPTransport]:
+        return lambda: AsyncHTTPTransport(proxy=proxy, limits=session_registry.limits)
+
+    @BaseAsyncSession.proxy.setter
+    def proxy(self, value: str):
+        super(httpxAsyncClient, httpxAsyncClient).proxy.fset(self, value)
+        if self._shared_transport:
+            self._shared_transport.switch(("httpx", self.proxy), self._transport_factory(self.proxy))
+
+    def select_proxy(self) -> None:
+        if self._shared_transport:
+            super().select_proxy()
+
+    def rotate_proxy(self) -> bool:
+        # httpx binds proxy to the transport when client is created, only shared transport can be switched
+        return bool(self._shared_transport) and super().rotate_proxy()
+
     @BaseAsyncSession.retry_request
     async def make_request(
             self,
@@ -375,41 +489,53 @@ class httpxAsyncClient(BaseAsyncSession, AsyncClient):
         return response, data
 
 
+def _profile_config(profile: "Profile", config: SessionConfig = None) -> SessionConfig:
+    """Copy of config for profile session, config is usually shared by all profiles, e.g. to pass one proxy pool"""
+    config = copy.copy(config) if config else SessionConfig()
+    config.log_info = str(profile.id)
+    if config.sticky_key is None:
+        config.sticky_key = profile.id
+    return config
+
+
 class Profilecurl_cffiAsyncSession(curl_cffiAsyncSession):
     def __init__(
-            self, profile: "Profile", config: SessionConfig = None, **kwargs
+            self, profile: "Profile", config: SessionConfig = None, pooled: bool = False, **kwargs
     ) -> None:
-        config = config or SessionConfig()
-        config.log_info = str(profile.id)
+        config = _profile_config(profile, config)
         super().__init__(
             proxy=profile.proxy.proxy_string,
             config=config,
+            pooled=pooled,
             **kwargs,
         )
 
 
 class ProfilehttpxAsyncClient(httpxAsyncClient):
     def __init__(
-            self, profile: "Profile", config: SessionConfig = None, **kwargs
+            self, profile: "Profile", config: SessionConfig = None, pooled: bool = False, **kwargs
     ) -> None:
         self.profile = profile
-        config = config or SessionConfig()
-        config.log_info = str(profile.id)
+        config = _profile_config(profile, config)
         super().__init__(
             proxy=profile.proxy.proxy_string,
             config=config,
+            pooled=pooled,
             **kwargs,
         )
 
 
 async def check_proxies():
     from web3db.core import create_db_instance
+    from web3db.models import Profile
+    from web3mt.utils.proxy_checker import ProxyChecker
 
     db = create_db_instance()
     profiles = await db.get_all_from_table(Profile)
-    await asyncio.gather(
-        *[Profilecurl_cffiAsyncSession(profile).check_proxy() for profile in profiles]
-    )
+    report = await ProxyChecker().check_all({profile.proxy.proxy_string for profile in profiles})
+    for result in report.dead:
+        logger.warning(f"Proxy {result.proxy} is not working. {result.error}")
+    return report
 
 
 async def get_location(ip: str = env.default_proxy):
@@ -0,0 +1,111 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, Optional
+
+from eth_account import Account
+from eth_account.signers.local import LocalAccount
+from web3db.utils import decrypt
+
+from web3mt.utils import logger
+
+__all__ = ["PGP_HEADER", "is_encrypted", "KeyLoader", "key_loader"]
+
+PGP_HEADER = "-----BEGIN PGP MESSAGE-----"
+
+
+def is_encrypted(private: str) -> bool:
+    return private.startswith(PGP_HEADER)
+
+
+def _decrypt_many(batch: list[str], password: str) -> list[Optional[str]]:
+    decrypted = []
+    for private in batch:
+        try:
+            decrypted.append(decrypt(private, password))
+        except Exception:
+            decrypted.append(None)
+    return decrypted
+
+
+class KeyLoader:
+    """
+    Decrypted private keys and accounts made of them, cached in memory for the process lifetime and never written to
+    disk. Key is decrypted on first use, `preload` decrypts many keys at once across a process pool, so symmetric PGP
+    KDF of thousands of profiles doesn't run one by one on the event loop
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_size: int = 16):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._keys: dict[tuple[str, str], str] = {}  # (stored key, password): private key
+        self._accounts: dict[tuple[str, str], Any] = {}  # (chain type, private key): account
+
+    def __repr__(self):
+        return f"KeyLoader(keys={len(self._keys)})"
+
+    def private_key(self, private: str, password: str) -> str:
+        if not is_encrypted(private):
+            return private
+        if (private, password) not in self._keys:
+            self._keys[(private, password)] = decrypt(private, password)
+        return self._keys[(private, password)]
+
+    def _account(self, chain_type: str, private: str, password: str, factory) -> Any:
+        private_key = self.private_key(private, password)
+        if (chain_type, private_key) not in self._accounts:
+            self._accounts[(chain_type, private_key)] = factory(private_key)
+        return self._accounts[(chain_type, private_key)]
+
+    def evm_account(self, private: str, password: str) -> LocalAccount:
+        return self._account("evm", private, password, Account.from_key)
+
+    def aptos_account(self, private: str, password: str):
+        from aptos_sdk.account import Account as AptosAccount
+
+        return self._account("aptos", private, password, AptosAccount.load_key)
+
+    async def preload(self, privates: Iterable[str], password: str) -> int:
+        """Decrypts keys missing in cache across a process pool. Returns number of decrypted keys"""
+        missing = list(
+            dict.fromkeys(
+                private for private in privates
+                if private and is_encrypted(private) and (private, password) not in self._keys
+            )
+        )
+        if not missing:
+            return 0
+        chunk_size = max(1, min(self.chunk_size, -(-len(missing) // self.max_workers)))  # keep every worker busy
+        chunks = [missing[i: i + chunk_size] for i in range(0, len(missing), chunk_size)]
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+            results = await asyncio.gather(
+                *[loop.run_in_executor(executor, _decrypt_many, chunk, password) for chunk in chunks]
+            )
+        decrypted = 0
+        for chunk, private_keys in zip(chunks, results):
+            for private, private_key in zip(chunk, private_keys):
+                if private_key is None:
+                    continue  # wrong password or broken key, it fails with proper error on first use
+                self._keys[(private, password)] = private_key
+                decrypted += 1
+        logger.debug(f"{self} | Decrypted {decrypted}/{len(missing)} keys")
+        return decrypted
+
+    async def preload_profiles(
+        self, profiles: Iterable, password: str, evm: bool = True, aptos: bool = False
+    ) -> int:
+        profiles = list(profiles)
+        privates = []
+        if evm:
+            privates += [profile.evm_private for profile in profiles]
+        if aptos:
+            privates += [profile.aptos_private for profile in profiles]
+        return await self.preload(privates, password)
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._accounts.clear()
+
+
+key_loader = KeyLoader()
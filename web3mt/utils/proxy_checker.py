@@ -0,0 +1,188 @@
+import asyncio
+import csv
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+from better_proxy import Proxy
+from pydantic import BaseModel
+
+from web3mt.utils import logger
+from web3mt.utils.cache import JSONCache
+from web3mt.utils.http_sessions import SessionConfig, httpxAsyncClient
+
+__all__ = ["ProxyCheckResult", "ProxyReport", "ProxyChecker"]
+
+
+class ProxyCheckResult(BaseModel):
+    proxy: str
+    ok: bool
+    ip: Optional[str] = None
+    connect_ms: Optional[float] = None
+    tls_ms: Optional[float] = None
+    first_byte_ms: Optional[float] = None
+    total_ms: Optional[float] = None
+    country: Optional[str] = None
+    country_code: Optional[str] = None
+    error: Optional[str] = None
+    checked_at: float = 0
+
+
+class ProxyReport:
+    def __init__(self, results: Iterable[ProxyCheckResult]):
+        self.results = list(results)
+
+    def __repr__(self):
+        return f"ProxyReport(alive={len(self.alive)}, dead={len(self.dead)})"
+
+    def __getitem__(self, proxy: str) -> Optional[ProxyCheckResult]:
+        return next((result for result in self.results if result.proxy == proxy), None)
+
+    @property
+    def alive(self) -> list[ProxyCheckResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def dead(self) -> list[ProxyCheckResult]:
+        return [result for result in self.results if not result.ok]
+
+    def sorted(self, by: str = "first_byte_ms", reverse: bool = False) -> list[ProxyCheckResult]:
+        """Alive proxies first, then by `by` field. Missing values go last"""
+        return sorted(
+            self.results,
+            key=lambda result: (
+                not result.ok,
+                getattr(result, by) is None,
+                getattr(result, by) or 0,
+            ),
+            reverse=reverse,
+        )
+
+    def write_csv(self, path: Path | str, by: str = "first_byte_ms") -> None:
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=list(ProxyCheckResult.model_fields), delimiter=";")
+            writer.writeheader()
+            writer.writerows(result.model_dump() for result in self.sorted(by))
+
+
+class ProxyChecker:
+    """
+    Bulk proxy validation. Measures TCP connect, TLS and first byte time through every proxy with bounded concurrency,
+    results are cached for `ttl` seconds, so reruns only probe stale proxies. Exit IPs are geolocated in batches,
+    locations are cached by IP
+    """
+
+    URL = "https://icanhazip.com"
+    GEOLOCATION_URL = "http://ip-api.com/batch"
+    GEOLOCATION_BATCH_SIZE = 100
+    LOCAL_STORAGE = Path(__file__).parent / "proxy_checks.json"
+    GEOLOCATION_STORAGE = Path(__file__).parent / "ip_locations.json"
+
+    def __init__(
+        self,
+        concurrency: int = 50,
+        timeout: float = 15,
+        ttl: float = 3600,
+        geolocation_ttl: float = 7 * 24 * 3600,
+        cache_path: Path | str = LOCAL_STORAGE,
+        geolocation_cache_path: Path | str = GEOLOCATION_STORAGE,
+    ):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.cache = JSONCache(cache_path, ttl)
+        self.geolocation_cache = JSONCache(geolocation_cache_path, geolocation_ttl)
+
+    def __repr__(self):
+        return "ProxyChecker"
+
+    @staticmethod
+    def _key(proxy: str | Proxy) -> str:
+        return (proxy if isinstance(proxy, Proxy) else Proxy.from_str(proxy)).as_url
+
+    async def check(self, proxy: str) -> ProxyCheckResult:
+        events: dict[str, float] = {}
+
+        async def trace(event_name: str, info: dict):
+            # Last event wins: through http proxy CONNECT response comes before the response of the host
+            events[event_name.split(".", 1)[-1]] = time.perf_counter()
+
+        def elapsed(started: str, completed: str) -> Optional[float]:
+            if started in events and completed in events:
+                return round((events[completed] - events[started]) * 1000, 1)
+            return None
+
+        started_at = events["request.started"] = time.perf_counter()
+        try:
+            async with httpxAsyncClient(
+                proxy=proxy, config=SessionConfig(log_info=str(self), requests_echo=False)
+            ) as session:
+                response = await session.request(
+                    "GET", self.URL, timeout=self.timeout, extensions={"trace": trace}
+                )
+                response.raise_for_status()
+            return ProxyCheckResult(
+                proxy=proxy,
+                ok=True,
+                ip=response.text.strip(),
+                connect_ms=elapsed("connect_tcp.started", "connect_tcp.complete"),
+                tls_ms=elapsed("start_tls.started", "start_tls.complete"),
+                first_byte_ms=elapsed("request.started", "receive_response_headers.complete"),
+                total_ms=round((time.perf_counter() - started_at) * 1000, 1),
+                checked_at=time.time(),
+            )
+        except Exception as e:
+            return ProxyCheckResult(
+                proxy=proxy, ok=False, error=f"{type(e).__name__}: {e}", checked_at=time.time()
+            )
+
+    async def geolocate(self, ips: Iterable[str]) -> dict[str, tuple[str, str]]:
+        """Returns {ip: (country name, country code)}. Only IPs missing in cache are requested"""
+        ips = set(ips)
+        missing = self.geolocation_cache.stale_keys(ips)
+        if not missing:
+            return {ip: tuple(self.geolocation_cache.get(ip)) for ip in ips}
+        async with httpxAsyncClient(config=SessionConfig(log_info=str(self), requests_echo=False)) as session:
+            for i in range(0, len(missing), self.GEOLOCATION_BATCH_SIZE):
+                batch = missing[i: i + self.GEOLOCATION_BATCH_SIZE]
+                try:
+                    _, data = await session.post(
+                        self.GEOLOCATION_URL,
+                        json=[{"query": ip, "fields": "status,country,countryCode,query"} for ip in batch],
+                    )
+                except Exception as e:
+                    logger.warning(f"{self} | Couldn't geolocate {len(batch)} IPs. {e}")
+                    continue
+                for location in data:
+                    if location.get("status") == "success":
+                        self.geolocation_cache.set(
+                            location["query"], [location["country"], location["countryCode"]]
+                        )
+        self.geolocation_cache.save()
+        return {
+            ip: tuple(location)
+            for ip in ips
+            if (location := self.geolocation_cache.get(ip, allow_stale=True))
+        }
+
+    async def check_all(self, proxies: Iterable[str], force: bool = False) -> ProxyReport:
+        proxies = {self._key(proxy): proxy for proxy in proxies}
+        stale = list(proxies) if force else self.cache.stale_keys(proxies)
+        logger.info(f"{self} | {len(proxies) - len(stale)} proxies are cached, checking {len(stale)}")
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def check(key: str):
+            async with semaphore:
+                result = await self.check(proxies[key])
+            self.cache.set(key, result.model_dump())
+
+        await asyncio.gather(*[check(key) for key in stale])
+        results = [ProxyCheckResult(**self.cache.get(key, allow_stale=True)) for key in proxies]
+        locations = await self.geolocate(result.ip for result in results if result.ip)
+        for result in results:
+            if result.ip in locations and result.country is None:
+                result.country, result.country_code = locations[result.ip]
+                self.cache.set(self._key(result.proxy), result.model_dump())
+        self.cache.save()
+        report = ProxyReport(results)
+        logger.info(f"{self} | {report}")
+        return report
@@ -0,0 +1,233 @@
+import asyncio
+import random
+import time
+from typing import Hashable, Iterable, Optional, TYPE_CHECKING
+
+from better_proxy import Proxy
+
+from web3mt.utils import logger
+
+if TYPE_CHECKING:
+    from web3mt.offchain.webshare import Webshare
+
+__all__ = ["ProxyStats", "ProxyPool"]
+
+
+class ProxyStats:
+    def __init__(self, proxy: Proxy):
+        self.proxy = proxy
+        self.latency_ewma: Optional[float] = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.consecutive_failures = 0
+        self.last_success: Optional[float] = None
+        self.last_used: Optional[float] = None
+        self.quarantined_until = 0.0
+        self.quarantines = 0
+
+    def __repr__(self):
+        latency = f"{self.latency_ewma:.2f}s" if self.latency_ewma is not None else None
+        return (
+            f"ProxyStats({self.proxy.host}:{self.proxy.port}, latency={latency}, "
+            f"error_rate={self.error_rate:.2f}, quarantined={self.is_quarantined})"
+        )
+
+    @property
+    def is_quarantined(self) -> bool:
+        return time.monotonic() < self.quarantined_until
+
+    def score(self, error_penalty: float) -> float:
+        """Lower is better. Proxies without measured latency are tried first"""
+        return (self.latency_ewma or 0) * (1 + error_penalty * self.error_rate)
+
+
+class ProxyPool:
+    """
+    Picks the healthiest proxy by latency EWMA and error rate. Proxy that failed `failure_threshold` times in a row
+    is quarantined with exponential cool-down and probed again in background after it. With `sticky=True` every key
+    (e.g. profile id) keeps its own proxy and gets the best one only while its proxy is quarantined
+    """
+
+    def __init__(
+        self,
+        proxies: Iterable[str | Proxy] = (),
+        sticky: bool = False,
+        ewma_alpha: float = 0.3,
+        error_penalty: float = 4,
+        failure_threshold: int = 3,
+        base_cooldown: float = 30,
+        max_cooldown: float = 1800,
+        probe_interval: float = 60,
+        probe_concurrency: int = 20,
+    ):
+        self.sticky = sticky
+        self.ewma_alpha = ewma_alpha
+        self.error_penalty = error_penalty
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.probe_interval = probe_interval
+        self.probe_concurrency = probe_concurrency
+        self._stats: dict[str, ProxyStats] = {}
+        self._sticky: dict[Hashable, str] = {}
+        self._probing_task: Optional[asyncio.Task] = None
+        self.add(proxies)
+
+    def __repr__(self):
+        return f"ProxyPool(proxies={len(self._stats)}, healthy={len(self.healthy)})"
+
+    def __len__(self):
+        return len(self._stats)
+
+    @property
+    def stats(self) -> list[ProxyStats]:
+        return list(self._stats.values())
+
+    @property
+    def healthy(self) -> list[ProxyStats]:
+        return [stats for stats in self._stats.values() if not stats.is_quarantined]
+
+    @staticmethod
+    def _url(proxy: str | Proxy) -> str:
+        return (proxy if isinstance(proxy, Proxy) else Proxy.from_str(proxy)).as_url
+
+    def add(self, proxies: Iterable[str | Proxy]) -> None:
+        for proxy in proxies:
+            proxy = proxy if isinstance(proxy, Proxy) else Proxy.from_str(proxy)
+            self._stats.setdefault(proxy.as_url, ProxyStats(proxy))
+
+    def remove(self, proxies: Iterable[str | Proxy]) -> None:
+        for proxy in proxies:
+            self._stats.pop(self._url(proxy), None)
+
+    def pin(self, key: Hashable, proxy: str | Proxy) -> None:
+        self.add([proxy])
+        self._sticky[key] = self._url(proxy)
+
+    async def update_from_webshare(self, webshare: "Webshare" = None) -> None:
+        """Syncs pool with Webshare proxy list: new proxies are added, removed ones are dropped"""
+        from web3mt.offchain.webshare import Webshare
+
+        proxies = {self._url(proxy) for proxy in await (webshare or Webshare()).proxy_list()}
+        self.remove([url for url in self._stats if url not in proxies])
+        self.add(proxies)
+        logger.info(f"{self} | Updated from Webshare")
+
+    def pick(self, key: Hashable = None, exclude: Iterable[str | Proxy] = ()) -> Optional[Proxy]:
+        if not self._stats:
+            return None
+        exclude = {self._url(proxy) for proxy in exclude if proxy}
+        if key is not None and self.sticky:
+            url = self._sticky.get(key)
+            if url in self._stats and url not in exclude and not self._stats[url].is_quarantined:
+                return self._stats[url].proxy
+        candidates = [stats for stats in self.healthy if stats.proxy.as_url not in exclude]
+        if not candidates:
+            # Everything is quarantined, the one that will be released first is the best bet
+            candidates = [stats for stats in self._stats.values() if stats.proxy.as_url not in exclude]
+            if not candidates:
+                return None
+            best = min(candidates, key=lambda stats: stats.quarantined_until)
+        else:
+            best_score = min(stats.score(self.error_penalty) for stats in candidates)
+            best = random.choice(
+                [stats for stats in candidates if stats.score(self.error_penalty) == best_score]
+            )
+        if key is not None and self.sticky and key not in self._sticky:
+            self._sticky[key] = best.proxy.as_url
+        return best.proxy
+
+    def _update(self, proxy: str | Proxy, error: bool) -> Optional[ProxyStats]:
+        stats = self._stats.get(self._url(proxy))
+        if stats:
+            stats.requests += 1
+            stats.last_used = time.monotonic()
+            stats.error_rate += self.ewma_alpha * (float(error) - stats.error_rate)
+        return stats
+
+    def report_success(self, proxy: str | Proxy, latency: float) -> None:
+        if not (stats := self._update(proxy, error=False)):
+            return
+        stats.latency_ewma = (
+            latency
+            if stats.latency_ewma is None
+            else stats.latency_ewma + self.ewma_alpha * (latency - stats.latency_ewma)
+        )
+        stats.last_success = time.monotonic()
+        stats.consecutive_failures = 0
+        stats.quarantines = 0
+        stats.quarantined_until = 0
+
+    def report_failure(self, proxy: str | Proxy) -> None:
+        if not (stats := self._update(proxy, error=True)):
+            return
+        stats.consecutive_failures += 1
+        if stats.consecutive_failures >= self.failure_threshold:
+            self._quarantine(stats)
+
+    def _quarantine(self, stats: ProxyStats) -> None:
+        cooldown = min(self.base_cooldown * 2**stats.quarantines, self.max_cooldown)
+        stats.quarantines += 1
+        stats.consecutive_failures = 0
+        stats.quarantined_until = time.monotonic() + cooldown
+        logger.warning(f"{self} | {stats.proxy.host}:{stats.proxy.port} is quarantined for {cooldown:.1f}s")
+
+    async def probe(self, stats: ProxyStats) -> bool:
+        from web3mt.utils.http_sessions import SessionConfig, curl_cffiAsyncSession
+
+        started_at = time.monotonic()
+        async with curl_cffiAsyncSession(
+            proxy=stats.proxy.as_url,
+            config=SessionConfig(log_info=f"{self}", retry_count=1, requests_echo=False),
+            pooled=True,
+        ) as session:
+            ok = bool(await session.check_proxy(echo=False))
+        if ok:
+            self.report_success(stats.proxy, time.monotonic() - started_at)
+        elif stats.quarantined_until:  # cool-down is over, but proxy is still down
+            self._quarantine(stats)
+        else:
+            self.report_failure(stats.proxy)
+        return ok
+
+    async def probe_all(self) -> None:
+        """Probes proxies with expired quarantine and proxies not used for `probe_interval` seconds"""
+        now = time.monotonic()
+        semaphore = asyncio.Semaphore(self.probe_concurrency)
+
+        async def probe(stats: ProxyStats):
+            async with semaphore:
+                await self.probe(stats)
+
+        await asyncio.gather(
+            *[
+                probe(stats)
+                for stats in self._stats.values()
+                if (stats.quarantined_until and not stats.is_quarantined)
+                or (
+                    not stats.quarantined_until
+                    and (stats.last_used is None or now - stats.last_used >= self.probe_interval)
+                )
+            ]
+        )
+
+    async def _probing_loop(self) -> None:
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as e:
+                logger.error(f"{self} | Probing failed. {e}")
+            await asyncio.sleep(self.probe_interval)
+
+    def start_probing(self) -> None:
+        if self._probing_task is None or self._probing_task.done():
+            self._probing_task = asyncio.create_task(self._probing_loop())
+
+    async def stop_probing(self) -> None:
+        if self._probing_task:
+            self._probing_task.cancel()
+            try:
+                await self._probing_task
+            except asyncio.CancelledError:
+                pass
+            self._probing_task = None
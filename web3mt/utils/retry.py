@@ -0,0 +1,137 @@
+import random
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from typing import Optional
+
+from curl_cffi.requests import RequestsError
+from httpx import (
+    ConnectError,
+    ConnectTimeout,
+    PoolTimeout,
+    ProxyError,
+    ReadError,
+    ReadTimeout,
+    RemoteProtocolError,
+    WriteError,
+    WriteTimeout,
+)
+
+__all__ = ["RetryAction", "RetryPolicy"]
+
+
+class RetryAction(str, Enum):
+    RETRY_NOW = "retry_now"
+    BACKOFF = "backoff"
+    ROTATE_PROXY = "rotate_proxy"
+    FATAL = "fatal"
+
+
+class RetryPolicy:
+    """
+    Decides what to do after a failed request: retry immediately, back off (exponential backoff with full jitter,
+    `Retry-After` has priority), change proxy or give up. Every host has a retry budget - no more than
+    `host_retry_budget` retries per `budget_window` seconds for all sessions, so one bad host can't stall everything
+    """
+
+    CURL_ERROR_ACTIONS = {
+        5: RetryAction.ROTATE_PROXY,  # COULDNT_RESOLVE_PROXY
+        7: RetryAction.ROTATE_PROXY,  # COULDNT_CONNECT
+        97: RetryAction.ROTATE_PROXY,  # PROXY
+        6: RetryAction.BACKOFF,  # COULDNT_RESOLVE_HOST
+        28: RetryAction.BACKOFF,  # OPERATION_TIMEDOUT
+        35: RetryAction.RETRY_NOW,  # SSL_CONNECT_ERROR
+        52: RetryAction.RETRY_NOW,  # GOT_NOTHING
+        55: RetryAction.RETRY_NOW,  # SEND_ERROR
+        56: RetryAction.RETRY_NOW,  # RECV_ERROR
+    }
+    STATUS_ACTIONS = {
+        407: RetryAction.ROTATE_PROXY,
+        408: RetryAction.RETRY_NOW,
+        425: RetryAction.RETRY_NOW,
+        429: RetryAction.BACKOFF,
+        500: RetryAction.BACKOFF,
+        502: RetryAction.BACKOFF,
+        503: RetryAction.BACKOFF,
+        504: RetryAction.BACKOFF,
+    }
+    _host_retries: dict[str, deque] = defaultdict(deque)
+
+    def __init__(
+        self,
+        base_delay: float = 0.5,
+        max_delay: float = 30,
+        host_retry_budget: int = 50,
+        budget_window: float = 60,
+    ):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.host_retry_budget = host_retry_budget
+        self.budget_window = budget_window
+
+    def __repr__(self):
+        return (
+            f"RetryPolicy(base_delay={self.base_delay}, max_delay={self.max_delay}, "
+            f"host_retry_budget={self.host_retry_budget}/{self.budget_window}s)"
+        )
+
+    def classify(self, exception: Exception, response=None) -> RetryAction:
+        status_code = getattr(response, "status_code", None)
+        if status_code and status_code >= 400:
+            if status_code in self.STATUS_ACTIONS:
+                return self.STATUS_ACTIONS[status_code]
+            return RetryAction.BACKOFF if status_code >= 500 else RetryAction.FATAL
+        match exception:
+            case RequestsError():
+                return self.CURL_ERROR_ACTIONS.get(
+                    int(getattr(exception, "code", 0) or 0), RetryAction.BACKOFF
+                )
+            case ProxyError():
+                return RetryAction.ROTATE_PROXY
+            case ConnectError() | ConnectTimeout() | ReadTimeout() | WriteTimeout() | PoolTimeout():
+                return RetryAction.BACKOFF
+            case ReadError() | WriteError() | RemoteProtocolError():
+                return RetryAction.RETRY_NOW
+        return RetryAction.BACKOFF
+
+    def delay(self, attempt: int, action: RetryAction, response=None) -> float:
+        if action == RetryAction.RETRY_NOW:
+            return 0
+        if (retry_after := self.retry_after(response)) is not None:
+            return min(retry_after, self.max_delay)
+        if action == RetryAction.ROTATE_PROXY:
+            return 0
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    @staticmethod
+    def retry_after(response=None) -> Optional[float]:
+        headers = getattr(response, "headers", None)
+        value = headers.get("Retry-After") if headers else None
+        if not value:
+            return None
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+        try:
+            return max(
+                (
+                    parsedate_to_datetime(value) - datetime.now(timezone.utc)
+                ).total_seconds(),
+                0,
+            )
+        except (TypeError, ValueError):
+            return None
+
+    def consume_budget(self, host: str) -> bool:
+        """Registers retry for host. Returns False if host has no retries left in current window"""
+        retries = self._host_retries[host]
+        now = time.monotonic()
+        while retries and now - retries[0] > self.budget_window:
+            retries.popleft()
+        if len(retries) >= self.host_retry_budget:
+            return False
+        retries.append(now)
+        return True
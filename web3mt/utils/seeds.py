@@ -1,3 +1,8 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Optional
+
 from bip_utils import (
     Bip39SeedGenerator,
     Bip44Coins,
@@ -7,19 +12,129 @@ from bip_utils import (
     Bip84Coins,
 )
 
+__all__ = [
+    "COINS",
+    "DerivedKey",
+    "mnemonic_seed",
+    "account_key",
+    "derive",
+    "get_address_from_mnemonic",
+    "get_private_key_from_mnemonic",
+    "get_address_from_mnemonic_bip44",
+    "get_address_from_mnemonic_bip84",
+]
+
+# coin name: (purpose class, coin), BTC and LTC are native segwit
+COINS: dict[str, tuple[type[Bip44 | Bip84], Bip44Coins | Bip84Coins]] = {
+    "evm": (Bip44, Bip44Coins.ETHEREUM),
+    "tron": (Bip44, Bip44Coins.TRON),
+    "btc": (Bip84, Bip84Coins.BITCOIN),
+    "ltc": (Bip84, Bip84Coins.LITECOIN),
+}
+
+
+class DerivedKey(NamedTuple):
+    coin: str
+    index: int
+    address: str
+    private_key: Optional[str] = None
+
+
+@lru_cache(maxsize=256)
+def mnemonic_seed(mnemonic: str, passphrase: str = "") -> bytes:
+    """BIP-39 seed (2048 rounds of PBKDF2) is computed once per mnemonic"""
+    return Bip39SeedGenerator(mnemonic).Generate(passphrase)
+
+
+@lru_cache(maxsize=1024)
+def account_key(
+    proposal_num_class: type[Bip44 | Bip84],
+    chain: Bip44Coins | Bip84Coins,
+    mnemonic: str,
+    account: int = 0,
+) -> Bip44 | Bip84:
+    """External chain key m/purpose'/coin'/account'/0, hardened levels are derived once per mnemonic"""
+    return (
+        proposal_num_class.FromSeed(mnemonic_seed(mnemonic), chain)
+        .Purpose()
+        .Coin()
+        .Account(account)
+        .Change(Bip44Changes.CHAIN_EXT)
+    )
+
+
+def _derive_range(
+    coin: str, extended_key: str, indices: list[int], private_keys: bool
+) -> list[DerivedKey]:
+    proposal_num_class, chain = COINS[coin]
+    key = proposal_num_class.FromExtendedKey(extended_key, chain)
+    return _derive_from(coin, key, indices, private_keys)
+
+
+def _derive_from(
+    coin: str, key: Bip44 | Bip84, indices: Iterable[int], private_keys: bool
+) -> list[DerivedKey]:
+    derived = []
+    for index in indices:
+        child = key.AddressIndex(index)
+        derived.append(
+            DerivedKey(
+                coin,
+                index,
+                child.PublicKey().ToAddress(),
+                child.PrivateKey().Raw().ToHex() if private_keys else None,
+            )
+        )
+    return derived
+
+
+def derive(
+    mnemonic: str,
+    coins: Iterable[str] = ("evm",),
+    indices: Iterable[int] = range(1),
+    private_keys: bool = False,
+    account: int = 0,
+    max_workers: Optional[int] = None,
+    chunk_size: int = 1000,
+) -> dict[str, list[DerivedKey]]:
+    """
+    Derives addresses (and private keys) of `indices` for each coin of `COINS`. Seed and account keys are cached, so
+    only the last non-hardened level is derived per index. With `max_workers` ranges are split across a process pool,
+    workers get extended account keys instead of mnemonic and don't repeat PBKDF2
+    """
+    indices = list(indices)
+    keys = {coin: account_key(*COINS[coin], mnemonic, account) for coin in coins}
+    if not max_workers or max_workers < 2 or len(indices) <= chunk_size:
+        return {coin: _derive_from(coin, key, indices, private_keys) for coin, key in keys.items()}
+    chunk_size = max(1, min(chunk_size, -(-len(indices) // max_workers)))  # keep every worker busy
+    chunks = [indices[i: i + chunk_size] for i in range(0, len(indices), chunk_size)]
+    with ProcessPoolExecutor(max_workers=min(max_workers, os.cpu_count() or 1, len(chunks))) as executor:
+        futures = {
+            coin: [
+                executor.submit(
+                    _derive_range,
+                    coin,
+                    key.PrivateKey().ToExtended() if private_keys else key.PublicKey().ToExtended(),
+                    chunk,
+                    private_keys,
+                )
+                for chunk in chunks
+            ]
+            for coin, key in keys.items()
+        }
+        return {
+            coin: [derived for future in coin_futures for derived in future.result()]
+            for coin, coin_futures in futures.items()
+        }
+
+
 def get_address_from_mnemonic(
     proposal_num_class: type[Bip44 | Bip84],
     chain: Bip44Coins | Bip84Coins,
     mnemonic: str,
     index: int = 0,
 ):
-    seed_bytes = Bip39SeedGenerator(mnemonic).Generate()
-    bip_obj_mst = proposal_num_class.FromSeed(seed_bytes, chain)
-    bip_obj_acc = bip_obj_mst.Purpose().Coin().Account(0)
-    bip_obj_chain = bip_obj_acc.Change(Bip44Changes.CHAIN_EXT)
-    bip_obj_addr = bip_obj_chain.AddressIndex(index)
-    address = bip_obj_addr.PublicKey().ToAddress()
-    return address
+    return account_key(proposal_num_class, chain, mnemonic).AddressIndex(index).PublicKey().ToAddress()
 
 
 def get_private_key_from_mnemonic(
@@ -28,13 +143,7 @@ def get_private_key_from_mnemonic(
     mnemonic: str,
     index: int = 0,
 ):
-    seed_bytes = Bip39SeedGenerator(mnemonic).Generate()
-    bip_obj_mst = proposal_num_class.FromSeed(seed_bytes, chain)
-    bip_obj_acc = bip_obj_mst.Purpose().Coin().Account(0)
-    bip_obj_chain = bip_obj_acc.Change(Bip44Changes.CHAIN_EXT)
-    bip_obj_addr = bip_obj_chain.AddressIndex(index)
-    private_key = bip_obj_addr.PrivateKey().Raw().ToHex()
-    return private_key
+    return account_key(proposal_num_class, chain, mnemonic).AddressIndex(index).PrivateKey().Raw().ToHex()
 
 
 def get_address_from_mnemonic_bip44(mnemonic: str, chain: Bip44Coins):
@@ -0,0 +1,244 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from curl_cffi import Curl
+from curl_cffi.aio import AsyncCurl
+from httpx import AsyncBaseTransport, Limits, Request, Response
+
+from web3mt.utils import logger
+
+__all__ = ["SessionRegistry", "SharedTransport", "SharedAsyncCurl", "session_registry"]
+
+
+class _Pool:
+    def __init__(self, resource: Any):
+        self.resource = resource
+        self.refs = 0
+        self.last_used = time.monotonic()
+        try:
+            self.loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            self.loop = None
+
+
+class SessionRegistry:
+    """
+    Ref-counted connection pools keyed by (backend, proxy, impersonation, event loop). Sessions with the same key share
+    one pool, so TCP/TLS connections are reused between profiles. Every pool keeps at most `max_connections_per_pool`
+    connections and there are at most `max_connections // max_connections_per_pool` pools, so `max_connections` caps
+    open connections. When all pools are in use, session that needs a new one waits until another session is closed,
+    but not longer than `wait_timeout` seconds, after that the pool is created over the limit.
+    Pools without references are kept idle and evicted LRU-style when there are too many of them or they were not used
+    for `idle_ttl` seconds. Pools are closed on eviction or by `close_all`
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 1000,
+        max_connections_per_pool: int = 10,
+        idle_ttl: float = 300,
+        wait_timeout: float = 30,
+    ):
+        self.max_connections = max_connections
+        self.max_connections_per_pool = max_connections_per_pool
+        self.idle_ttl = idle_ttl
+        self.wait_timeout = wait_timeout
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+        self._pools: OrderedDict[Hashable, _Pool] = OrderedDict()
+        self._to_close: list[_Pool] = []
+        self._waiters: list[asyncio.Future] = []
+
+    def __repr__(self):
+        return (
+            f"SessionRegistry(pools={len(self._pools)}, created={self.created}, reused={self.reused}, "
+            f"evicted={self.evicted})"
+        )
+
+    @property
+    def max_pools(self) -> int:
+        return max(self.max_connections // self.max_connections_per_pool, 1)
+
+    @property
+    def limits(self) -> Limits:
+        return Limits(
+            max_connections=self.max_connections_per_pool,
+            max_keepalive_connections=self.max_connections_per_pool,
+        )
+
+    async def acquire(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        if key in self._pools:
+            self.reused += 1
+        deadline = time.monotonic() + self.wait_timeout
+        while key not in self._pools:
+            self._evict(reserve=1)
+            timeout = deadline - time.monotonic()
+            if len(self._pools) >= self.max_pools and timeout <= 0:
+                # Sessions that are never closed hold their pools, waiting for them could last forever
+                logger.warning(
+                    f"{self} | All {len(self._pools)} pools are in use for {self.wait_timeout}s, connections limit "
+                    f"{self.max_connections} will be exceeded"
+                )
+            elif len(self._pools) >= self.max_pools:
+                logger.debug(f"{self} | All {len(self._pools)} pools are in use, waiting for a session to be closed")
+                await self._wait_for_release(timeout)
+                if key in self._pools:  # created by another session while this one was waiting
+                    self.reused += 1
+                continue
+            self._pools[key] = _Pool(factory())
+            self.created += 1
+        pool = self._pools[key]
+        pool.refs += 1
+        pool.last_used = time.monotonic()
+        self._pools.move_to_end(key)
+        self._schedule_close()
+        return pool.resource
+
+    async def _wait_for_release(self, timeout: float) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release_nowait(self, key: Hashable) -> None:
+        if pool := self._pools.get(key):
+            pool.refs = max(pool.refs - 1, 0)
+            pool.last_used = time.monotonic()
+            if not pool.refs:
+                self._schedule_idle_eviction()
+                self._wake_waiters()
+        self._evict()
+        self._schedule_close()
+
+    def _wake_waiters(self) -> None:
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done() and not waiter.get_loop().is_closed():
+                waiter.set_result(None)
+
+    def _schedule_idle_eviction(self) -> None:
+        """Idle pool is closed after `idle_ttl` even if no session is acquired or released after it"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        loop.call_later(self.idle_ttl + 0.1, lambda: (self._evict(), self._schedule_close()))
+
+    async def release(self, key: Hashable) -> None:
+        self.release_nowait(key)
+        await self._close_evicted()
+
+    def _evict(self, reserve: int = 0) -> None:
+        now = time.monotonic()
+        idle_keys = [key for key, pool in self._pools.items() if not pool.refs]  # LRU first
+        for key in idle_keys:
+            if (
+                len(self._pools) + reserve <= self.max_pools
+                and now - self._pools[key].last_used < self.idle_ttl
+            ):
+                continue
+            self._to_close.append(self._pools.pop(key))
+            self.evicted += 1
+
+    def _schedule_close(self) -> None:
+        try:
+            asyncio.get_running_loop().create_task(self._close_evicted())
+        except RuntimeError:  # no running event loop, pools will be closed on next release
+            pass
+
+    async def _close_evicted(self) -> None:
+        to_close, self._to_close = self._to_close, []
+        for pool in to_close:
+            if pool.loop is not None and pool.loop.is_closed():  # connections were dropped with their loop
+                continue
+            resource = pool.resource
+            try:
+                await (
+                    resource.aclose() if hasattr(resource, "aclose") else resource.close()
+                )
+            except Exception as e:
+                logger.warning(f"{self} | Couldn't close pool {resource}. {e}")
+
+    async def close_all(self) -> None:
+        """Closes pools in use as well, call it on shutdown"""
+        while self._pools:
+            _, pool = self._pools.popitem(last=False)
+            self._to_close.append(pool)
+        self._wake_waiters()
+        await self._close_evicted()
+
+
+class _SharedResource:
+    """
+    Pool of registry acquired on first use in the running event loop. Connections are bound to the loop they were
+    opened in, so loop is a part of the key. Closing releases the reference instead of closing connections
+    """
+
+    def __init__(self, registry: SessionRegistry, key: Hashable, factory: Callable[[], Any]):
+        self._registry = registry
+        self._key = key
+        self._factory = factory
+        self._acquired: Optional[tuple[Hashable, Any]] = None  # (key with loop, resource)
+
+    def switch(self, key: Hashable, factory: Callable[[], Any]) -> None:
+        """Moves to another pool on the next request, e.g. after proxy change"""
+        self._key, self._factory = key, factory
+
+    async def _resource(self) -> Any:
+        key = (*self._key, id(asyncio.get_running_loop()))
+        if self._acquired is None or self._acquired[0] != key:
+            if self._acquired is not None:  # released first, so switch doesn't wait for the pool it holds
+                previous_key, self._acquired = self._acquired[0], None
+                self._registry.release_nowait(previous_key)
+            resource = await self._registry.acquire(key, self._factory)
+            if self._acquired is None:
+                self._acquired = key, resource
+            else:  # concurrent request of this session acquired a pool while this one was waiting
+                self._registry.release_nowait(key)
+        return self._acquired[1]
+
+    async def _release(self) -> None:
+        if self._acquired is not None:
+            key, self._acquired = self._acquired[0], None
+            await self._registry.release(key)
+
+
+class SharedTransport(_SharedResource, AsyncBaseTransport):
+    """httpx transport from registry"""
+
+    async def handle_async_request(self, request: Request) -> Response:
+        return await (await self._resource()).handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._release()
+
+
+class SharedAsyncCurl(_SharedResource):
+    """curl_cffi multi handle from registry, passed to `AsyncSession` as `async_curl`"""
+
+    def __init__(self, registry: SessionRegistry, key: Hashable):
+        super().__init__(registry, key, AsyncCurl)
+
+    def add_handle(self, curl: Curl) -> asyncio.Future:
+        return asyncio.ensure_future(self._add_handle(curl))
+
+    async def _add_handle(self, curl: Curl) -> None:
+        return await (await self._resource()).add_handle(curl)
+
+    def remove_handle(self, curl: Curl) -> None:
+        if self._acquired is not None:  # handle is never added while session waits for a pool
+            return self._acquired[1].remove_handle(curl)
+
+    async def close(self) -> None:
+        await self._release()
+
+
+session_registry = SessionRegistry()
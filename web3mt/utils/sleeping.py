@@ -25,7 +25,7 @@ async def sleep(
             f"{log_info} | 💤 Sleeping for "
             f"{', '.join([el for el in [days_str, hours_str, minutes_str, seconds_str] if el])}"
         )
-    await asyncio.sleep(time_delta.seconds)
+    await asyncio.sleep(time_delta.total_seconds() if time_delta else 0)
 
 
 if __name__ == '__main__':